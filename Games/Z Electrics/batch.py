@@ -0,0 +1,316 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - HEADLESS BATCH RUNNER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Recalculates sheets without Tk, for nightly jobs on servers without a
+display. Each input (.zsff, .csv or .npy) is loaded into a SheetModel, its
+formulas are evaluated by the FormulaEngine, the requested funct operations
+run through the same blocked job kernels the app uses, and the sheet is
+written back out as ZSFF or CSV. Files fan out over a process pool: every
+worker reads its own file, so nothing large crosses process boundaries.
+Matrices handed to run_batch in memory are passed through shared memory
+instead of being pickled.
+
+    python batch.py nightly/*.zsff --out results/ --op sum_all --op scale=1.5
+    python batch.py data.csv --op "forecast=B2:D500,12" --format zsff --out results/ --report report.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from logs import telemetry
+from model import SheetModel
+from calc import parse_range, cell_name
+from importer import iter_csv_chunks
+from exporter import export_zsff, export_csv
+from zsff import ZsffReader, sniff_version
+from jobs import Job, sum_all_job, scale_job, forecast_job
+
+from funct_py import engine
+
+funct = engine()
+
+SHEET_ROWS = 1_048_576            # Sheet size for CSV/NPY inputs (as in ZegaApp)
+SHEET_COLS = 1024
+FORECAST_HORIZON = 12
+FORECAST_WINDOW = 30
+OUTPUT_FORMATS = ("zsff", "csv")
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: SHARED MEMORY HANDOFF
+# -----------------------------------------------------------------------------
+class SharedMatrix:
+    """
+    A copy of an array in a named shared-memory block. The parent creates it
+    and unlinks it once the batch is done; workers attach() by descriptor,
+    which maps the same pages instead of unpickling a copy.
+    """
+    def __init__(self, array):
+        array = np.ascontiguousarray(np.atleast_2d(array), dtype=np.float64)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, np.float64, buffer=self._shm.buf)[...] = array
+        self.descriptor = (self._shm.name, array.shape)
+
+    def release(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    @staticmethod
+    def attach(descriptor):
+        """(shm, read-only view) in a worker; close the shm once done with the view."""
+        name, shape = descriptor
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)   # Python 3.13+
+        except TypeError:
+            # Pool workers share the parent's resource tracker, where the block is already registered
+            shm = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(shape, np.float64, buffer=shm.buf)
+        view.flags.writeable = False
+        return shm, view
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: OPERATIONS
+# -----------------------------------------------------------------------------
+def parse_op(spec):
+    """'sum_all', 'scale=1.5', 'forecast=B2:D500,12', 'stats', 'merkle' -> (name, args)."""
+    name, _, arg = spec.partition("=")
+    name = name.strip().lower()
+    if name in ("sum_all", "stats", "merkle"):
+        if arg:
+            raise ValueError(f"{name} takes no argument")
+        return name, ()
+    if name == "scale":
+        return name, (float(arg),)
+    if name == "forecast":
+        ref, _, steps = arg.partition(",")
+        horizon = int(steps) if steps.strip() else FORECAST_HORIZON
+        if horizon < 1:
+            raise ValueError("forecast horizon must be at least 1")
+        return name, (parse_range(ref), horizon)
+    raise ValueError(f"Unknown operation: {spec}")
+
+
+def _headless_job(name):
+    """A Job with nowhere to report progress; batch runs are never cancelled mid-sheet."""
+    return Job(0, name, None, None)
+
+
+def _op_forecast(m, rect, horizon):
+    r0, c0, r1, c1 = rect
+    if r1 >= m.rows or c1 >= m.cols:
+        raise ValueError("forecast range outside the sheet")
+    t0, t1 = r1 + 1, min(m.rows - 1, r1 + horizon)
+    if t0 >= m.rows:
+        raise ValueError("no room beneath the forecast range")
+    target = f"{cell_name(t0, c0)}:{cell_name(t1, c1)}"
+    if not m.is_empty(t0, c0, t1, c1):
+        raise ValueError(f"forecast target {target} is not empty")
+    source = m.values[r0:r1 + 1, c0:c1 + 1]
+    m.write_block(t0, c0, forecast_job(source, t1 - t0 + 1, FORECAST_WINDOW)(_headless_job("batch.forecast")))
+    return target
+
+
+def _op_stats(m):
+    """
+    funct.stats per column of the populated extent, over the populated cells
+    only: empty and text cells are skipped, as the sheet's COUNT/AVERAGE/MIN do.
+    """
+    rows, cols = m.values.extent()
+    if not rows:
+        return []
+    block = m.values.read_masked(0, rows, 0, cols)
+    data, filled = np.ma.getdata(block), ~np.ma.getmaskarray(block)
+    out = np.empty((5, cols))
+    for c in range(cols):
+        out[:, c] = funct.stats(data[filled[:, c], c][:, None])[:, 0]
+    return out.tolist()
+
+
+def run_op(m, name, args):
+    """Applies one operation to the model and returns its JSON-ready result."""
+    if name == "sum_all":
+        return sum_all_job(m.values)(_headless_job("batch.sum_all"))
+    if name == "scale":
+        m.replace_values(scale_job(m.values, args[0])(_headless_job("batch.scale")))
+        return args[0]
+    if name == "forecast":
+        return _op_forecast(m, *args)
+    if name == "stats":
+        return _op_stats(m)
+    if name == "merkle":
+        return f"{m.hashes.root():016x}"
+    raise ValueError(f"Unknown operation: {name}")
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: PER-SHEET WORKER
+# -----------------------------------------------------------------------------
+def load_sheet(source):
+    """SheetModel for a .zsff/.csv/.npy path or a SharedMatrix descriptor; formulas are evaluated."""
+    if isinstance(source, tuple):
+        shm, view = SharedMatrix.attach(source)
+        try:
+            m = SheetModel(SHEET_ROWS, SHEET_COLS)
+            m.load_matrix(view)
+        finally:
+            del view
+            shm.close()
+        return m
+    if source.lower().endswith(".csv"):
+        m = SheetModel(SHEET_ROWS, SHEET_COLS)
+        m.begin_import()
+        for r0, block, text_cells, col_types, _ in iter_csv_chunks(source, max_rows=SHEET_ROWS, max_cols=SHEET_COLS):
+            m.apply_block(r0, block, text_cells, col_types)
+        return m
+    if source.lower().endswith(".zsff") and sniff_version(source) >= 2:
+        with ZsffReader(source) as reader:
+            m = SheetModel(*reader.shape)
+            m.load_zsff(reader)           # Installs formulas and runs a full recalculation
+        return m
+    m = SheetModel(SHEET_ROWS, SHEET_COLS)
+    m.load_matrix(np.nan_to_num(np.load(source)))
+    return m
+
+
+def process_sheet(name, source, ops, out_path=None):
+    """
+    Worker entry point: load, recalculate, apply `ops` in order, save.
+    Returns a JSON-ready summary; a failing operation is reported there and
+    skipped, while load/save failures propagate to the caller.
+    """
+    start = time.perf_counter()
+    m = load_sheet(source)
+    summary = {"name": name, "shape": [m.rows, m.cols], "extent": list(m.values.extent()),
+               "formulas": len(m.formulas), "ops": []}
+    for spec, (op, args) in ops:
+        try:
+            summary["ops"].append({"op": spec, "result": run_op(m, op, args)})
+        except Exception as e:
+            telemetry.log("error", f"Batch {name}: {spec} failed: {e}")
+            summary["ops"].append({"op": spec, "error": str(e)})
+    summary["errors"] = {cell_name(*cell): code for cell, code in sorted(m.errors.items())}
+    if out_path:
+        if out_path.lower().endswith(".csv"):
+            overrides = dict(m.text)
+            overrides.update(m.errors)
+            result = export_csv(out_path, m.values, overrides, m.column_formats)
+        else:
+            result = export_zsff(out_path, m.values, m.formulas, m.text, m.meta())
+        summary.update(output=out_path, bytes=result.nbytes, sha256=result.sha256)
+    summary["ms"] = (time.perf_counter() - start) * 1000
+    telemetry.log("info", f"Batch {name}: done in {summary['ms']:.0f}ms.")
+    return summary
+
+
+def _init_worker(threads):
+    """Splits the cores between workers so OpenMP kernels don't oversubscribe them."""
+    funct.configure(threads=threads)
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: POOL
+# -----------------------------------------------------------------------------
+def output_path(source, out_dir, fmt):
+    base = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(out_dir, f"{base}.{fmt}")
+
+
+def run_batch(tasks, ops=(), workers=None, on_result=None):
+    """
+    Processes `tasks` [(name, source, out_path or None)] over a process pool.
+    `source` is a file path or an in-memory array (shared with the workers
+    through SharedMatrix). `ops` are op spec strings. on_result(summary) is
+    called in completion order; failed sheets get {"name", "error"}.
+    Returns the summaries in task order.
+    """
+    parsed = [(spec, parse_op(spec)) for spec in ops]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    shared = []
+    results = [None] * len(tasks)
+    # spawn, not fork: a forked child inheriting an initialized OpenMP runtime can deadlock
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(threads,)) as pool:
+            futures = {}
+            for i, (name, source, out_path) in enumerate(tasks):
+                if isinstance(source, np.ndarray):
+                    shared.append(SharedMatrix(source))
+                    source = shared[-1].descriptor
+                futures[pool.submit(process_sheet, name, source, parsed, out_path)] = i
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    telemetry.log("error", f"Batch {tasks[i][0]} failed: {e}")
+                    summary = {"name": tasks[i][0], "error": f"{type(e).__name__}: {e}"}
+                results[i] = summary
+                if on_result:
+                    on_result(summary)
+    finally:
+        for block in shared:
+            block.release()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ZEGA headless batch recalculation")
+    parser.add_argument("inputs", nargs="+", help=".zsff, .csv or .npy sheets")
+    parser.add_argument("--op", action="append", default=[], dest="ops",
+                        help="operation to run after recalculation, in order (repeatable): "
+                             "sum_all, scale=F, forecast=RANGE[,ROWS], stats, merkle")
+    parser.add_argument("--out", help="directory to write the results to (omit to only report)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="zsff", help="output format")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--report", help="write every sheet's summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        for spec in args.ops:
+            parse_op(spec)
+    except ValueError as e:
+        parser.error(str(e))
+    missing = [p for p in args.inputs if not os.path.isfile(p)]
+    if missing:
+        parser.error(f"not found: {', '.join(missing)}")
+    names = [os.path.basename(p) for p in args.inputs]
+    outputs = [output_path(p, args.out, args.format) for p in args.inputs] if args.out else [None] * len(names)
+    if args.out:
+        if len(set(outputs)) != len(outputs):
+            parser.error("several inputs would write the same output file")
+        os.makedirs(args.out, exist_ok=True)
+
+    def show(summary):
+        if "error" in summary:
+            print(f"{summary['name']:<40} FAILED  {summary['error']}")
+            return
+        failed = sum(1 for op in summary["ops"] if "error" in op)
+        print(f"{summary['name']:<40} {summary['ms']:>9.0f} ms  {summary['formulas']} formulas  "
+              f"{len(summary['errors'])} cell errors  {len(summary['ops']) - failed}/{len(summary['ops'])} ops ok"
+              + (f"  -> {summary['output']}" if "output" in summary else ""))
+
+    start = time.perf_counter()
+    results = run_batch(list(zip(names, args.inputs, outputs)), args.ops, args.workers, on_result=show)
+    failed = [r["name"] for r in results if "error" in r or any("error" in op for op in r["ops"])]
+    print(f"{len(results)} sheets in {time.perf_counter() - start:.1f}s, {len(failed)} with failures.")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"engine": funct.build_info(), "sheets": results}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
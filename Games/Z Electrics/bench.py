@@ -0,0 +1,235 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - BENCHMARK SUITE
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Headless benchmarks for the funct kernels, the formula engine, ZSFF/CSV
+save and load, and grid viewport extraction, over sheets from 50x26 up to
+10M cells. Each case reports latency percentiles, throughput and peak
+traced memory; results can be written as JSON and compared against a saved
+baseline, exiting non-zero on regressions so upgrades can be gated on it.
+
+    python bench.py --json results.json
+    python bench.py --sizes 50x26,1Kx26 --baseline results.json
+    ZEGA_ENGINE=numpy python bench.py     # Benchmark the NumPy engine instead of funct
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import tracemalloc
+from itertools import cycle
+import numpy as np
+
+from funct_py import engine, is_native
+from formula import FormulaEngine
+from calc import index_to_col
+from model import SheetModel
+from zsff import write_zsff, ZsffReader
+from exporter import export_csv
+from importer import iter_csv_chunks
+
+SIZES = {                       # name -> (rows, cols)
+    "50x26": (50, 26),
+    "1Kx26": (1000, 26),
+    "100Kx26": (100_000, 26),
+    "10M": (400_000, 25),
+}
+MIN_RUNS = 3
+MAX_RUNS = 200
+CASE_BUDGET = 1.0               # Seconds of timed runs per case once MIN_RUNS are done
+REGRESSION_TOLERANCE = 0.15     # Allowed p50 / peak-memory growth over the baseline
+NOISE_FLOOR_MS = 0.05           # p50 differences below this are never regressions
+VIEW_ROWS, VIEW_COLS, CELL_CHARS = 30, 12, 12   # One screen of ZegaGrid
+
+
+# -----------------------------------------------------------------------------
+# CASES
+# -----------------------------------------------------------------------------
+def sample_sheet(rows, cols, seed=2026):
+    """Reproducible sheet: two-decimal values with ~10% empty cells."""
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.random((rows, cols)) * 1000, 2)
+    values[rng.random((rows, cols)) < 0.1] = 0.0
+    return values
+
+
+def build_cases(funct, values, workdir):
+    """(name, fn) pairs for one sheet. Save cases run before the loads that read their files."""
+    rows, cols = values.shape
+    last = index_to_col(cols - 1)
+    zsff_path = os.path.join(workdir, "bench.zsff")
+    csv_path = os.path.join(workdir, "bench.csv")
+    out = np.empty_like(values)
+
+    model = SheetModel(rows, cols)
+    model.load_matrix(values)
+    rng = np.random.default_rng(7)
+    pages = cycle(rng.integers(0, max(1, rows - VIEW_ROWS), 64).tolist())
+
+    def viewport():
+        top = next(pages)
+        return [model.display_text(r, c)[:CELL_CHARS]
+                for r in range(top, min(rows, top + VIEW_ROWS)) for c in range(min(cols, VIEW_COLS))]
+
+    def load_zsff():
+        with ZsffReader(zsff_path) as reader:
+            return reader.read_into(np.zeros(reader.shape))
+
+    def load_csv():
+        for _ in iter_csv_chunks(csv_path):
+            pass
+
+    return [
+        ("funct.sum_all", lambda: funct.sum_all(values)),
+        ("funct.scale", lambda: funct.scale(values, 1.5, out=out)),
+        ("funct.predictive_analysis", lambda: funct.predictive_analysis(values)),
+        ("funct.forecast_rolling", lambda: funct.predictive_analysis(values, rolling=True, out=out)),
+        ("funct.integrity_check", lambda: funct.integrity_check(values)),
+        ("funct.block_hashes", lambda: funct.block_hashes(values)),
+        ("formula.sum_column", lambda: FormulaEngine.parse_and_execute(f"=SUM(A1:A{rows})", values)),
+        ("formula.sum_sheet", lambda: FormulaEngine.parse_and_execute(f"=SUM(A1:{last}{rows})", values)),
+        ("formula.sum_store", lambda: FormulaEngine.parse_and_execute(f"=SUM(A1:{last}{rows})", model.values)),
+        ("formula.sumif", lambda: FormulaEngine.parse_and_execute(
+            f'=SUMIF(A1:A{rows},">500",B1:B{rows})', values)),
+        ("formula.arith", lambda: FormulaEngine.parse_and_execute("=A1*2+B2/3-C3", values)),
+        ("grid.viewport", viewport),
+        ("zsff.save", lambda: write_zsff(zsff_path, values)),
+        ("zsff.load", load_zsff),
+        ("csv.save", lambda: export_csv(csv_path, values)),
+        ("csv.load", load_csv),
+    ]
+
+
+# -----------------------------------------------------------------------------
+# MEASUREMENT
+# -----------------------------------------------------------------------------
+def measure(fn, cells, budget=CASE_BUDGET):
+    """
+    One traced warm-up run for peak memory (NumPy buffers and Python objects;
+    allocations inside the C++ kernels are not traced), then untraced timed
+    runs: at least MIN_RUNS, more while the budget lasts.
+    """
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < MIN_RUNS or (len(samples) < MAX_RUNS and time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    ms = np.array(samples)
+    p50 = float(np.percentile(ms, 50))
+    return {
+        "runs": len(samples),
+        "mean_ms": float(ms.mean()),
+        "min_ms": float(ms.min()),
+        "p50_ms": p50,
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "cells_per_s": cells / (p50 / 1000) if p50 > 0 else 0.0,
+        "mb_per_s": cells * 8 / 1e6 / (p50 / 1000) if p50 > 0 else 0.0,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def environment(funct):
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "native": is_native(funct),
+        "engine": funct.build_info(),
+    }
+
+
+def run_suite(sizes, only=None, budget=CASE_BUDGET, log=print):
+    funct = engine()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="zega-bench-") as workdir:
+        for size in sizes:
+            rows, cols = SIZES[size]
+            values = sample_sheet(rows, cols)
+            for name, fn in build_cases(funct, values, workdir):
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                r = measure(fn, values.size, budget)
+                r.update(size=size, cells=int(values.size))
+                results[f"{name}@{size}"] = r
+                log(f"{name + '@' + size:<36} p50 {r['p50_ms']:>10.3f} ms  p95 {r['p95_ms']:>10.3f} ms  "
+                    f"{r['cells_per_s'] / 1e6:>9.1f} Mcells/s  peak {r['peak_mb']:>8.1f} MB  ({r['runs']} runs)")
+    return {"environment": environment(funct), "results": results}
+
+
+# -----------------------------------------------------------------------------
+# BASELINE COMPARISON
+# -----------------------------------------------------------------------------
+def compare(current, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Returns (report lines, regressed keys) for cases present in both runs."""
+    lines, regressed = [], []
+    base_env, cur_env = baseline.get("environment", {}), current["environment"]
+    if base_env.get("engine", {}).get("isa") != cur_env["engine"]["isa"]:
+        lines.append(f"note: baseline engine {base_env.get('engine', {}).get('isa')} "
+                     f"vs current {cur_env['engine']['isa']}")
+    for key, cur in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            continue
+        ratio = cur["p50_ms"] / base["p50_ms"] if base["p50_ms"] > 0 else 1.0
+        slower = ratio > 1 + tolerance and cur["p50_ms"] - base["p50_ms"] > NOISE_FLOOR_MS
+        heavier = cur["peak_mb"] > base["peak_mb"] * (1 + tolerance) + 1.0
+        flag = "REGRESSION" if slower or heavier else ""
+        if flag:
+            regressed.append(key)
+        lines.append(f"{key:<36} p50 {base['p50_ms']:>10.3f} -> {cur['p50_ms']:>10.3f} ms ({ratio:5.2f}x)  "
+                     f"peak {base['peak_mb']:>7.1f} -> {cur['peak_mb']:>7.1f} MB  {flag}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ZEGA spreadsheet engine benchmarks")
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"comma-separated subset of {', '.join(SIZES)}")
+    parser.add_argument("--only", default="", help="comma-separated case name filters (e.g. funct,zsff)")
+    parser.add_argument("--budget", type=float, default=CASE_BUDGET, help="seconds of timed runs per case")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help="allowed slowdown / memory growth as a fraction")
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes.split(",") if s]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+    only = [p for p in args.only.split(",") if p]
+
+    report = run_suite(sizes, only, args.budget)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        lines, regressed = compare(report, baseline, args.tolerance)
+        print("\n".join(["", f"Baseline {args.baseline}:"] + lines))
+        if regressed:
+            print(f"{len(regressed)} regression(s) beyond {args.tolerance:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
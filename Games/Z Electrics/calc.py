@@ -0,0 +1,161 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - CALCULATION GRAPH
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Tracks which cells feed which formulas so an edit only recomputes the
+formulas downstream of it, in dependency order.
+"""
+
+import re
+from collections import defaultdict, deque
+
+SHEET_END = 2**31 - 1                      # Open-ended bound of whole-column (A:A) and whole-sheet references
+WHOLE_SHEET = (0, 0, SHEET_END, SHEET_END)  # Range read by the legacy no-argument "=SUM()"
+
+# --- A1 REFERENCE HELPERS ---
+def col_to_index(letters):
+    """'A' -> 0, 'Z' -> 25, 'AA' -> 26."""
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def index_to_col(idx):
+    """0 -> 'A', 25 -> 'Z', 26 -> 'AA'."""
+    letters = ""
+    idx += 1
+    while idx > 0:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def cell_name(row, col):
+    return f"{index_to_col(col)}{row + 1}"
+
+
+_CELL_REF = re.compile(r"\$?([A-Z]{1,3})\$?([1-9]\d*)")
+
+
+def parse_range(ref):
+    """'B2:D40' -> (1, 1, 39, 3) as (r0, c0, r1, c1) inclusive; a single cell is a 1x1 range."""
+    corners = []
+    for part in ref.strip().upper().split(":"):
+        m = _CELL_REF.fullmatch(part.strip())
+        if not m or len(corners) == 2:
+            raise ValueError(f"Not a cell range: {ref!r}")
+        corners.append((int(m.group(2)) - 1, col_to_index(m.group(1))))
+    (ra, ca), (rb, cb) = corners[0], corners[-1]
+    return min(ra, rb), min(ca, cb), max(ra, rb), max(ca, cb)
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: DEPENDENCY GRAPH
+# -----------------------------------------------------------------------------
+class DependencyGraph:
+    """
+    Precedents/dependents index for formula cells.
+
+    Single-cell references are kept in a reverse dict. Range references are
+    bucketed per column so that finding the formulas over a cell never expands
+    a range into its member cells: B2:D40 costs three bucket entries, not 117.
+    Formulas over WHOLE_SHEET depend on every cell except their own.
+    """
+    def __init__(self):
+        self.precedents = {}                       # formula cell -> (cells, ranges)
+        self._cell_dependents = defaultdict(set)   # cell -> formula cells
+        self._range_index = defaultdict(list)      # col -> [(r0, r1, formula cell)]
+        self._sheet_dependents = set()             # formula cells reading WHOLE_SHEET
+
+    def __contains__(self, cell):
+        return cell in self.precedents
+
+    def set_formula(self, cell, references):
+        self.clear(cell)
+        cells, ranges = (frozenset(refs) for refs in references)
+        self.precedents[cell] = (cells, ranges)
+        if WHOLE_SHEET in ranges:
+            self._sheet_dependents.add(cell)
+        for ref in cells:
+            self._cell_dependents[ref].add(cell)
+        for r0, c0, r1, c1 in ranges - {WHOLE_SHEET}:
+            for c in range(c0, c1 + 1):
+                self._range_index[c].append((r0, r1, cell))
+
+    def clear(self, cell):
+        refs = self.precedents.pop(cell, None)
+        if refs is None:
+            return
+        cells, ranges = refs
+        self._sheet_dependents.discard(cell)
+        for ref in cells:
+            deps = self._cell_dependents.get(ref)
+            if deps is not None:
+                deps.discard(cell)
+                if not deps:
+                    del self._cell_dependents[ref]
+        for c in {c for _, c0, _, c1 in ranges - {WHOLE_SHEET} for c in range(c0, c1 + 1)}:
+            bucket = [e for e in self._range_index[c] if e[2] != cell]
+            if bucket:
+                self._range_index[c] = bucket
+            else:
+                del self._range_index[c]
+
+    def reset(self):
+        self.precedents.clear()
+        self._cell_dependents.clear()
+        self._range_index.clear()
+        self._sheet_dependents.clear()
+
+    def dependents_of(self, cell):
+        row, col = cell
+        deps = set(self._cell_dependents.get(cell, ()))
+        for r0, r1, dep in self._range_index.get(col, ()):
+            if r0 <= row <= r1:
+                deps.add(dep)
+        deps.update(dep for dep in self._sheet_dependents if dep != cell)
+        return deps
+
+    def recalc_order(self, changed):
+        """
+        Returns (order, cyclic) for an edit to the cells in `changed`.
+
+        `order` lists every formula cell that must be re-evaluated, precedents
+        first. `cyclic` holds the formula cells caught in (or fed by) a
+        circular reference; they are left out of `order`.
+        """
+        # 1. Collect the dirty subgraph reachable from the edit
+        dirty = {c for c in changed if c in self.precedents}
+        edges = {}
+        queue = deque(changed)
+        seen = set(changed)
+        while queue:
+            cell = queue.popleft()
+            deps = self.dependents_of(cell)
+            edges[cell] = deps
+            for dep in deps:
+                dirty.add(dep)
+                if dep not in seen:
+                    seen.add(dep)
+                    queue.append(dep)
+
+        # 2. Kahn's algorithm restricted to the dirty subgraph
+        indegree = dict.fromkeys(dirty, 0)
+        for cell in dirty:
+            for dep in edges.get(cell, ()):
+                indegree[dep] += 1
+        ready = deque(c for c in dirty if indegree[c] == 0)
+        order = []
+        while ready:
+            cell = ready.popleft()
+            order.append(cell)
+            for dep in edges.get(cell, ()):
+                indegree[dep] -= 1
+                if indegree[dep] == 0:
+                    ready.append(dep)
+
+        cyclic = {c for c, n in indegree.items() if n > 0}
+        return order, cyclic
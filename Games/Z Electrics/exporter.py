@@ -0,0 +1,260 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - PARALLEL EXPORTER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Writes ZSFF and CSV files from a background thread. Chunks (ZSFF tiles, CSV
+row blocks) are prepared on a thread pool and written strictly in order by
+one writer, which feeds a SHA-256 as the bytes go out, so the file is never
+read back. Output goes to a temp file that is renamed over the target only
+once it is complete.
+"""
+
+import io
+import os
+import re
+import csv
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from logs import telemetry
+from model import format_value
+from store import CellStore
+from zsff import write_zsff, update_zsff, ZsffError
+
+EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+CSV_CHUNK_ROWS = 4096
+IN_FLIGHT_PER_WORKER = 4      # Bounds how many prepared chunks sit in memory
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportResult:
+    """sha256 covers the CSV file, or a ZSFF file from DATA_OFFSET on (None for in-place updates)."""
+    __slots__ = ("path", "nbytes", "sha256", "digest", "ms")
+
+    def __init__(self, path, nbytes, sha256, digest=None, ms=0.0):
+        self.path = path
+        self.nbytes = nbytes
+        self.sha256 = sha256
+        self.digest = digest
+        self.ms = ms
+
+
+def ordered_map(pool, fn, items, window=None, cancel=None, on_progress=None):
+    """Like map(fn, items) on `pool`, yielding in order with at most `window` chunks in flight."""
+    window = window or EXPORT_WORKERS * IN_FLIGHT_PER_WORKER
+    total = max(1, len(items))
+    pending = deque()
+    done = 0
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+                done += 1
+                if cancel and cancel.is_set():
+                    raise ExportCancelled()
+                if on_progress and done % window == 0:
+                    on_progress(done / total)
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class _StreamHash:
+    def __init__(self):
+        self.sha = hashlib.sha256()
+        self.nbytes = 0
+
+    def __call__(self, data):
+        self.sha.update(data)
+        self.nbytes += len(data)
+
+
+# -----------------------------------------------------------------------------
+# ZSFF
+# -----------------------------------------------------------------------------
+def export_zsff(path, values, formulas=None, text=None, meta=None, pool=None,
+                cancel=None, on_progress=None):
+    start = time.perf_counter()
+    hasher = _StreamHash()
+    mapper = map
+    if pool:
+        mapper = lambda fn, items: ordered_map(pool, fn, items, cancel=cancel, on_progress=on_progress)
+    digest = write_zsff(path, values, formulas, text, meta, mapper=mapper, stream=hasher)
+    return ExportResult(path, hasher.nbytes, hasher.sha.hexdigest(), digest,
+                        (time.perf_counter() - start) * 1000)
+
+
+# -----------------------------------------------------------------------------
+# CSV
+# -----------------------------------------------------------------------------
+def used_extent(values, cells=()):
+    """(rows, cols) of the smallest top-left block holding every non-zero value and listed cell."""
+    if isinstance(values, CellStore):
+        rows, cols = values.extent()
+    else:
+        nz_rows = np.flatnonzero(values.any(axis=1))
+        nz_cols = np.flatnonzero(values.any(axis=0))
+        rows = nz_rows[-1] + 1 if len(nz_rows) else 0
+        cols = nz_cols[-1] + 1 if len(nz_cols) else 0
+    for r, c in cells:
+        rows, cols = max(rows, r + 1), max(cols, c + 1)
+    return int(rows), int(cols)
+
+
+# Applied to chunks that hold only numbers (repr output), before any label is added
+_INTEGRAL = re.compile(r"\.0(?=,|\n)")                 # 3.0 -> 3
+_EMPTY = re.compile(r"(?<![^,\n])nan(?![^,\n])")       # Empty cells are NaN while formatting
+
+
+def _format_csv_chunk(values, r0, r1, width, overrides, column_formats):
+    """
+    UTF-8 CSV bytes for rows r0:r1. Empty cells of a CellStore (zeros of a
+    plain array, like the grid shows them) are written as empty fields, and
+    numbers as their shortest exact repr, so they read back unchanged.
+    """
+    if isinstance(values, CellStore):
+        block = values.read_masked(r0, r1, 0, width).filled(np.nan)
+    else:
+        block = values[r0:r1, :width]
+        block = np.where(block == 0, np.nan, block)
+    # Numbers never need quoting, so whole lines are formatted at C speed; rows
+    # with labels or date columns are then split into fields and re-written
+    # through the csv module, which quotes the labels
+    text = "\n".join(",".join(map(repr, row)) for row in block.tolist()) + "\n"
+    text = _EMPTY.sub("", _INTEGRAL.sub("", text))
+    edits = {}
+    for (r, c), s in overrides:
+        edits.setdefault(r - r0, []).append((c, s))
+    dated = [(c, fmt) for c, fmt in column_formats.items() if c < width]
+    if not edits and not dated:
+        return text.encode("utf-8")
+    lines = text.split("\n")[:-1]
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="")
+    for i in (range(len(lines)) if dated else edits):
+        fields = lines[i].split(",")
+        for c, fmt in dated:
+            if fields[c]:
+                fields[c] = format_value(block[i, c], fmt)
+        for c, s in edits.get(i, ()):
+            fields[c] = s
+        out.seek(0)
+        out.truncate()
+        writer.writerow(fields)
+        lines[i] = out.getvalue()
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def export_csv(path, values, overrides=None, column_formats=None, pool=None,
+               cancel=None, on_progress=None, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Writes the used region of `values` as CSV. `overrides` maps (row, col) to
+    the text to write instead of the number (labels, formula error codes).
+    """
+    start = time.perf_counter()
+    overrides = overrides or {}
+    column_formats = column_formats or {}
+    rows, width = used_extent(values, overrides)
+    buckets = {}
+    for (r, c), s in overrides.items():
+        buckets.setdefault(r // chunk_rows, []).append(((r, c), s))
+    chunks = list(range(0, rows, chunk_rows))
+
+    def format_chunk(r0):
+        return _format_csv_chunk(values, r0, min(r0 + chunk_rows, rows), width,
+                                 buckets.get(r0 // chunk_rows, ()), column_formats)
+
+    parts = ordered_map(pool, format_chunk, chunks, cancel=cancel, on_progress=on_progress) if pool \
+        else map(format_chunk, chunks)
+    hasher = _StreamHash()
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            for data in parts:
+                f.write(data)
+                hasher(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return ExportResult(path, hasher.nbytes, hasher.sha.hexdigest(), ms=(time.perf_counter() - start) * 1000)
+
+
+# -----------------------------------------------------------------------------
+# BACKGROUND SAVE
+# -----------------------------------------------------------------------------
+class SheetExporter(threading.Thread):
+    """
+    Saves a SheetModel off the Tk thread. Construct it on the Tk thread: the
+    formula/text dicts are copied there and `values` is taken as a CellStore
+    snapshot, which shares blocks until the sheet writes to them, so peak
+    memory does not double. Edits made meanwhile just stay unsaved. The
+    model's Merkle tree is forked onto the snapshot and brought up to date
+    here, so the Tk thread never hashes tiles for a save.
+    Callbacks run on this thread (marshal them with ZegaApp.post).
+    """
+    def __init__(self, path, model, on_progress, on_done, dirty_tiles=None, workers=EXPORT_WORKERS):
+        super().__init__(name="ZegaExporter", daemon=True)
+        self.path = path
+        self.values = model.values.snapshot()
+        self.formulas = dict(model.formulas)
+        self.text = dict(model.text)
+        self.errors = dict(model.errors)
+        self.meta = model.meta()
+        self.hashes = model.hashes.fork(self.values)
+        self.merkle_root = None         # Fingerprint of the snapshot, hashed on this thread by run()
+        self.column_formats = dict(model.column_formats)
+        self.dirty_tiles = dirty_tiles  # set -> in-place ZSFF update of just these tiles
+        self.workers = workers
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        result, error = None, None
+        try:
+            self.merkle_root = self.hashes.root()
+            with ThreadPoolExecutor(self.workers, thread_name_prefix="ZegaExport") as pool:
+                result = self._export(pool)
+        except ExportCancelled:
+            telemetry.log("info", f"Export of {self.path} cancelled.")
+        except Exception as e:
+            error = e
+            telemetry.log("error", f"Export of {self.path} failed: {e}")
+        self.on_done(result, error)
+
+    def _export(self, pool):
+        progress = dict(pool=pool, cancel=self._cancel, on_progress=self.on_progress)
+        if self.path.lower().endswith(".csv"):
+            overrides = dict(self.text)
+            overrides.update(self.errors)
+            return export_csv(self.path, self.values, overrides, self.column_formats, **progress)
+        if self.dirty_tiles is not None:
+            start = time.perf_counter()
+            try:
+                digest = update_zsff(self.path, self.values, self.dirty_tiles,
+                                     self.formulas, self.text, self.meta)
+                telemetry.log("info", f"Incremental save: {len(self.dirty_tiles)} dirty tiles rewritten.")
+                return ExportResult(self.path, os.path.getsize(self.path), None, digest,
+                                    (time.perf_counter() - start) * 1000)
+            except ZsffError as e:
+                telemetry.log("warning", f"Incremental save unavailable ({e}); writing full file.")
+        return export_zsff(self.path, self.values, self.formulas, self.text, self.meta, **progress)
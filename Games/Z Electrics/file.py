@@ -5,7 +5,7 @@ from logs import telemetry
 class ZegaExplorer:
     def __init__(self, parent, mode="save", callback=None):
         if mode == "save":
-            path = filedialog.asksaveasfilename(defaultextension=".zsff", filetypes=[("ZEGA Format", "*.zsff")])
+            path = filedialog.asksaveasfilename(defaultextension=".zsff", filetypes=[("ZEGA Format", "*.zsff"), ("CSV", "*.csv")])
         else:
             path = filedialog.askopenfilename(filetypes=[("ZEGA Format", "*.zsff"), ("CSV", "*.csv")])
         if path and callback: callback(path, mode)
\ No newline at end of file
@@ -0,0 +1,420 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - NUMPY ENGINE
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Pure-NumPy implementation of the funct extension with the same functions,
+signatures, errors and result layout. engine() picks the backend once per
+process: the compiled funct when it imports and is current, else this
+module, so hosts without a compiler still run every operation vectorized.
+Results agree with the C++ kernels within floating-point tolerance (sums are
+reduced in a different order); integrity_check is exact.
+"""
+
+import os
+import sys
+import numpy as np
+
+from logs import telemetry
+
+ISA = "numpy"
+ENGINE_ENV = "ZEGA_ENGINE"        # "numpy" forces this module even when funct is built
+
+_config = {"threads": 0, "parallel_threshold": 65536}
+
+
+# -----------------------------------------------------------------------------
+# ARGUMENT HANDLING (mirrors the C++ buffer bridge)
+# -----------------------------------------------------------------------------
+def _array(obj, arg, writable=False):
+    """obj as a 2D float64/float32 view (1D = one column), plus the array itself."""
+    a = np.asarray(obj)
+    if a.dtype not in (np.float64, np.float32):
+        raise TypeError(f"{arg}: expected float64 or float32 data")
+    if a.ndim not in (1, 2):
+        raise ValueError(f"{arg}: expected a 1D or 2D array")
+    if writable and not a.flags.writeable:
+        raise BufferError(f"{arg}: array is read-only")
+    return (a[:, None] if a.ndim == 1 else a), a
+
+
+def _output(out, like, shape, ndim):
+    """Validates out= against the result shape, or allocates a C-contiguous result."""
+    if out is None:
+        return np.empty(shape if ndim == 2 else shape[:1], dtype=like.dtype), None
+    o2, o = _array(out, "out", writable=True)
+    if o.dtype != like.dtype or o2.shape != shape:
+        raise ValueError("out: shape or dtype does not match the result")
+    return o, o2
+
+
+def _column(c, cols, arg):
+    c = int(c)
+    if c < 0:
+        c += cols
+    if c < 0 or c >= cols:
+        raise IndexError(f"{arg}: column {c} out of range for {cols} columns")
+    return c
+
+
+def _columns(seq, cols, arg):
+    return [_column(c, cols, arg) for c in seq]
+
+
+# -----------------------------------------------------------------------------
+# KERNELS
+# -----------------------------------------------------------------------------
+def sum_all(a):
+    """sum_all(a) -> float. Pairwise float64 sum (float32 input is accumulated in double)."""
+    a2, _ = _array(a, "a")
+    return float(np.sum(a2, dtype=np.float64))
+
+
+def scale(a, factor, out=None):
+    """scale(a, factor, out=None) -> array. out may be a itself."""
+    a2, a = _array(a, "a")
+    result, o2 = _output(out, a, a2.shape, a.ndim)
+    np.multiply(a2, a.dtype.type(factor), out=result.reshape(a2.shape) if o2 is None else o2)
+    return result
+
+
+def scale_inplace(a, factor):
+    """scale_inplace(a, factor). Scales a writable array or view in place."""
+    a2, a = _array(a, "a", writable=True)
+    np.multiply(a2, a.dtype.type(factor), out=a2)
+
+
+REANCHOR_ROWS = 1024    # Rolling OLS: rows per block of prefix sums (at least one window)
+
+
+def _ols(n, sum_y, sum_xy, h):
+    """Linear fit over x = 0..n-1, evaluated at x = n-1+h (n >= 2)."""
+    sum_x = n * (n - 1) / 2
+    sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+    return slope * (n - 1 + h) + (sum_y - slope * sum_x) / n
+
+
+def _ols_rolling(y, window, horizon):
+    """
+    Forecast at every row from the window ending there. Window sums come from
+    prefix sums taken per block of REANCHOR_ROWS (plus the window before it),
+    so they stay O(1) per row without long prefixes eating the precision.
+    """
+    rows = y.shape[0]
+    out = np.empty_like(y)
+    block = max(REANCHOR_ROWS, window)
+    for b0 in range(0, rows, block):
+        b1 = min(rows, b0 + block)
+        base = max(0, b0 - window + 1)
+        origin = y[base]
+        seg = y[base:b1] - origin      # The fit shifts with the data; centring keeps the prefixes small
+        j = np.arange(seg.shape[0], dtype=np.float64)[:, None]
+        c_y = np.vstack((np.zeros((1, y.shape[1])), np.cumsum(seg, axis=0)))
+        c_jy = np.vstack((np.zeros((1, y.shape[1])), np.cumsum(j * seg, axis=0)))
+        r = np.arange(b0, b1)
+        s = np.maximum(r - window + 1, 0)
+        hi, lo = r + 1 - base, s - base
+        n = (r - s + 1).astype(np.float64)[:, None]
+        sum_y = c_y[hi] - c_y[lo]
+        sum_xy = c_jy[hi] - c_jy[lo] - lo[:, None] * sum_y   # x relative to each window start
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[b0:b1] = np.where(n >= 2, _ols(n, sum_y, sum_xy, horizon) + origin, y[b0:b1])
+    return out
+
+
+def _holt(y, alpha, beta, horizon, rolling):
+    """Holt's linear exponential smoothing, vectorized across columns (rows are sequential)."""
+    rows = y.shape[0]
+    level, trend = np.zeros(y.shape[1]), np.zeros(y.shape[1])
+    out = np.empty_like(y) if rolling else None
+    for r in range(rows):
+        if r == 0:
+            level = y[0].copy()
+        elif r == 1:
+            trend, level = y[1] - level, y[1].copy()
+        else:
+            prev = level
+            level = alpha * y[r] + (1 - alpha) * (level + trend)
+            trend = beta * (level - prev) + (1 - beta) * trend
+        if rolling:
+            out[r] = level + horizon * trend
+    if rolling:
+        return out
+    return level + np.arange(1, horizon + 1, dtype=np.float64)[:, None] * trend
+
+
+def predictive_analysis(a, out=None, window=30, horizon=1, method="ols", alpha=0.5, beta=0.1, rolling=False):
+    """
+    predictive_analysis(a, out=None, window=30, horizon=1, method='ols', alpha=0.5, beta=0.1, rolling=False)
+    -> horizon×cols forecasts past the last row, or rows×cols forecasts made at every row if rolling.
+    """
+    window, horizon = int(window), int(horizon)
+    if window < 1 or horizon < 1:
+        raise ValueError("window and horizon must be >= 1")
+    if method not in ("ols", "holt"):
+        raise ValueError(f"method must be 'ols' or 'holt', not '{method}'")
+    if not (0.0 < alpha <= 1.0 and 0.0 <= beta <= 1.0):
+        raise ValueError("alpha must be in (0, 1] and beta in [0, 1]")
+    a2, a = _array(a, "a")
+    rows, cols = a2.shape
+    result, o2 = _output(out, a, (rows if rolling else horizon, cols), 2)
+    y = a2.astype(np.float64)
+    if method == "holt":
+        forecast = _holt(y, alpha, beta, horizon, rolling)
+    elif rolling:
+        forecast = _ols_rolling(y, window, horizon)
+    elif rows == 0:
+        forecast = np.zeros((horizon, cols))
+    else:
+        tail = y[max(rows - window, 0):]
+        n = float(tail.shape[0])
+        if n >= 2:
+            x = np.arange(tail.shape[0], dtype=np.float64)
+            steps = np.arange(1, horizon + 1, dtype=np.float64)[:, None]
+            forecast = _ols(n, tail.sum(axis=0), x @ tail, steps)
+        else:
+            forecast = np.repeat(y[-1:], horizon, axis=0)
+    (result if o2 is None else o2)[:] = forecast
+    return result
+
+
+_FNV_OFFSET = 14695981039346656037
+_FNV_PRIME = 1099511628211
+_MASK64 = (1 << 64) - 1
+_HASH_CHUNK = 65536                # Elements converted to Python ints at a time
+
+
+def integrity_check(a):
+    """
+    integrity_check(a) -> int. 64-bit FNV-1a over the element bits in row-major
+    order. Each step depends on the previous one, so this is a plain loop; it is
+    bit-exact with the C++ checksum but runs at interpreter speed.
+    """
+    a2, _ = _array(a, "a")
+    bits = a2.view(np.uint64 if a2.dtype == np.float64 else np.uint32).ravel()  # Row-major
+    h = _FNV_OFFSET
+    for i in range(0, bits.size, _HASH_CHUNK):
+        for b in bits[i:i + _HASH_CHUNK].tolist():
+            h = ((h ^ b) * _FNV_PRIME) & _MASK64
+    return h
+
+
+def block_hashes(a, block_rows=256, block_cols=64):
+    """
+    block_hashes(a, block_rows=256, block_cols=64) -> uint64 array, one
+    integrity_check per block (edge blocks zero-padded to full size). The
+    FNV-1a chain is serial within a block, so this steps through the block's
+    cells once and advances every block's hash together.
+    """
+    block_rows, block_cols = int(block_rows), int(block_cols)
+    if block_rows < 1 or block_cols < 1:
+        raise ValueError("block_rows and block_cols must be at least 1")
+    a2, _ = _array(a, "a")
+    bits = a2.view(np.uint64 if a2.dtype == np.float64 else np.uint32)
+    grid_r, grid_c = -(-a2.shape[0] // block_rows), -(-a2.shape[1] // block_cols)
+    out = np.empty((grid_r, grid_c), dtype=np.uint64)
+    band = max(1, _HASH_CHUNK * 16 // (block_rows * block_cols * max(1, grid_c)))   # Block rows per pass
+    prime = np.uint64(_FNV_PRIME)
+    for g0 in range(0, grid_r, band):
+        g1 = min(grid_r, g0 + band)
+        padded = np.zeros(((g1 - g0) * block_rows, grid_c * block_cols), dtype=np.uint64)
+        src = bits[g0 * block_rows:g1 * block_rows]
+        padded[:src.shape[0], :src.shape[1]] = src
+        # (cell within block, block) so each step reads one contiguous row
+        cells = padded.reshape(g1 - g0, block_rows, grid_c, block_cols).transpose(1, 3, 0, 2)
+        cells = np.ascontiguousarray(cells).reshape(block_rows * block_cols, -1)
+        h = np.full(cells.shape[1], _FNV_OFFSET, dtype=np.uint64)
+        for row in cells:
+            h ^= row
+            h *= prime
+        out[g0:g1] = h.reshape(g1 - g0, grid_c)
+    return out
+
+
+def stats(a, axis=0):
+    """stats(a, axis=0) -> 5×k float64 array of sum, mean, min, max, sample stdev."""
+    if axis not in (0, 1):
+        raise ValueError("axis must be 0 (per column) or 1 (per row)")
+    a2, _ = _array(a, "a")
+    x = a2.astype(np.float64)
+    n = x.shape[axis]
+    out = np.full((5, x.shape[1 - axis]), np.nan)
+    out[0] = x.sum(axis=axis)
+    if n > 0:
+        nan = np.isnan(x)
+        out[1] = out[0] / n
+        out[2] = np.where(nan, np.inf, x).min(axis=axis)    # NaN is skipped by min/max,
+        out[3] = np.where(nan, -np.inf, x).max(axis=axis)   # as in the C++ comparisons
+    if n > 1:
+        out[4] = x.std(axis=axis, ddof=1)
+    return out
+
+
+def sort_rows(a, keys, descending=False):
+    """sort_rows(a, keys, descending=False) -> int64 permutation. Stable multi-key row sort, NaN last."""
+    a2, _ = _array(a, "a")
+    keys = _columns(keys, a2.shape[1], "keys")
+    if isinstance(descending, (list, tuple, np.ndarray)):
+        if len(descending) != len(keys):
+            raise ValueError("descending: need one flag per key")
+        flags = [bool(d) for d in descending]
+    else:
+        flags = [bool(descending)] * len(keys)
+    if not keys:
+        return np.arange(a2.shape[0], dtype=np.int64)
+    # lexsort is stable, takes the primary key last and puts NaN last; negating keeps NaN last
+    columns = [-a2[:, k] if desc else a2[:, k] for k, desc in zip(keys, flags)]
+    return np.lexsort(columns[::-1]).astype(np.int64)
+
+
+_OPS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "==": np.equal, "=": np.equal, "!=": np.not_equal, "<>": np.not_equal,
+}
+
+
+def filter_rows(a, predicates):
+    """filter_rows(a, predicates) -> int64 row indices where every (column, op, value) holds."""
+    a2, _ = _array(a, "a")
+    tests = []
+    for col, op, value in predicates:
+        col = _column(col, a2.shape[1], "predicates")
+        if op not in _OPS:
+            raise ValueError(f"predicates: unknown operator '{op}'")
+        tests.append((col, _OPS[op], float(value)))
+    keep = np.ones(a2.shape[0], dtype=bool)
+    for col, op, value in tests:
+        keep &= op(a2[:, col].astype(np.float64), value)  # Compare in double, like the C++ kernel
+    return np.flatnonzero(keep).astype(np.int64)
+
+
+def group_by(a, key, values=None):
+    """group_by(a, key, values=None) -> dict of keys, count, sum, mean, min, max per group (first-appearance order)."""
+    a2, _ = _array(a, "a")
+    cols = a2.shape[1]
+    key = _column(key, cols, "key")
+    value_cols = [c for c in range(cols) if c != key] if values is None else _columns(values, cols, "values")
+    raw = a2[:, key].astype(np.float64)
+    vals = a2[:, value_cols].astype(np.float64)
+
+    # Group on the key bits: -0.0 joins 0.0, every NaN joins one NaN group
+    norm = np.where(np.isnan(raw), np.nan, raw + 0.0)
+    _, first, inverse = np.unique(norm.view(np.uint64), return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    group = rank[inverse.ravel()]
+    groups = len(order)
+
+    result = {"keys": raw[first[order]], "count": np.bincount(group, minlength=groups).astype(np.int64)}
+    shape = (groups, len(value_cols))
+    if groups == 0 or not value_cols:
+        for name in ("sum", "mean", "min", "max"):
+            result[name] = np.empty(shape)
+        return result
+    result["sum"] = np.stack([np.bincount(group, weights=vals[:, i], minlength=groups)
+                              for i in range(shape[1])], axis=1)
+    result["mean"] = result["sum"] / result["count"][:, None]
+    perm = np.argsort(group, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(result["count"])[:-1]))
+    nan = np.isnan(vals)
+    result["min"] = np.minimum.reduceat(np.where(nan, np.inf, vals)[perm], starts, axis=0)
+    result["max"] = np.maximum.reduceat(np.where(nan, -np.inf, vals)[perm], starts, axis=0)
+    return {name: result[name] for name in ("keys", "count", "sum", "mean", "min", "max")}
+
+
+def configure(threads=None, parallel_threshold=None, isa=None):
+    """configure(threads=None, parallel_threshold=None, isa=None) -> dict. Settings are kept but NumPy runs single-threaded."""
+    if isa is not None and isa != ISA:
+        raise ValueError(f"isa '{isa}' is unknown or not supported by this CPU")
+    if threads is not None:
+        if threads < 0:
+            raise ValueError("threads must be >= 0 (0 = OpenMP default)")
+        _config["threads"] = int(threads)
+    if parallel_threshold is not None:
+        if parallel_threshold < 0:
+            raise OverflowError("parallel_threshold must be >= 0")
+        _config["parallel_threshold"] = int(parallel_threshold)
+    return dict(_config, max_threads=1, isa=ISA)
+
+
+def build_info():
+    """build_info() -> dict, shaped like funct.build_info()."""
+    return {
+        "isa": ISA,
+        "compiled": [ISA],
+        "supported": [ISA],
+        "openmp": 0,
+        "max_threads": 1,
+        "compiler": f"NumPy {np.__version__}",
+        "deterministic_sum": False,   # Reduction order follows the array layout
+    }
+
+
+# -----------------------------------------------------------------------------
+# BACKEND SELECTION
+# -----------------------------------------------------------------------------
+_engine = None
+
+
+def engine():
+    """The funct backend for this process: the C++ extension if usable, else this module."""
+    global _engine
+    if _engine is not None:
+        return _engine
+    _engine = sys.modules[__name__]
+    if os.environ.get(ENGINE_ENV, "").lower() == ISA:
+        telemetry.log("info", f"{ENGINE_ENV}={ISA}: using the NumPy engine.")
+        return _engine
+    try:
+        import funct
+        funct.build_info()
+        _engine = funct
+    except ImportError:
+        telemetry.log("warning", "funct is not built; using the NumPy engine.")
+    except AttributeError:
+        # A funct.so from before runtime dispatch: ISA-specific and possibly unsafe on this host
+        telemetry.log("warning", "funct build is stale (rebuild with setup.py); using the NumPy engine.")
+    return _engine
+
+
+def is_native(backend=None):
+    return (backend or engine()) is not sys.modules[__name__]
+
+
+def cross_check(a, backend=None, rtol=1e-9):
+    """
+    Runs every kernel on `a` through the native backend and this module and
+    returns the names whose results differ beyond `rtol` (exactly, for
+    integer results). Used to validate new funct builds.
+    """
+    backend = backend or engine()
+    a = np.asarray(a)
+    own = sys.modules[__name__]
+    key = 0
+    cases = {
+        "sum_all": lambda m: m.sum_all(a),
+        "scale": lambda m: m.scale(a, 1.5),
+        "predictive_analysis": lambda m: m.predictive_analysis(a),
+        "integrity_check": lambda m: m.integrity_check(a),
+        "block_hashes": lambda m: m.block_hashes(a, 64, 16),
+        "stats": lambda m: m.stats(a),
+        "sort_rows": lambda m: m.sort_rows(a, [key]),
+        "filter_rows": lambda m: m.filter_rows(a, [(key, ">", 0.0)]),
+        "group_by": lambda m: m.group_by(a, key),
+    }
+    failed = []
+    for name, run in cases.items():
+        mine, theirs = run(own), run(backend)
+        pairs = [(mine[k], theirs[k]) for k in mine] if isinstance(mine, dict) else [(mine, theirs)]
+        for x, y in pairs:
+            x, y = np.asarray(x), np.asarray(y)
+            same = x.shape == y.shape and (
+                np.array_equal(x, y) if x.dtype.kind in "iu" or y.dtype.kind in "iu"
+                else np.allclose(x, y, rtol=rtol, atol=0.0, equal_nan=True))
+            if not same:
+                failed.append(name)
+                break
+    return failed
@@ -0,0 +1,196 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - STREAMING CSV IMPORTER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Reads CSV files in fixed-size row chunks and converts each chunk
+column-at-a-time with vectorized NumPy casts. A cell that parses as a number
+is always stored as one; columns inferred as dates from the first chunk also
+turn ISO dates into serial day numbers. Anything else is kept as a text
+label, and columns that do not convert in one cast fall back to per-cell
+parsing.
+"""
+
+import os
+import re
+import csv
+import threading
+from itertools import islice
+import numpy as np
+
+from logs import telemetry
+
+CHUNK_ROWS = 50000
+MAX_PENDING_CHUNKS = 2    # Chunks handed to the consumer and not yet applied before the parser waits
+INFERENCE_RATIO = 0.9     # Share of non-empty sample cells that must parse for a column type
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$")
+EXCEL_EPOCH = np.datetime64("1899-12-30")
+ONE_DAY = np.timedelta64(1, "D")
+
+NUMERIC, DATE, TEXT = "numeric", "date", "text"
+
+
+def _is_number(s):
+    try:
+        float(s)
+        return True
+    except ValueError:
+        return False
+
+
+def _date_serial(s):
+    """ISO date/time -> spreadsheet serial day number (1900 date system)."""
+    return float((np.datetime64(s.strip().replace(" ", "T"), "s") - EXCEL_EPOCH) / ONE_DAY)
+
+
+def infer_column_types(sample_rows, width):
+    types = []
+    for c in range(width):
+        cells = [row[c].strip() for row in sample_rows if c < len(row) and row[c].strip()]
+        if not cells:
+            types.append(NUMERIC)
+            continue
+        threshold = INFERENCE_RATIO * len(cells)
+        if sum(map(_is_number, cells)) >= threshold:
+            types.append(NUMERIC)
+        elif sum(1 for s in cells if DATE_RE.match(s)) >= threshold:
+            types.append(DATE)
+        else:
+            types.append(TEXT)
+    return types
+
+
+def _convert_column(strings, kind, out, empty, r0, c, text_cells):
+    """
+    Fills out[:, c] for one chunk column and marks blank and text cells in
+    empty[:, c]; text goes to text_cells[(row, col)].
+    """
+    arr = np.char.strip(np.asarray(strings, dtype=str))
+    blank = arr == ""
+    empty[:, c] = blank
+    if kind != TEXT:
+        try:
+            if kind == NUMERIC:
+                vals = np.where(blank, "0", arr).astype(np.float64)
+            else:
+                vals = (np.where(blank, "1899-12-30", arr).astype("datetime64[s]") - EXCEL_EPOCH) / ONE_DAY
+            out[:, c] = np.where(blank, 0.0, vals)
+            return
+        except ValueError:
+            pass  # Mixed column: fall through to per-cell parsing
+    for i, s in enumerate(arr):
+        if blank[i]:
+            continue
+        if _is_number(s):
+            out[i, c] = float(s)
+        elif kind == DATE and DATE_RE.match(s):
+            out[i, c] = _date_serial(s)
+        else:
+            text_cells[(r0 + i, c)] = strings[i]
+            empty[i, c] = True
+
+
+class _ByteCounter:
+    """Line iterator that tracks how much of the file has been consumed."""
+    def __init__(self, f):
+        self.f = f
+        self.consumed = 0
+
+    def __iter__(self):
+        for line in self.f:
+            self.consumed += len(line)
+            yield line
+
+
+def iter_csv_chunks(path, chunk_rows=CHUNK_ROWS, max_rows=None, max_cols=None,
+                    delimiter=",", cancel=None):
+    """
+    Yields (r0, block, text_cells, col_types, progress) per chunk, where block
+    is a float64 (n, width) MaskedArray for rows r0..r0+n with blank and text
+    cells masked, and progress is 0..1. Rows/columns beyond max_rows/max_cols
+    are dropped.
+    """
+    total = max(1, os.path.getsize(path))
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        counter = _ByteCounter(f)
+        reader = csv.reader(counter, delimiter=delimiter)
+        col_types = None
+        r0 = 0
+        while not (cancel and cancel.is_set()):
+            take = chunk_rows if max_rows is None else min(chunk_rows, max_rows - r0)
+            rows = list(islice(reader, take)) if take > 0 else []
+            if not rows:
+                if take <= 0 and next(reader, None) is not None:
+                    telemetry.log("warning", f"{os.path.basename(path)}: rows beyond {max_rows} were not imported.")
+                break
+            width = max(len(r) for r in rows)
+            if max_cols is not None:
+                width = min(width, max_cols)
+            if col_types is None:
+                # Row 0 is usually a header; infer from the data beneath it
+                col_types = infer_column_types(rows[1:] or rows, width)
+            elif width > len(col_types):
+                col_types += infer_column_types(rows, width)[len(col_types):]
+
+            block = np.zeros((len(rows), width))
+            empty = np.zeros((len(rows), width), dtype=bool)
+            text_cells = {}
+            for c in range(width):
+                column = [r[c] if c < len(r) else "" for r in rows]
+                _convert_column(column, col_types[c], block, empty, r0, c, text_cells)
+            np.nan_to_num(block, copy=False, posinf=0.0, neginf=0.0)
+            yield (r0, np.ma.MaskedArray(block, mask=empty), text_cells, col_types,
+                   min(1.0, counter.consumed / total))
+            r0 += len(rows)
+
+
+class CsvImporter(threading.Thread):
+    """
+    Runs iter_csv_chunks on a worker thread. The sink's on_chunk/on_progress/
+    on_done callbacks are invoked on this thread; callers that touch Tk must
+    marshal them (ZegaApp.post). The consumer calls chunk_done() once per
+    chunk, applied or dropped; parsing stays at most MAX_PENDING_CHUNKS ahead,
+    so a slow consumer bounds memory instead of a backlog of chunks building up.
+    """
+    def __init__(self, path, on_chunk, on_progress, on_done, max_rows=None, max_cols=None,
+                 chunk_rows=CHUNK_ROWS):
+        super().__init__(name="ZegaCsvImporter", daemon=True)
+        self.path = path
+        self.on_chunk = on_chunk
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.max_rows = max_rows
+        self.max_cols = max_cols
+        self.chunk_rows = chunk_rows
+        self._cancel = threading.Event()
+        self._pending = threading.BoundedSemaphore(MAX_PENDING_CHUNKS)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def chunk_done(self):
+        self._pending.release()
+
+    def _wait_for_consumer(self):
+        """Blocks while MAX_PENDING_CHUNKS chunks are unapplied; False once cancelled."""
+        while not self._cancel.is_set():
+            if self._pending.acquire(timeout=0.1):
+                return True
+        return False
+
+    def run(self):
+        rows, error = 0, None
+        try:
+            for r0, block, text_cells, col_types, progress in iter_csv_chunks(
+                    self.path, chunk_rows=self.chunk_rows, max_rows=self.max_rows,
+                    max_cols=self.max_cols, cancel=self._cancel):
+                if not self._wait_for_consumer():
+                    break
+                self.on_chunk(r0, block, text_cells, col_types)
+                self.on_progress(progress)
+                rows = r0 + len(block)
+        except Exception as e:
+            error = e
+            telemetry.log("error", f"CSV import failed at row {rows}: {e}")
+        self.on_done(rows, self._cancel.is_set(), error)
@@ -0,0 +1,234 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - INTRO PLAYER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Plays intro.mp4 over the already-built interface. A producer thread decodes,
+scales and color-converts frames into a bounded queue; the Tk thread only
+pastes ready frames into one PhotoImage, paced against the video's own FPS
+(dropping frames when it falls behind rather than slowing down). Any key or
+click skips the intro.
+
+Scaled frames are cached as JPEGs under logs/cache, keyed on the video's
+size and mtime, so later launches skip video decoding and resizing.
+"""
+
+import os
+import math
+import time
+import queue
+import threading
+import numpy as np
+import cv2
+import customtkinter as cctk
+from PIL import Image, ImageTk
+
+from logs import telemetry
+
+INTRO_SIZE = (1400, 900)          # (width, height) frames are scaled to
+INTRO_QUEUE_FRAMES = 24           # Decoded frames buffered ahead of playback (~1s, ~90 MB)
+INTRO_FALLBACK_FPS = 30           # When the container does not report a frame rate
+INTRO_CACHE_DIR = os.path.join("logs", "cache")
+INTRO_CACHE_QUALITY = 92
+_END = None
+
+
+class FrameCache:
+    """
+    One .npz per video and frame size: the JPEG bytes of every scaled frame
+    back to back, their offsets, the FPS and the source file's (size, mtime).
+    Frames are encoded from the RGB array as-is, so they decode straight to RGB.
+    """
+    def __init__(self, video_path, size, folder=INTRO_CACHE_DIR):
+        self.path = os.path.join(folder, f"{os.path.splitext(os.path.basename(video_path))[0]}_{size[0]}x{size[1]}.npz")
+        st = os.stat(video_path)
+        self.source = np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+    def load(self):
+        """(fps, [jpeg bytes]) or None if there is no cache for this exact video."""
+        try:
+            with np.load(self.path) as z:
+                if not np.array_equal(z["source"], self.source):
+                    return None
+                data, offsets = z["data"], z["offsets"]
+                return float(z["fps"]), [data[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, fps, encoded):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        offsets = np.cumsum([0] + [len(e) for e in encoded], dtype=np.int64)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, source=self.source, fps=np.float64(fps), offsets=offsets,
+                     data=np.concatenate(encoded) if encoded else np.empty(0, np.uint8))
+        os.replace(tmp, self.path)
+
+
+class IntroDecoder(threading.Thread):
+    """Producer: fills `frames` with RGB PIL images of INTRO_SIZE, then _END. Sets `fps` before the first frame."""
+    def __init__(self, video_path, size=INTRO_SIZE, use_cache=True):
+        super().__init__(name="ZegaIntroDecoder", daemon=True)
+        self.video_path = video_path
+        self.size = size
+        self.frames = queue.Queue(INTRO_QUEUE_FRAMES)
+        self.fps = None
+        self.ready = threading.Event()
+        self._halt = threading.Event()
+        self._cache = FrameCache(video_path, size) if use_cache else None
+
+    def stop(self):
+        self._halt.set()
+
+    def _put(self, frame):
+        """Blocks while the queue is full; False once playback has been stopped."""
+        while not self._halt.is_set():
+            try:
+                self.frames.put(frame, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _start(self, fps):
+        self.fps = fps if fps and fps > 0 else INTRO_FALLBACK_FPS
+        self.ready.set()
+
+    def run(self):
+        try:
+            cached = self._cache.load() if self._cache else None
+            if cached:
+                self._play_cache(*cached)
+            else:
+                self._decode()
+        except Exception as e:
+            telemetry.log("error", f"Intro decoding failed: {e}")
+        finally:
+            self.ready.set()
+            self._put(_END)
+
+    def _play_cache(self, fps, encoded):
+        telemetry.log("info", f"Intro frames served from cache ({len(encoded)} frames).")
+        self._start(fps)
+        for jpeg in encoded:
+            frame = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+            if frame is None or not self._put(Image.fromarray(frame)):
+                return
+
+    def _decode(self):
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            if not cap.isOpened():
+                telemetry.log("warning", f"Intro video could not be opened: {self.video_path}")
+                return
+            self._start(cap.get(cv2.CAP_PROP_FPS))
+            encoded = [] if self._cache else None
+            while True:
+                s = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frame = cv2.cvtColor(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+                if encoded is not None:
+                    ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, INTRO_CACHE_QUALITY])
+                    if ok:
+                        encoded.append(jpeg.ravel())
+                    else:
+                        encoded = None
+                telemetry.observe("intro.decode", (time.perf_counter() - s) * 1000)
+                if not self._put(Image.fromarray(frame)):
+                    return            # Skipped: a partial cache is not worth keeping
+        finally:
+            cap.release()
+        if encoded:
+            try:
+                self._cache.save(self.fps, encoded)
+            except OSError as e:
+                telemetry.log("warning", f"Intro frame cache not written: {e}")
+
+
+class IntroPlayer:
+    """
+    Consumer on the Tk thread. start() begins decoding (call it before building
+    the main interface so the queue fills meanwhile); show() overlays the
+    intro and starts playback; on_finish runs once, when it ends or is skipped.
+    """
+    SKIP_EVENTS = ("<Key>", "<Button-1>")
+
+    def __init__(self, root, video_path, on_finish, size=INTRO_SIZE):
+        self.root = root
+        self.on_finish = on_finish
+        self.decoder = IntroDecoder(video_path, size)
+        self.label = None
+        self.photo = None
+        self._bindings = []
+        self._t0 = None
+        self._shown = 0
+        self._finished = False
+
+    def start(self):
+        self.decoder.start()
+
+    def show(self):
+        self.label = cctk.CTkLabel(self.root, text="")
+        self.label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.label.lift()
+        self._bindings = [(seq, self.root.bind(seq, self.skip, add="+")) for seq in self.SKIP_EVENTS]
+        self.root.focus_force()
+        self._tick()
+
+    def skip(self, _event=None):
+        if not self._finished:
+            telemetry.log("info", f"Intro skipped after {self._shown} frames.")
+            self._finish()
+
+    def _tick(self):
+        if self._finished:
+            return
+        if not self.decoder.ready.is_set():
+            self.root.after(5, self._tick)
+            return
+        now = time.perf_counter()
+        if self._t0 is None:
+            self._t0 = now
+        frame_s = 1.0 / (self.decoder.fps or INTRO_FALLBACK_FPS)
+        # Frame i is due at t0 + i/fps; when behind, take the newest frame that is due
+        due = int((now - self._t0) / frame_s) + 1
+        frame = None
+        while self._shown < due:
+            try:
+                item = self.decoder.frames.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                self._finish()
+                return
+            if frame is not None:
+                telemetry.incr("intro.dropped")
+            frame, self._shown = item, self._shown + 1
+        if frame is not None:
+            s = time.perf_counter()
+            if self.photo is None:
+                self.photo = ImageTk.PhotoImage(frame)
+                self.label.configure(image=self.photo)
+            else:
+                self.photo.paste(frame)
+            telemetry.incr("intro.frames")
+            telemetry.observe("intro.frame", (time.perf_counter() - s) * 1000)
+        now = time.perf_counter()
+        next_due = self._t0 + self._shown * frame_s
+        if next_due <= now:
+            # The decoder is behind: look again at the next frame boundary instead of spinning
+            next_due = self._t0 + (int((now - self._t0) / frame_s) + 1) * frame_s
+        self.root.after(max(1, math.ceil((next_due - now) * 1000)), self._tick)
+
+    def _finish(self):
+        self._finished = True
+        self.decoder.stop()
+        for seq, funcid in self._bindings:
+            self.root.unbind(seq, funcid)
+        if self.label is not None:
+            self.label.destroy()
+        self.photo = None
+        self.on_finish()
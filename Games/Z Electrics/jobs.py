@@ -0,0 +1,179 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - JOB SCHEDULER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Runs long sheet operations (C++ kernels over the whole matrix) on a thread
+pool so the Tk main loop keeps handling input. Jobs work in row blocks,
+which gives them progress reporting and a cancellation point between blocks.
+Completion and progress callbacks are delivered through `post`, which must
+marshal onto the Tk thread (ZegaApp.post, drained via after()).
+"""
+
+import math
+import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from logs import telemetry
+from store import CellStore
+
+from funct_py import engine
+
+funct = engine()
+
+JOB_WORKERS = 2
+JOB_CHUNK_ROWS = 65536
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """Handle passed to the job function: check_cancelled() between blocks, report() progress."""
+    def __init__(self, job_id, name, post, on_progress):
+        self.id = job_id
+        self.name = name
+        self._post = post
+        self._on_progress = on_progress
+        self._cancel = threading.Event()
+        self.future = None
+        self.started = time.perf_counter()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, fraction):
+        if self._on_progress:
+            self._post(self._on_progress, fraction)
+
+
+class JobScheduler:
+    def __init__(self, post, workers=JOB_WORKERS):
+        self._post = post
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="ZegaJob")
+        self._ids = itertools.count(1)
+        self.jobs = {}  # id -> Job, while queued or running
+
+    def submit(self, name, fn, on_done=None, on_progress=None):
+        """
+        Runs fn(job) on the pool and returns the job id. on_done(result, error)
+        runs on the Tk thread; a cancelled job reports error=JobCancelled().
+        `name` doubles as the latency metric the job's run time is recorded under.
+        """
+        job = Job(next(self._ids), name, self._post, on_progress)
+        self.jobs[job.id] = job
+        telemetry.incr("jobs.submitted")
+        job.future = self._pool.submit(self._run, job, fn, on_done)
+        return job.id
+
+    def _run(self, job, fn, on_done):
+        result, error = None, None
+        try:
+            job.check_cancelled()
+            result = fn(job)
+        except JobCancelled as e:
+            error = e
+            telemetry.log("info", f"Job #{job.id} ({job.name}) cancelled.")
+        except Exception as e:
+            error = e
+            telemetry.log("error", f"Job #{job.id} ({job.name}) failed: {e}")
+        telemetry.observe(job.name, (time.perf_counter() - job.started) * 1000)
+        self._post(self._finish, job, on_done, result, error)
+
+    def _finish(self, job, on_done, result, error):
+        self.jobs.pop(job.id, None)
+        if on_done:
+            on_done(result, error)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+
+    def busy(self, name=None):
+        return any(name is None or job.name == name for job in self.jobs.values())
+
+    def shutdown(self):
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: BLOCKED SHEET KERNELS
+# -----------------------------------------------------------------------------
+def _row_blocks(rows, chunk_rows=JOB_CHUNK_ROWS):
+    return [(r0, min(r0 + chunk_rows, rows)) for r0 in range(0, rows, chunk_rows)]
+
+
+def _store_batches(values):
+    """Allocated blocks of a CellStore snapshot, in batches of about JOB_CHUNK_ROWS rows of cells."""
+    items = values.items()
+    per = max(1, JOB_CHUNK_ROWS * values.shape[1] // (values.block_shape[0] * values.block_shape[1]))
+    return [items[i:i + per] for i in range(0, len(items), per)] or [[]]
+
+
+def sum_all_job(values):
+    """
+    Job function: the total of a CellStore. Each allocated block is summed by
+    funct.sum_all and the block sums are combined with math.fsum, which is
+    exactly rounded, so the total does not depend on batching or block order.
+    Empty blocks are skipped without being materialized. The store is
+    snapshotted here, on the caller's thread.
+    """
+    values = values.snapshot()
+
+    def run(job):
+        partials = []
+        batches = _store_batches(values)
+        for i, batch in enumerate(batches):
+            job.check_cancelled()
+            partials.extend(funct.sum_all(block) for _, block in batch)
+            job.report((i + 1) / len(batches))
+        return math.fsum(partials)
+    return run
+
+
+def scale_job(values, factor):
+    """Job function: returns a scaled copy of `values` (a CellStore, snapshotted here); the caller installs it."""
+    values = values.snapshot()
+
+    def run(job):
+        out = CellStore(*values.shape, *values.block_shape)
+        br, bc = values.block_shape
+        batches = _store_batches(values)
+        for i, batch in enumerate(batches):
+            job.check_cancelled()
+            for (r0, c0), block in batch:
+                key = (r0 // br, c0 // bc)
+                out.blocks[key] = funct.scale(block, factor)
+                out.filled[key] = values.filled[key].copy()
+            job.report((i + 1) / len(batches))
+        return out
+    return run
+
+
+def forecast_job(source, horizon, window):
+    """Job function: OLS forecasts for the `horizon` rows after `source` (a private copy)."""
+    def run(job):
+        job.check_cancelled()
+        forecast = funct.predictive_analysis(source, window=window, horizon=horizon)
+        job.report(1.0)
+        return forecast
+    return run
@@ -1,14 +1,217 @@
-import os, datetime, secrets
-class ZegaTelemetry:
+import os, sys, json, math, time, queue, atexit, datetime, secrets, threading
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+MAX_FILE_BYTES = 5 * 1024 * 1024   # Rotate a level's file past this size...
+MAX_FILE_AGE = 3600                # ...or after this many seconds
+FLUSH_INTERVAL = 0.5               # Seconds the writer waits to batch lines
+METRICS_INTERVAL = 10              # Seconds between JSON-lines metric snapshots
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (milliseconds). Buckets grow by 2^(1/16),
+    so memory stays constant and percentiles are within ~4.5% of exact.
+    """
+    FLOOR_MS = 0.001
+    STEPS = 16
+
     def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms):
+        idx = int(math.log2(ms / self.FLOOR_MS) * self.STEPS) if ms > self.FLOOR_MS else 0
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                return min(self.max, self.FLOOR_MS * 2 ** ((idx + 1) / self.STEPS))
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+class _Timer:
+    """`with telemetry.timed(name):` or `@telemetry.timed(name)`."""
+    __slots__ = ("sink", "name", "start")
+
+    def __init__(self, sink, name):
+        self.sink, self.name = sink, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.sink.observe(self.name, (time.perf_counter() - self.start) * 1000)
+
+    def __call__(self, fn):
+        def wrapped(*args, **kwargs):
+            with _Timer(self.sink, self.name):
+                return fn(*args, **kwargs)
+        wrapped.__name__, wrapped.__doc__ = fn.__name__, fn.__doc__
+        return wrapped
+
+class ZegaTelemetry:
+    """
+    log() only enqueues (timestamp, level, message); a background writer
+    formats and appends them in batches to one file per level per session,
+    rotating by size/age. Pending lines are flushed at interpreter exit.
+
+    It also keeps in-process counters, gauges and latency histograms, written
+    as JSON-lines snapshots to logs/metrics every METRICS_INTERVAL seconds.
+    """
+    def __init__(self, root="logs", level=None):
         self.session_id = secrets.token_hex(8)
-        self.root = "logs"
-        for t in ['info', 'warning', 'error']: 
-            os.makedirs(os.path.join(self.root, t), exist_ok=True)
-    def _get_path(self, t):
-        ts = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        return os.path.join(self.root, t, f"{ts}_{self.session_id}.log")
-    def log(self, t, msg):
-        entry = f"[{datetime.datetime.now()}] [{t.upper()}] [ID:{self.session_id}] {msg}\n"
-        with open(self._get_path(t), "a") as f: f.write(entry)
-telemetry = ZegaTelemetry()
\ No newline at end of file
+        self.root = root
+        self.set_level(level or os.environ.get("ZEGA_LOG_LEVEL", "info"))
+        self._started = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        self._queue = queue.SimpleQueue()
+        self._put = self._queue.put
+        self._files = {}  # level -> [handle, opened_at, part]
+        self._metrics_lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.latency = {}
+        self._writer = threading.Thread(target=self._run, name="ZegaTelemetryWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def set_level(self, level):
+        self.min_level = LEVELS[level.lower()]
+        self._muted = frozenset(t for t, v in LEVELS.items() if v < self.min_level)
+
+    def log(self, t, msg, _now=time.time):
+        if t not in self._muted:
+            self._put((_now(), t, msg))
+
+    # --- METRICS ---
+    def incr(self, name, n=1):
+        with self._metrics_lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def observe(self, name, ms):
+        with self._metrics_lock:
+            hist = self.latency.get(name)
+            if hist is None:
+                hist = self.latency[name] = LatencyHistogram()
+            hist.record(ms)
+
+    def timed(self, name):
+        return _Timer(self, name)
+
+    def metrics_snapshot(self):
+        with self._metrics_lock:
+            return {
+                "ts": time.time(),
+                "session": self.session_id,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "latency": {name: h.summary() for name, h in self.latency.items()},
+            }
+
+    def summary_line(self, names):
+        """Compact 'name p50/p95/p99' text for the status bar."""
+        parts = []
+        with self._metrics_lock:
+            for name in names:
+                h = self.latency.get(name)
+                if h and h.count:
+                    parts.append(f"{name} {h.percentile(50):.3g}/{h.percentile(95):.3g}/{h.percentile(99):.3g}ms")
+        return " | ".join(parts)
+
+    def flush(self, timeout=5.0):
+        """Blocks until everything logged so far is on disk."""
+        done = threading.Event()
+        self._queue.put((None, "flush", done))
+        done.wait(timeout)
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put((None, "close", None))
+            self._writer.join(5.0)
+
+    # --- WRITER THREAD ---
+    def _run(self):
+        next_metrics = time.time() + METRICS_INTERVAL
+        while True:
+            if time.time() >= next_metrics:
+                self._emit_metrics()
+                next_metrics = time.time() + METRICS_INTERVAL
+            try:
+                batch = [self._queue.get(timeout=FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+            while len(batch) < 10000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines, signals = {}, []
+            for ts, t, msg in batch:
+                if ts is None:
+                    signals.append((t, msg))
+                    continue
+                stamp = datetime.datetime.fromtimestamp(ts)
+                lines.setdefault(t, []).append(f"[{stamp}] [{t.upper()}] [ID:{self.session_id}] {msg}\n")
+            for t, chunk in lines.items():
+                self._write(t, "".join(chunk))
+            for kind, done in signals:
+                if kind == "flush":
+                    done.set()
+                elif kind == "close":
+                    self._emit_metrics()
+                    for handle, _, _ in self._files.values():
+                        handle.close()
+                    self._files.clear()
+                    return
+
+    def _emit_metrics(self):
+        snap = self.metrics_snapshot()
+        if snap["counters"] or snap["gauges"] or snap["latency"]:
+            self._write("metrics", json.dumps(snap) + "\n")
+
+    def _write(self, t, text):
+        try:
+            entry = self._files.get(t)
+            if entry and (entry[0].tell() >= MAX_FILE_BYTES or time.time() - entry[1] >= MAX_FILE_AGE):
+                entry[0].close()
+                entry = self._open(t, entry[2] + 1)
+            elif entry is None:
+                entry = self._open(t, 0)
+            entry[0].write(text)
+            entry[0].flush()
+        except OSError as e:
+            sys.stderr.write(f"[ZEGA TELEMETRY] write failed: {e}\n")
+
+    def _open(self, t, part):
+        folder = os.path.join(self.root, t)
+        os.makedirs(folder, exist_ok=True)
+        suffix = f".{part}" if part else ""
+        ext = ".jsonl" if t == "metrics" else ".log"
+        path = os.path.join(folder, f"{self._started}_{self.session_id}{suffix}{ext}")
+        entry = self._files[t] = [open(path, "a"), time.time(), part]
+        return entry
+
+telemetry = ZegaTelemetry()
@@ -15,286 +15,1229 @@
 #include <Python.h>
 #include <numpy/arrayobject.h>
 #include <numpy/ndarrayobject.h>
-#include <iostream>
 #include <vector>
-#include <memory>
-#include <immintrin.h>
 #include <omp.h>
 #include <cstdint>
 #include <cstring>
 #include <cmath>
-#include <iomanip>
-#include <sstream>
-
-// ZEGA-branded high-performance console logging with ANSI colors
-#define ZEGA_RESET       "\033[0m"
-#define ZEGA_BOLD        "\033[1m"
-#define ZEGA_CYAN        "\033[36m"
-#define ZEGA_GREEN       "\033[32m"
-#define ZEGA_RED         "\033[31m"
-#define ZEGA_YELLOW      "\033[33m"
-#define ZEGA_PURPLE      "\033[35m"
-
-#define ZEGA_LOG_INFO(msg)    std::cout << ZEGA_BOLD ZEGA_CYAN "[ZEGA ENGINE]" ZEGA_GREEN " INFO: " ZEGA_RESET msg << std::endl;
-#define ZEGA_LOG_ERROR(msg)   std::cerr << ZEGA_BOLD ZEGA_CYAN "[ZEGA ENGINE]" ZEGA_RED " ERROR: " ZEGA_RESET msg << std::endl;
-#define ZEGA_LOG_WARNING(msg) std::cout << ZEGA_BOLD ZEGA_CYAN "[ZEGA ENGINE]" ZEGA_YELLOW " WARNING: " ZEGA_RESET msg << std::endl;
-#define ZEGA_LOG_DOMINANCE(msg) std::cout << ZEGA_BOLD ZEGA_PURPLE "[ZEGA DOMINANCE]" ZEGA_RESET " " msg << std::endl;
-
-// Forward declaration of aligned deallocator for smart pointers
-struct AlignedDeleter {
-    void operator()(void* ptr) const { if (ptr) _mm_free(ptr); }
-};
+#include <algorithm>
+#include <type_traits>
+#include <numeric>
+#include <limits>
+#include <unordered_map>
+#include <cstdlib>
+
+// Reductions rely on strict IEEE semantics: -ffast-math would let the compiler
+// drop the Kahan compensation and reassociate sums, breaking reproducibility.
+#if defined(__FAST_MATH__)
+#error "funct must be built without -ffast-math"
+#endif
+
+#if defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))
+#define ZEGA_X86_DISPATCH 1
+#else
+#define ZEGA_X86_DISPATCH 0
+#endif
+
+#if defined(__GNUC__)
+#define ZEGA_INLINE inline __attribute__((always_inline))
+#else
+#define ZEGA_INLINE inline
+#endif
 
 namespace zega {
 
 inline namespace v1 {  // Versioned inline namespace for future-proofing
 
-// Custom linear memory buffer with 32-byte alignment for optimal AVX performance
-// and minimal cache misses. ZEGA refuses to tolerate misaligned data.
-class ZegaLinearMemoryBuffer {
-public:
-    explicit ZegaLinearMemoryBuffer(size_t element_count) {
-        if (element_count == 0) return;
-        size_t bytes = element_count * sizeof(double);
-        raw_ptr_ = _mm_malloc(bytes, 32);
-        if (!raw_ptr_) {
-            ZEGA_LOG_ERROR("Failed to allocate " << element_count << " doubles (aligned).");
-            throw std::bad_alloc();
+// Runtime tuning, set from Python via funct.configure(). Kernels read it when
+// they start; threads == 0 means OpenMP's default (OMP_NUM_THREADS / cores).
+struct ZegaConfig {
+    int threads = 0;
+    size_t parallel_threshold = 65536;  // Elements below which kernels stay single-threaded
+};
+static ZegaConfig g_config;
+
+inline int ZegaThreads() noexcept { return g_config.threads > 0 ? g_config.threads : omp_get_max_threads(); }
+inline bool ZegaParallel(size_t work) noexcept { return work >= g_config.parallel_threshold; }
+
+// Strided 2D view over float32/float64 data. Strides are in bytes, as in the
+// buffer protocol, so column slices and transposed views need no copy.
+template <typename T>
+struct StridedView {
+    char* base;
+    size_t rows;
+    size_t cols;
+    Py_ssize_t row_stride;
+    Py_ssize_t col_stride;
+
+    T* row(size_t r) const noexcept { return reinterpret_cast<T*>(base + static_cast<Py_ssize_t>(r) * row_stride); }
+    T& at(size_t r, size_t c) const noexcept {
+        return *reinterpret_cast<T*>(base + static_cast<Py_ssize_t>(r) * row_stride + static_cast<Py_ssize_t>(c) * col_stride);
+    }
+    bool dense_rows() const noexcept { return col_stride == static_cast<Py_ssize_t>(sizeof(T)); }
+};
+
+// -----------------------------------------------------------------------------
+// Hot loops, written once as portable code and compiled several times below
+// with different target attributes. Variants differ only in instruction set,
+// never in operation order, so every variant returns bitwise identical results.
+// -----------------------------------------------------------------------------
+constexpr size_t kSumLanes = 8;
+
+// Fixed pairwise tree over the lanes
+static_assert(kSumLanes == 8, "LaneSum is written for 8 lanes");
+ZEGA_INLINE double LaneSum(const double* x) noexcept {
+    return ((x[0] + x[1]) + (x[2] + x[3])) + ((x[4] + x[5]) + (x[6] + x[7]));
+}
+
+// Kahan sum of rows r0..r1; column c always feeds lane c % kSumLanes
+template <typename T>
+ZEGA_INLINE double SumRowsImpl(const StridedView<T>& v, size_t r0, size_t r1) noexcept {
+    double sum[kSumLanes] = {0.0}, comp[kSumLanes] = {0.0};
+    const size_t full = v.cols - v.cols % kSumLanes;
+    for (size_t r = r0; r < r1; ++r) {
+        if (v.dense_rows()) {
+            const T* row = v.row(r);
+            for (size_t c = 0; c < full; c += kSumLanes) {
+                for (size_t j = 0; j < kSumLanes; ++j) {
+                    double y = static_cast<double>(row[c + j]) - comp[j];
+                    double t = sum[j] + y;
+                    comp[j] = (t - sum[j]) - y;
+                    sum[j] = t;
+                }
+            }
+        } else {
+            for (size_t c = 0; c < full; c += kSumLanes) {
+                for (size_t j = 0; j < kSumLanes; ++j) {
+                    double y = static_cast<double>(v.at(r, c + j)) - comp[j];
+                    double t = sum[j] + y;
+                    comp[j] = (t - sum[j]) - y;
+                    sum[j] = t;
+                }
+            }
+        }
+        for (size_t c = full; c < v.cols; ++c) {
+            size_t j = c - full;
+            double y = static_cast<double>(v.at(r, c)) - comp[j];
+            double t = sum[j] + y;
+            comp[j] = (t - sum[j]) - y;
+            sum[j] = t;
+        }
+    }
+    double lanes[kSumLanes];
+    for (size_t j = 0; j < kSumLanes; ++j) lanes[j] = sum[j] - comp[j];
+    return LaneSum(lanes);
+}
+
+// out = in * factor for rows r0..r1 (out may alias in)
+template <typename T>
+ZEGA_INLINE void ScaleRowsImpl(const StridedView<T>& in, const StridedView<T>& out,
+                               size_t r0, size_t r1, T factor) noexcept {
+    const bool dense = in.dense_rows() && out.dense_rows();
+    for (size_t r = r0; r < r1; ++r) {
+        if (dense) {
+            const T* src = in.row(r);
+            T* dst = out.row(r);
+            for (size_t c = 0; c < in.cols; ++c) dst[c] = src[c] * factor;
+        } else {
+            for (size_t c = 0; c < in.cols; ++c) out.at(r, c) = in.at(r, c) * factor;
         }
-        ptr_.reset(static_cast<double*>(raw_ptr_));
-        ZEGA_LOG_INFO("Allocated ZEGA-aligned buffer (" << element_count << " doubles). Cache dominance achieved.");
+    }
+}
+
+struct KernelVariant {
+    const char* isa;
+    double (*sum_rows_d)(const StridedView<double>&, size_t, size_t);
+    double (*sum_rows_f)(const StridedView<float>&, size_t, size_t);
+    void (*scale_rows_d)(const StridedView<double>&, const StridedView<double>&, size_t, size_t, double);
+    void (*scale_rows_f)(const StridedView<float>&, const StridedView<float>&, size_t, size_t, float);
+};
+
+#define ZEGA_KERNEL_VARIANT(NS, ATTR)                                                                  \
+    namespace NS {                                                                                     \
+    ATTR double SumRowsD(const StridedView<double>& v, size_t r0, size_t r1) noexcept {                \
+        return SumRowsImpl(v, r0, r1);                                                                 \
+    }                                                                                                  \
+    ATTR double SumRowsF(const StridedView<float>& v, size_t r0, size_t r1) noexcept {                 \
+        return SumRowsImpl(v, r0, r1);                                                                 \
+    }                                                                                                  \
+    ATTR void ScaleRowsD(const StridedView<double>& in, const StridedView<double>& out,                \
+                         size_t r0, size_t r1, double f) noexcept {                                    \
+        ScaleRowsImpl(in, out, r0, r1, f);                                                             \
+    }                                                                                                  \
+    ATTR void ScaleRowsF(const StridedView<float>& in, const StridedView<float>& out,                  \
+                         size_t r0, size_t r1, float f) noexcept {                                     \
+        ScaleRowsImpl(in, out, r0, r1, f);                                                             \
+    }                                                                                                  \
     }
 
-    double* data() noexcept { return ptr_.get(); }
-    const double* data() const noexcept { return ptr_.get(); }
+#if ZEGA_X86_DISPATCH
+ZEGA_KERNEL_VARIANT(isa_scalar, __attribute__((optimize("no-tree-vectorize"))))
+ZEGA_KERNEL_VARIANT(isa_sse2, )  // x86-64 baseline
+ZEGA_KERNEL_VARIANT(isa_avx2, __attribute__((target("avx2"))))
+ZEGA_KERNEL_VARIANT(isa_avx512, __attribute__((target("avx512f"))))
 
-private:
-    void* raw_ptr_ = nullptr;
-    std::unique_ptr<double[], AlignedDeleter> ptr_;
+static const KernelVariant kVariants[] = {  // Ascending preference
+    {"scalar", isa_scalar::SumRowsD, isa_scalar::SumRowsF, isa_scalar::ScaleRowsD, isa_scalar::ScaleRowsF},
+    {"sse2", isa_sse2::SumRowsD, isa_sse2::SumRowsF, isa_sse2::ScaleRowsD, isa_sse2::ScaleRowsF},
+    {"avx2", isa_avx2::SumRowsD, isa_avx2::SumRowsF, isa_avx2::ScaleRowsD, isa_avx2::ScaleRowsF},
+    {"avx512", isa_avx512::SumRowsD, isa_avx512::SumRowsF, isa_avx512::ScaleRowsD, isa_avx512::ScaleRowsF},
 };
 
-// Monolithic compute kernel — the heart of ZEGA's supremacy
+static bool IsaSupported(const KernelVariant& k) {
+    __builtin_cpu_init();
+    if (std::strcmp(k.isa, "avx2") == 0) return __builtin_cpu_supports("avx2");
+    if (std::strcmp(k.isa, "avx512") == 0) return __builtin_cpu_supports("avx512f");
+    return true;  // scalar / sse2 are part of the x86-64 baseline
+}
+#else
+ZEGA_KERNEL_VARIANT(isa_generic, )
+
+static const KernelVariant kVariants[] = {
+    {"generic", isa_generic::SumRowsD, isa_generic::SumRowsF, isa_generic::ScaleRowsD, isa_generic::ScaleRowsF},
+};
+
+static bool IsaSupported(const KernelVariant&) { return true; }
+#endif
+
+static const size_t kVariantCount = sizeof(kVariants) / sizeof(kVariants[0]);
+static const KernelVariant* g_kernels = &kVariants[0];
+
+// Picks `isa` if given and supported, else the best variant this CPU runs.
+// Returns false if `isa` was unknown or unsupported (the best one is kept).
+static bool SelectKernels(const char* isa) {
+    const KernelVariant* best = &kVariants[0];
+    for (size_t i = 0; i < kVariantCount; ++i) {
+        if (IsaSupported(kVariants[i])) best = &kVariants[i];
+    }
+    if (isa && *isa) {
+        for (size_t i = 0; i < kVariantCount; ++i) {
+            if (std::strcmp(kVariants[i].isa, isa) == 0 && IsaSupported(kVariants[i])) {
+                g_kernels = &kVariants[i];
+                return true;
+            }
+        }
+        g_kernels = best;
+        return false;
+    }
+    g_kernels = best;
+    return true;
+}
+
+inline double SumRows(const StridedView<double>& v, size_t r0, size_t r1) { return g_kernels->sum_rows_d(v, r0, r1); }
+inline double SumRows(const StridedView<float>& v, size_t r0, size_t r1) { return g_kernels->sum_rows_f(v, r0, r1); }
+inline void ScaleRows(const StridedView<double>& in, const StridedView<double>& out, size_t r0, size_t r1, double f) {
+    g_kernels->scale_rows_d(in, out, r0, r1, f);
+}
+inline void ScaleRows(const StridedView<float>& in, const StridedView<float>& out, size_t r0, size_t r1, double f) {
+    g_kernels->scale_rows_f(in, out, r0, r1, static_cast<float>(f));
+}
+
+// Monolithic compute kernel — the heart of ZEGA's supremacy.
+// Every kernel runs without the GIL, so it must never touch Python objects.
 class ZegaComputeKernel {
 public:
-    // High-precision summation using parallel compensated (Kahan) algorithm
-    // with thread-local accumulation and final compensated reduction.
-    static double SumAll(const double* data, size_t rows, size_t cols) {
-        ZEGA_LOG_INFO("SumAll invoked on " << rows << "×" << cols << " matrix. Precision mode engaged.");
-        size_t total = rows * cols;
+    // Deterministic blocked summation. The matrix is cut into fixed blocks of
+    // rows (sized from the shape only, ~kSumBlock elements each). Inside a block,
+    // column c always feeds Kahan lane c % kSumLanes, and lanes and block sums
+    // are combined by a fixed pairwise tree. Threads only decide who computes
+    // which block, so the result is bitwise identical for any thread count,
+    // memory layout or instruction set. float32 input is accumulated in double.
+    static constexpr size_t kSumBlock = 16384;
+
+    static double BlockTreeSum(const double* x, size_t n) noexcept {
+        if (n == 0) return 0.0;
+        if (n == 1) return x[0];
+        size_t half = n / 2;
+        return BlockTreeSum(x, half) + BlockTreeSum(x + half, n - half);
+    }
+
+    template <typename T>
+    static double SumAll(const StridedView<T>& v) {
+        size_t total = v.rows * v.cols;
         if (total == 0) return 0.0;
 
-        int threads = omp_get_max_threads();
-        std::vector<double> partial_sums(threads, 0.0);
+        const size_t rows_per_block = std::max<size_t>(1, kSumBlock / v.cols);
+        const size_t blocks = (v.rows + rows_per_block - 1) / rows_per_block;
+        std::vector<double> partial(blocks);
+        int threads = ZegaThreads();
 
-        #pragma omp parallel if(total > 500000)
-        {
-            int tid = omp_get_thread_num();
-            int num_threads = omp_get_num_threads();
-            double local_sum = 0.0;
-            double compensation = 0.0;
-
-            // Row-stride distribution maximizes cache locality
-            for (size_t r = tid; r < rows; r += num_threads) {
-                const double* row_ptr = data + r * cols;
-                for (size_t c = 0; c < cols; ++c) {
-                    double y = row_ptr[c] - compensation;
-                    double t = local_sum + y;
-                    compensation = (t - local_sum) - y;
-                    local_sum = t;
+        #pragma omp parallel for schedule(static) num_threads(threads) if(ZegaParallel(total))
+        for (intptr_t b = 0; b < static_cast<intptr_t>(blocks); ++b) {
+            size_t r0 = static_cast<size_t>(b) * rows_per_block;
+            partial[b] = SumRows(v, r0, std::min(v.rows, r0 + rows_per_block));
+        }
+        return BlockTreeSum(partial.data(), blocks);
+    }
+
+    // Ultra-fast scaling: the dispatched SIMD variant per block of rows, blocks
+    // spread over OpenMP threads. `out` may be `in` itself (in-place).
+    static constexpr size_t kScaleRows = 256;
+
+    template <typename T>
+    static void Scale(const StridedView<T>& in, const StridedView<T>& out, double factor) {
+        const size_t blocks = (in.rows + kScaleRows - 1) / kScaleRows;
+        int threads = ZegaThreads();
+        #pragma omp parallel for schedule(static) num_threads(threads) if(ZegaParallel(in.rows * in.cols))
+        for (intptr_t b = 0; b < static_cast<intptr_t>(blocks); ++b) {
+            size_t r0 = static_cast<size_t>(b) * kScaleRows;
+            ScaleRows(in, out, r0, std::min(in.rows, r0 + kScaleRows), factor);
+        }
+    }
+
+    // Predictive analysis: per-column trend forecasts, either a linear fit
+    // (OLS) over the last `window` rows or Holt's linear exponential smoothing
+    // over the whole column. Without `rolling`, `out` is horizon×cols: steps
+    // 1..horizon past the last row. With `rolling`, `out` is rows×cols and row
+    // r holds the forecast `horizon` steps past r made from rows <= r, which
+    // is what a backtest or a forecast column needs.
+    enum class Forecast { OLS, Holt };
+
+    struct ForecastSpec {
+        size_t window = 30;
+        size_t horizon = 1;
+        Forecast method = Forecast::OLS;
+        double alpha = 0.5;          // Holt: level smoothing
+        double beta = 0.1;           // Holt: trend smoothing
+        bool rolling = false;
+    };
+
+    // Rolling OLS keeps the window sums up to date in O(1) per row and
+    // recomputes them exactly every kReanchorRows rows so rounding cannot drift.
+    static constexpr size_t kReanchorRows = 4096;
+
+    // Fit over n points at x = 0..n-1 with sum_y, sum_xy; value at x = n-1+h
+    static double OlsForecast(double n, double sum_y, double sum_xy, double h) noexcept {
+        double sum_x = n * (n - 1.0) / 2.0;
+        double sum_x2 = (n - 1.0) * n * (2.0 * n - 1.0) / 6.0;
+        double slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x);
+        double intercept = (sum_y - slope * sum_x) / n;
+        return slope * (n - 1.0 + h) + intercept;
+    }
+
+    template <typename T>
+    static void OlsColumn(const StridedView<T>& in, const StridedView<T>& out, size_t col, const ForecastSpec& f) {
+        const size_t rows = in.rows, w = f.window;
+        const double h = static_cast<double>(f.horizon);
+        if (!f.rolling) {
+            if (rows == 0) {
+                for (size_t k = 0; k < f.horizon; ++k) out.at(k, col) = T(0);
+                return;
+            }
+            size_t start = rows > w ? rows - w : 0;
+            double n = static_cast<double>(rows - start), sum_y = 0.0, sum_xy = 0.0;
+            for (size_t r = start; r < rows; ++r) {
+                double y = static_cast<double>(in.at(r, col));
+                sum_y += y;
+                sum_xy += static_cast<double>(r - start) * y;
+            }
+            for (size_t k = 0; k < f.horizon; ++k) {
+                out.at(k, col) = static_cast<T>(n >= 2.0 ? OlsForecast(n, sum_y, sum_xy, static_cast<double>(k + 1))
+                                                         : static_cast<double>(in.at(rows - 1, col)));
+            }
+            return;
+        }
+
+        double sum_y = 0.0, sum_xy = 0.0;   // Over rows [r - n + 1, r], x relative to the window start
+        for (size_t r = 0; r < rows; ++r) {
+            double y = static_cast<double>(in.at(r, col));
+            size_t n = std::min(r + 1, w);
+            if (r % kReanchorRows == 0) {
+                sum_y = sum_xy = 0.0;
+                for (size_t i = r + 1 - n; i <= r; ++i) {
+                    double yi = static_cast<double>(in.at(i, col));
+                    sum_y += yi;
+                    sum_xy += static_cast<double>(i - (r + 1 - n)) * yi;
                 }
+            } else if (r < w) {
+                sum_xy += static_cast<double>(r) * y;       // Window still growing
+                sum_y += y;
+            } else {
+                double oldest = static_cast<double>(in.at(r - w, col));
+                sum_xy += oldest - sum_y + static_cast<double>(w - 1) * y;  // Every x shifts down by one
+                sum_y += y - oldest;
             }
-            partial_sums[tid] = local_sum;
+            out.at(r, col) = static_cast<T>(n >= 2 ? OlsForecast(static_cast<double>(n), sum_y, sum_xy, h) : y);
         }
+    }
 
-        // Final Kahan reduction of partial sums
-        double result = partial_sums[0];
-        double comp = 0.0;
-        for (int t = 1; t < threads; ++t) {
-            double y = partial_sums[t] - comp;
-            double t_sum = result + y;
-            comp = (t_sum - result) - y;
-            result = t_sum;
+    template <typename T>
+    static void HoltColumn(const StridedView<T>& in, const StridedView<T>& out, size_t col, const ForecastSpec& f) {
+        const double a = f.alpha, b = f.beta;
+        double level = 0.0, trend = 0.0;
+        for (size_t r = 0; r < in.rows; ++r) {
+            double y = static_cast<double>(in.at(r, col));
+            if (r == 0) {
+                level = y;
+            } else if (r == 1) {
+                trend = y - level;
+                level = y;
+            } else {
+                double prev = level;
+                level = a * y + (1.0 - a) * (level + trend);
+                trend = b * (level - prev) + (1.0 - b) * trend;
+            }
+            if (f.rolling) out.at(r, col) = static_cast<T>(level + static_cast<double>(f.horizon) * trend);
+        }
+        if (!f.rolling) {
+            for (size_t k = 0; k < f.horizon; ++k) {
+                out.at(k, col) = static_cast<T>(level + static_cast<double>(k + 1) * trend);
+            }
         }
+    }
 
-        ZEGA_LOG_DOMINANCE("SumAll complete. Result: " << std::setprecision(15) << result << ". Excel weeps.");
-        return result;
+    template <typename T>
+    static void PredictiveAnalysis(const StridedView<T>& in, const StridedView<T>& out, const ForecastSpec& f) {
+        int threads = ZegaThreads();
+        #pragma omp parallel for num_threads(threads) if(ZegaParallel(in.rows * in.cols))
+        for (intptr_t col = 0; col < static_cast<intptr_t>(in.cols); ++col) {
+            if (f.method == Forecast::OLS) OlsColumn(in, out, col, f);
+            else HoltColumn(in, out, col, f);
+        }
     }
 
-    // Ultra-fast scaling using AVX-256 and OpenMP with row-wise parallelism
-    static void Scale(const double* input, double* output, size_t rows, size_t cols, double factor) {
-        ZEGA_LOG_INFO("Scale invoked with factor " << factor << ". AVX power unleashed.");
+    // Custom 64-bit integrity checksum (FNV-1a variant) for data validation.
+    // Elements are hashed in row-major order regardless of memory layout.
+    template <typename T>
+    static uint64_t IntegrityCheck(const StridedView<T>& v) {
+        uint64_t hash = 14695981039346656037ULL;
+        const uint64_t prime = 1099511628211ULL;
 
-        #pragma omp parallel for schedule(static) if(rows > 50)
-        for (intptr_t r = 0; r < static_cast<intptr_t>(rows); ++r) {
-            const double* in_row = input + r * cols;
-            double* out_row = output + r * cols;
+        for (size_t r = 0; r < v.rows; ++r) {
+            for (size_t c = 0; c < v.cols; ++c) {
+                typename std::conditional<sizeof(T) == 8, uint64_t, uint32_t>::type bits;
+                std::memcpy(&bits, &v.at(r, c), sizeof(T));
+                hash ^= bits;
+                hash *= prime;
+            }
+        }
+        return hash;
+    }
 
-            __m256d factor_vec = _mm256_set1_pd(factor);
-            size_t c = 0;
+    // FNV-1a over n zero elements: XOR with 0 is a no-op, so it is prime^n
+    static constexpr uint64_t kFnvPrime = 1099511628211ULL;
+    static uint64_t FnvZeros(size_t n) noexcept {
+        uint64_t result = 1, base = kFnvPrime;
+        for (; n; n >>= 1, base *= base) {
+            if (n & 1) result *= base;
+        }
+        return result;
+    }
 
-            // AVX-256 vectorized main loop (4 doubles = 32 bytes)
-            for (; c + 3 < cols; c += 4) {
-                __m256d data_vec = _mm256_loadu_pd(in_row + c);
-                __m256d result_vec = _mm256_mul_pd(data_vec, factor_vec);
-                _mm256_storeu_pd(out_row + c, result_vec);
+    // IntegrityCheck applied to each block_rows x block_cols block separately
+    // (row-major within the block), for Merkle leaves. Edge blocks hash as if
+    // zero-padded to full size, the same as the ZSFF tile holding them.
+    // Blocks are independent, so they are spread over threads.
+    template <typename T>
+    static void BlockHashes(const StridedView<T>& v, size_t block_rows, size_t block_cols,
+                            size_t grid_cols, size_t blocks, uint64_t* out) {
+        using Bits = typename std::conditional<sizeof(T) == 8, uint64_t, uint32_t>::type;
+        int threads = ZegaThreads();
+        #pragma omp parallel for schedule(static) num_threads(threads) if(ZegaParallel(v.rows * v.cols))
+        for (intptr_t b = 0; b < static_cast<intptr_t>(blocks); ++b) {
+            const size_t r0 = static_cast<size_t>(b) / grid_cols * block_rows;
+            const size_t c0 = static_cast<size_t>(b) % grid_cols * block_cols;
+            const size_t r_end = std::min(r0 + block_rows, v.rows);
+            const size_t c_end = std::min(c0 + block_cols, v.cols);
+            uint64_t hash = 14695981039346656037ULL;
+            for (size_t r = r0; r < r_end; ++r) {
+                for (size_t c = c0; c < c_end; ++c) {
+                    Bits bits;
+                    std::memcpy(&bits, &v.at(r, c), sizeof(T));
+                    hash ^= bits;
+                    hash *= kFnvPrime;
+                }
+                hash *= FnvZeros(block_cols - (c_end - c0));    // Padding columns
             }
+            out[b] = hash * FnvZeros((r0 + block_rows - r_end) * block_cols);    // Padding rows
+        }
+    }
+
+    // -------------------------------------------------------------------------
+    // Analyst kernels: reductions, sort, filter, group-by
+    // -------------------------------------------------------------------------
+
+    // One-pass running statistics (Welford) that merge exactly (Chan et al.)
+    struct RunningStats {
+        double n = 0.0, mean = 0.0, m2 = 0.0, sum = 0.0, comp = 0.0;
+        double min = std::numeric_limits<double>::infinity();
+        double max = -std::numeric_limits<double>::infinity();
+
+        void push(double x) noexcept {
+            n += 1.0;
+            double delta = x - mean;
+            mean += delta / n;
+            m2 += delta * (x - mean);
+            double y = x - comp;       // Kahan-compensated sum
+            double t = sum + y;
+            comp = (t - sum) - y;
+            sum = t;
+            if (x < min) min = x;
+            if (x > max) max = x;
+        }
+
+        void merge(const RunningStats& o) noexcept {
+            if (o.n == 0.0) return;
+            if (n == 0.0) { *this = o; return; }
+            double total = n + o.n;
+            double delta = o.mean - mean;
+            mean += delta * o.n / total;
+            m2 += o.m2 + delta * delta * n * o.n / total;
+            double y = (o.sum - o.comp) - comp;
+            double t = sum + y;
+            comp = (t - sum) - y;
+            sum = t;
+            n = total;
+            min = std::min(min, o.min);
+            max = std::max(max, o.max);
+        }
 
-            // Scalar tail
-            for (; c < cols; ++c) {
-                out_row[c] = in_row[c] * factor;
+        // sum, mean, min, max, sample standard deviation (NaN below 2 values)
+        void write(double* out, size_t stride) const noexcept {
+            const double nan = std::numeric_limits<double>::quiet_NaN();
+            out[0] = sum;
+            out[stride] = n > 0.0 ? mean : nan;
+            out[2 * stride] = n > 0.0 ? min : nan;
+            out[3 * stride] = n > 0.0 ? max : nan;
+            out[4 * stride] = n > 1.0 ? std::sqrt(m2 / (n - 1.0)) : nan;
+        }
+    };
+
+    // [first, last) of contiguous chunk `part` when splitting n items into `parts`
+    static std::pair<size_t, size_t> ChunkBounds(size_t n, int part, int parts) noexcept {
+        size_t per = (n + parts - 1) / parts;
+        size_t first = std::min(n, per * static_cast<size_t>(part));
+        return {first, std::min(n, first + per)};
+    }
+
+    // Per-column (axis 0) or per-row (axis 1) statistics in a single pass.
+    // `out` is a C-contiguous 5×k float64 buffer, k = cols or rows.
+    template <typename T>
+    static void Stats(const StridedView<T>& v, int axis, double* out) {
+        if (axis == 1) {
+            int threads = ZegaThreads();
+            #pragma omp parallel for schedule(static) num_threads(threads) if(ZegaParallel(v.rows * v.cols))
+            for (intptr_t r = 0; r < static_cast<intptr_t>(v.rows); ++r) {
+                RunningStats s;
+                for (size_t c = 0; c < v.cols; ++c) s.push(static_cast<double>(v.at(r, c)));
+                s.write(out + r, v.rows);
             }
+            return;
         }
 
-        ZEGA_LOG_DOMINANCE("Scale complete. Performance gap to competitors: infinite.");
+        // Columns: each thread streams a contiguous block of rows, then partials merge in order
+        int threads = ZegaThreads();
+        std::vector<std::vector<RunningStats>> partial(threads, std::vector<RunningStats>(v.cols));
+        #pragma omp parallel num_threads(threads) if(ZegaParallel(v.rows * v.cols))
+        {
+            int tid = omp_get_thread_num();
+            auto range = ChunkBounds(v.rows, tid, omp_get_num_threads());
+            std::vector<RunningStats>& acc = partial[tid];
+            for (size_t r = range.first; r < range.second; ++r) {
+                for (size_t c = 0; c < v.cols; ++c) acc[c].push(static_cast<double>(v.at(r, c)));
+            }
+        }
+        for (size_t c = 0; c < v.cols; ++c) {
+            RunningStats s;
+            for (int t = 0; t < threads; ++t) s.merge(partial[t][c]);
+            s.write(out + c, v.cols);
+        }
     }
 
-    // Predictive analysis: rolling linear regression per column to simulate future trends
-    // Returns a 1×cols array of predicted next values using a rolling window.
-    static void PredictiveAnalysis(const double* input, double* predictions, size_t rows, size_t cols) {
-        ZEGA_LOG_INFO("PredictiveAnalysis invoked. Forecasting the inevitable rise of ZEGA.");
+    // Stable multi-key row sort. Returns the permutation; NaN sorts last in either direction.
+    template <typename T>
+    static std::vector<int64_t> SortRows(const StridedView<T>& v, const std::vector<size_t>& keys,
+                                         const std::vector<bool>& descending) {
+        const size_t n = v.rows;
+        std::vector<int64_t> idx(n);
+        std::iota(idx.begin(), idx.end(), 0);
 
-        const size_t window = std::min<size_t>(30, rows > 0 ? rows : 1);
+        auto less = [&](int64_t i, int64_t j) {
+            for (size_t k = 0; k < keys.size(); ++k) {
+                double x = static_cast<double>(v.at(i, keys[k]));
+                double y = static_cast<double>(v.at(j, keys[k]));
+                bool xn = std::isnan(x), yn = std::isnan(y);
+                if (xn || yn) {
+                    if (xn && yn) continue;
+                    return yn;
+                }
+                if (x == y) continue;
+                return descending[k] ? x > y : x < y;
+            }
+            return false;
+        };
 
-        #pragma omp parallel for if(cols > 8)
-        for (intptr_t col = 0; col < static_cast<intptr_t>(cols); ++col) {
-            size_t start = (rows > window) ? rows - window : 0;
-            double n = 0.0;
-            double sum_x = 0.0, sum_y = 0.0, sum_xy = 0.0, sum_x2 = 0.0;
+        // Sort contiguous runs in parallel, then merge neighbours pairwise (std::merge is stable)
+        int threads = ZegaThreads();
+        int parts = ZegaParallel(n * keys.size())
+            ? static_cast<int>(std::max<size_t>(1, std::min<size_t>(threads, n / 16384))) : 1;
+        std::vector<size_t> bounds(parts + 1);
+        for (int p = 0; p <= parts; ++p) bounds[p] = ChunkBounds(n, p, parts).first;
 
-            for (size_t r = start; r < rows; ++r) {
-                double x = static_cast<double>(r - start);
-                double y = input[r * cols + col];
-                sum_x += x;
-                sum_y += y;
-                sum_xy += x * y;
-                sum_x2 += x * x;
-                ++n;
+        #pragma omp parallel for schedule(static) num_threads(threads) if(parts > 1)
+        for (int p = 0; p < parts; ++p) {
+            std::stable_sort(idx.begin() + bounds[p], idx.begin() + bounds[p + 1], less);
+        }
+        std::vector<int64_t> tmp(n);
+        for (int width = 1; width < parts; width *= 2) {
+            #pragma omp parallel for schedule(static) num_threads(threads)
+            for (int p = 0; p < parts; p += 2 * width) {
+                size_t lo = bounds[p];
+                size_t mid = bounds[std::min(p + width, parts)];
+                size_t hi = bounds[std::min(p + 2 * width, parts)];
+                std::merge(idx.begin() + lo, idx.begin() + mid, idx.begin() + mid, idx.begin() + hi,
+                           tmp.begin() + lo, less);
             }
+            idx.swap(tmp);
+        }
+        return idx;
+    }
 
-            double prediction = 0.0;
-            if (n >= 2.0) {
-                double denom = n * sum_x2 - sum_x * sum_x;
-                if (std::abs(denom) > 1e-12) {
-                    double slope = (n * sum_xy - sum_x * sum_y) / denom;
-                    double intercept = (sum_y - slope * sum_x) / n;
-                    prediction = slope * static_cast<double>(n) + intercept;
-                } else {
-                    prediction = sum_y / n;  // Flat line
-                }
-            } else if (rows > 0) {
-                prediction = input[(rows - 1) * cols + col];
+    enum class Op { LT, LE, GT, GE, EQ, NE };
+
+    struct Predicate {
+        size_t col;
+        Op op;
+        double value;
+
+        bool test(double x) const noexcept {
+            switch (op) {
+                case Op::LT: return x < value;
+                case Op::LE: return x <= value;
+                case Op::GT: return x > value;
+                case Op::GE: return x >= value;
+                case Op::EQ: return x == value;
+                case Op::NE: return x != value;
             }
-            predictions[col] = prediction;
+            return false;
         }
+    };
 
-        ZEGA_LOG_DOMINANCE("PredictiveAnalysis complete. The future belongs to ZEGA.");
+    // Indices of rows satisfying every predicate, in ascending order
+    template <typename T>
+    static std::vector<int64_t> FilterRows(const StridedView<T>& v, const std::vector<Predicate>& preds) {
+        int threads = ZegaThreads();
+        std::vector<std::vector<int64_t>> hits(threads);
+        #pragma omp parallel num_threads(threads) if(ZegaParallel(v.rows * preds.size()))
+        {
+            int tid = omp_get_thread_num();
+            auto range = ChunkBounds(v.rows, tid, omp_get_num_threads());
+            std::vector<int64_t>& mine = hits[tid];
+            for (size_t r = range.first; r < range.second; ++r) {
+                bool keep = true;
+                for (const Predicate& p : preds) {
+                    if (!p.test(static_cast<double>(v.at(r, p.col)))) { keep = false; break; }
+                }
+                if (keep) mine.push_back(static_cast<int64_t>(r));
+            }
+        }
+        std::vector<int64_t> rows;
+        for (auto& part : hits) rows.insert(rows.end(), part.begin(), part.end());
+        return rows;
     }
 
-    // Custom 64-bit integrity checksum (FNV-1a variant) for data validation
-    static uint64_t IntegrityCheck(const double* data, size_t rows, size_t cols) {
-        ZEGA_LOG_INFO("IntegrityCheck invoked. Securing data sovereignty.");
+    // Hash group-by on one key column. Groups are numbered in order of first
+    // appearance; per group and value column: sum, min, max.
+    struct GroupTable {
+        std::vector<double> keys;
+        std::vector<int64_t> counts;
+        std::vector<double> aggs;  // group-major: [g][value col][sum, min, max]
+        std::unordered_map<uint64_t, size_t> index;
+    };
 
-        uint64_t hash = 14695981039346656037ULL;
-        const uint64_t prime = 1099511628211ULL;
-        size_t total = rows * cols;
+    static uint64_t KeyBits(double key) noexcept {
+        if (key == 0.0) key = 0.0;                                      // -0.0 joins 0.0
+        if (std::isnan(key)) key = std::numeric_limits<double>::quiet_NaN();  // one NaN group
+        uint64_t bits;
+        std::memcpy(&bits, &key, sizeof(bits));
+        return bits;
+    }
 
-        for (size_t i = 0; i < total; ++i) {
-            uint64_t bits;
-            std::memcpy(&bits, &data[i], sizeof(double));
-            hash ^= bits;
-            hash *= prime;
+    static size_t GroupSlot(GroupTable& g, double key, size_t width) {
+        auto found = g.index.emplace(KeyBits(key), g.keys.size());
+        if (found.second) {
+            g.keys.push_back(key);
+            g.counts.push_back(0);
+            for (size_t i = 0; i < width; ++i) {
+                g.aggs.push_back(0.0);
+                g.aggs.push_back(std::numeric_limits<double>::infinity());
+                g.aggs.push_back(-std::numeric_limits<double>::infinity());
+            }
         }
+        return found.first->second;
+    }
 
-        ZEGA_LOG_DOMINANCE("Integrity verified. Checksum: 0x" << std::hex << hash << std::dec << ". Untouchable.");
-        return hash;
+    template <typename T>
+    static GroupTable GroupBy(const StridedView<T>& v, size_t key_col, const std::vector<size_t>& value_cols) {
+        const size_t width = value_cols.size();
+        int threads = ZegaThreads();
+        std::vector<GroupTable> partial(threads);
+        #pragma omp parallel num_threads(threads) if(ZegaParallel(v.rows * (width + 1)))
+        {
+            int tid = omp_get_thread_num();
+            auto range = ChunkBounds(v.rows, tid, omp_get_num_threads());
+            GroupTable& g = partial[tid];
+            for (size_t r = range.first; r < range.second; ++r) {
+                size_t slot = GroupSlot(g, static_cast<double>(v.at(r, key_col)), width);
+                g.counts[slot] += 1;
+                double* agg = &g.aggs[slot * width * 3];
+                for (size_t i = 0; i < width; ++i) {
+                    double x = static_cast<double>(v.at(r, value_cols[i]));
+                    agg[3 * i] += x;
+                    agg[3 * i + 1] = std::min(agg[3 * i + 1], x);
+                    agg[3 * i + 2] = std::max(agg[3 * i + 2], x);
+                }
+            }
+        }
+        // Merging in thread order keeps first-appearance order across chunks
+        GroupTable merged;
+        for (GroupTable& g : partial) {
+            for (size_t s = 0; s < g.keys.size(); ++s) {
+                size_t slot = GroupSlot(merged, g.keys[s], width);
+                merged.counts[slot] += g.counts[s];
+                double* dst = &merged.aggs[slot * width * 3];
+                const double* src = &g.aggs[s * width * 3];
+                for (size_t i = 0; i < width; ++i) {
+                    dst[3 * i] += src[3 * i];
+                    dst[3 * i + 1] = std::min(dst[3 * i + 1], src[3 * i + 1]);
+                    dst[3 * i + 2] = std::max(dst[3 * i + 2], src[3 * i + 2]);
+                }
+            }
+        }
+        return merged;
     }
 };
 
 } // inline namespace v1
 } // namespace zega
 
+// -----------------------------------------------------------------------------
 // Python C-API wrappers
-static PyObject* funct_sum_all(PyObject*, PyObject* args) {
-    PyArrayObject* arr = nullptr;
-    if (!PyArg_ParseTuple(args, "O!", &PyArray_Type, &arr)) return nullptr;
+//
+// Arrays arrive through the buffer protocol: any float64/float32 1D or 2D
+// object, including non-contiguous NumPy views. A 1D input is one column.
+// The GIL is released around every kernel call.
+// -----------------------------------------------------------------------------
+using zega::v1::StridedView;
+using zega::v1::ZegaComputeKernel;
+
+struct ZegaBuffer {
+    Py_buffer buf{};
+    bool held = false;
+    char kind = 0;  // 'd' (float64) or 'f' (float32)
+    size_t rows = 0, cols = 0;
+    Py_ssize_t row_stride = 0, col_stride = 0;
+
+    ZegaBuffer() = default;
+    ZegaBuffer(const ZegaBuffer&) = delete;
+    ZegaBuffer& operator=(const ZegaBuffer&) = delete;
+    ~ZegaBuffer() { if (held) PyBuffer_Release(&buf); }
+
+    template <typename T>
+    StridedView<T> view() const {
+        return StridedView<T>{static_cast<char*>(buf.buf), rows, cols, row_stride, col_stride};
+    }
+};
 
-    if (PyArray_NDIM(arr) != 2 || PyArray_TYPE(arr) != NPY_DOUBLE || !PyArray_IS_C_CONTIGUOUS(arr)) {
-        PyErr_SetString(PyExc_ValueError, "Expected contiguous 2D float64 NumPy array");
+static bool zega_get_buffer(PyObject* obj, ZegaBuffer& z, bool writable, const char* arg) {
+    int flags = PyBUF_STRIDES | PyBUF_FORMAT | (writable ? PyBUF_WRITABLE : 0);
+    if (PyObject_GetBuffer(obj, &z.buf, flags) < 0) return false;
+    z.held = true;
+
+    const char* fmt = z.buf.format ? z.buf.format : "B";
+    if (*fmt == '<' || *fmt == '=' || *fmt == '@') ++fmt;
+    if (std::strcmp(fmt, "d") == 0 && z.buf.itemsize == 8) {
+        z.kind = 'd';
+    } else if (std::strcmp(fmt, "f") == 0 && z.buf.itemsize == 4) {
+        z.kind = 'f';
+    } else {
+        PyErr_Format(PyExc_TypeError, "%s: expected float64 or float32 data", arg);
+        return false;
+    }
+
+    if (z.buf.ndim == 1) {
+        z.rows = static_cast<size_t>(z.buf.shape[0]);
+        z.cols = 1;
+        z.row_stride = z.buf.strides[0];
+        z.col_stride = z.buf.itemsize;
+    } else if (z.buf.ndim == 2) {
+        z.rows = static_cast<size_t>(z.buf.shape[0]);
+        z.cols = static_cast<size_t>(z.buf.shape[1]);
+        z.row_stride = z.buf.strides[0];
+        z.col_stride = z.buf.strides[1];
+    } else {
+        PyErr_Format(PyExc_ValueError, "%s: expected a 1D or 2D array", arg);
+        return false;
+    }
+    return true;
+}
+
+// New C-contiguous NumPy array with the given shape and the dtype of `like`
+static PyObject* zega_new_array(int ndim, npy_intp* dims, const ZegaBuffer& like) {
+    return PyArray_SimpleNew(ndim, dims, like.kind == 'd' ? NPY_DOUBLE : NPY_FLOAT);
+}
+
+// Resolves the optional out= argument: validates it, or allocates a new array.
+// Returns a new reference to the object that will hold the result.
+static PyObject* zega_output(PyObject* out, ZegaBuffer& ob, const ZegaBuffer& like,
+                             int ndim, npy_intp* dims) {
+    PyObject* target = out;
+    if (out == nullptr || out == Py_None) {
+        target = zega_new_array(ndim, dims, like);
+        if (!target) return nullptr;
+    } else {
+        Py_INCREF(target);
+    }
+    if (!zega_get_buffer(target, ob, true, "out")) {
+        Py_DECREF(target);
         return nullptr;
     }
+    size_t want_cols = ndim == 2 ? static_cast<size_t>(dims[1]) : 1;
+    if (ob.kind != like.kind || ob.rows != static_cast<size_t>(dims[0]) || ob.cols != want_cols) {
+        PyErr_SetString(PyExc_ValueError, "out: shape or dtype does not match the result");
+        Py_DECREF(target);
+        return nullptr;
+    }
+    return target;
+}
 
-    npy_intp* dims = PyArray_DIMS(arr);
-    double* data = static_cast<double*>(PyArray_DATA(arr));
-    double result = zega::v1::ZegaComputeKernel::SumAll(data, dims[0], dims[1]);
+static PyObject* funct_sum_all(PyObject*, PyObject* args) {
+    PyObject* obj = nullptr;
+    if (!PyArg_ParseTuple(args, "O", &obj)) return nullptr;
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
 
+    double result = 0.0;
+    Py_BEGIN_ALLOW_THREADS
+    result = a.kind == 'd' ? ZegaComputeKernel::SumAll(a.view<double>())
+                           : ZegaComputeKernel::SumAll(a.view<float>());
+    Py_END_ALLOW_THREADS
     return PyFloat_FromDouble(result);
 }
 
-static PyObject* funct_scale(PyObject*, PyObject* args) {
-    PyArrayObject* arr = nullptr;
+static PyObject* funct_scale(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"a", "factor", "out", nullptr};
+    PyObject* obj = nullptr;
+    PyObject* out = nullptr;
+    double factor = 0.0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Od|O", const_cast<char**>(kwlist), &obj, &factor, &out))
+        return nullptr;
+    ZegaBuffer a, o;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
+    PyObject* result = zega_output(out, o, a, a.buf.ndim, a.buf.shape);
+    if (!result) return nullptr;
+
+    Py_BEGIN_ALLOW_THREADS
+    if (a.kind == 'd') ZegaComputeKernel::Scale(a.view<double>(), o.view<double>(), factor);
+    else ZegaComputeKernel::Scale(a.view<float>(), o.view<float>(), factor);
+    Py_END_ALLOW_THREADS
+    return result;
+}
+
+static PyObject* funct_scale_inplace(PyObject*, PyObject* args) {
+    PyObject* obj = nullptr;
     double factor = 0.0;
-    if (!PyArg_ParseTuple(args, "O!d", &PyArray_Type, &arr, &factor)) return nullptr;
+    if (!PyArg_ParseTuple(args, "Od", &obj, &factor)) return nullptr;
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, true, "a")) return nullptr;
+
+    Py_BEGIN_ALLOW_THREADS
+    if (a.kind == 'd') ZegaComputeKernel::Scale(a.view<double>(), a.view<double>(), factor);
+    else ZegaComputeKernel::Scale(a.view<float>(), a.view<float>(), factor);
+    Py_END_ALLOW_THREADS
+    Py_RETURN_NONE;
+}
 
-    if (PyArray_NDIM(arr) != 2 || PyArray_TYPE(arr) != NPY_DOUBLE || !PyArray_IS_C_CONTIGUOUS(arr)) {
-        PyErr_SetString(PyExc_ValueError, "Expected contiguous 2D float64 NumPy array");
+static PyObject* funct_predictive_analysis(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"a", "out", "window", "horizon", "method", "alpha", "beta", "rolling", nullptr};
+    PyObject* obj = nullptr;
+    PyObject* out = nullptr;
+    Py_ssize_t window = 30, horizon = 1;
+    const char* method = "ols";
+    int rolling = 0;
+    ZegaComputeKernel::ForecastSpec spec;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|Onnsddp", const_cast<char**>(kwlist), &obj, &out,
+                                     &window, &horizon, &method, &spec.alpha, &spec.beta, &rolling))
+        return nullptr;
+    if (window < 1 || horizon < 1) {
+        PyErr_SetString(PyExc_ValueError, "window and horizon must be >= 1");
+        return nullptr;
+    }
+    if (std::strcmp(method, "ols") == 0) {
+        spec.method = ZegaComputeKernel::Forecast::OLS;
+    } else if (std::strcmp(method, "holt") == 0) {
+        spec.method = ZegaComputeKernel::Forecast::Holt;
+    } else {
+        PyErr_Format(PyExc_ValueError, "method must be 'ols' or 'holt', not '%s'", method);
+        return nullptr;
+    }
+    if (!(spec.alpha > 0.0 && spec.alpha <= 1.0) || !(spec.beta >= 0.0 && spec.beta <= 1.0)) {
+        PyErr_SetString(PyExc_ValueError, "alpha must be in (0, 1] and beta in [0, 1]");
         return nullptr;
     }
+    spec.window = static_cast<size_t>(window);
+    spec.horizon = static_cast<size_t>(horizon);
+    spec.rolling = rolling != 0;
 
-    npy_intp* dims = PyArray_DIMS(arr);
-    PyObject* result = PyArray_SimpleNew(2, dims, NPY_DOUBLE);
+    ZegaBuffer a, o;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
+    npy_intp out_dims[2] = {spec.rolling ? static_cast<npy_intp>(a.rows) : horizon, static_cast<npy_intp>(a.cols)};
+    PyObject* result = zega_output(out, o, a, 2, out_dims);
     if (!result) return nullptr;
 
-    double* in_data = static_cast<double*>(PyArray_DATA(arr));
-    double* out_data = static_cast<double*>(PyArray_DATA((PyArrayObject*)result));
-
-    zega::v1::ZegaComputeKernel::Scale(in_data, out_data, dims[0], dims[1], factor);
-
+    Py_BEGIN_ALLOW_THREADS
+    if (a.kind == 'd') ZegaComputeKernel::PredictiveAnalysis(a.view<double>(), o.view<double>(), spec);
+    else ZegaComputeKernel::PredictiveAnalysis(a.view<float>(), o.view<float>(), spec);
+    Py_END_ALLOW_THREADS
     return result;
 }
 
-static PyObject* funct_predictive_analysis(PyObject*, PyObject* args) {
-    PyArrayObject* arr = nullptr;
-    if (!PyArg_ParseTuple(args, "O!", &PyArray_Type, &arr)) return nullptr;
+static PyObject* funct_integrity_check(PyObject*, PyObject* args) {
+    PyObject* obj = nullptr;
+    if (!PyArg_ParseTuple(args, "O", &obj)) return nullptr;
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
+
+    uint64_t checksum = 0;
+    Py_BEGIN_ALLOW_THREADS
+    checksum = a.kind == 'd' ? ZegaComputeKernel::IntegrityCheck(a.view<double>())
+                             : ZegaComputeKernel::IntegrityCheck(a.view<float>());
+    Py_END_ALLOW_THREADS
+    return PyLong_FromUnsignedLongLong(checksum);
+}
 
-    if (PyArray_NDIM(arr) != 2 || PyArray_TYPE(arr) != NPY_DOUBLE || !PyArray_IS_C_CONTIGUOUS(arr)) {
-        PyErr_SetString(PyExc_ValueError, "Expected contiguous 2D float64 NumPy array");
+static PyObject* funct_block_hashes(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"a", "block_rows", "block_cols", nullptr};
+    PyObject* obj = nullptr;
+    Py_ssize_t block_rows = 256, block_cols = 64;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|nn", const_cast<char**>(kwlist), &obj, &block_rows, &block_cols))
+        return nullptr;
+    if (block_rows < 1 || block_cols < 1) {
+        PyErr_SetString(PyExc_ValueError, "block_rows and block_cols must be at least 1");
         return nullptr;
     }
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
 
-    npy_intp* dims = PyArray_DIMS(arr);
-    npy_intp out_dims[2] = {1, dims[1]};
-    PyObject* result = PyArray_SimpleNew(2, out_dims, NPY_DOUBLE);
+    const size_t br = static_cast<size_t>(block_rows), bc = static_cast<size_t>(block_cols);
+    npy_intp dims[2] = {static_cast<npy_intp>((a.rows + br - 1) / br), static_cast<npy_intp>((a.cols + bc - 1) / bc)};
+    PyObject* result = PyArray_SimpleNew(2, dims, NPY_UINT64);
     if (!result) return nullptr;
+    uint64_t* out = static_cast<uint64_t*>(PyArray_DATA(reinterpret_cast<PyArrayObject*>(result)));
+    const size_t blocks = static_cast<size_t>(dims[0] * dims[1]);
 
-    double* in_data = static_cast<double*>(PyArray_DATA(arr));
-    double* pred = static_cast<double*>(PyArray_DATA((PyArrayObject*)result));
+    Py_BEGIN_ALLOW_THREADS
+    if (a.kind == 'd') ZegaComputeKernel::BlockHashes(a.view<double>(), br, bc, static_cast<size_t>(dims[1]), blocks, out);
+    else ZegaComputeKernel::BlockHashes(a.view<float>(), br, bc, static_cast<size_t>(dims[1]), blocks, out);
+    Py_END_ALLOW_THREADS
+    return result;
+}
 
-    zega::v1::ZegaComputeKernel::PredictiveAnalysis(in_data, pred, dims[0], dims[1]);
+// Column argument: int (negative counts from the end) -> index, with bounds check
+static bool zega_column(PyObject* obj, size_t cols, size_t& out, const char* arg) {
+    long long c = PyLong_AsLongLong(obj);
+    if (c == -1 && PyErr_Occurred()) return false;
+    if (c < 0) c += static_cast<long long>(cols);
+    if (c < 0 || c >= static_cast<long long>(cols)) {
+        PyErr_Format(PyExc_IndexError, "%s: column %lld out of range for %zu columns", arg, c, cols);
+        return false;
+    }
+    out = static_cast<size_t>(c);
+    return true;
+}
 
+static bool zega_columns(PyObject* seq, size_t cols, std::vector<size_t>& out, const char* arg) {
+    PyObject* fast = PySequence_Fast(seq, "expected a sequence of column indices");
+    if (!fast) return false;
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(fast);
+    out.resize(n);
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        if (!zega_column(PySequence_Fast_GET_ITEM(fast, i), cols, out[i], arg)) {
+            Py_DECREF(fast);
+            return false;
+        }
+    }
+    Py_DECREF(fast);
+    return true;
+}
+
+static PyObject* zega_index_array(const std::vector<int64_t>& rows) {
+    npy_intp dims[1] = {static_cast<npy_intp>(rows.size())};
+    PyObject* result = PyArray_SimpleNew(1, dims, NPY_INT64);
+    if (result && !rows.empty()) {
+        std::memcpy(PyArray_DATA(reinterpret_cast<PyArrayObject*>(result)), rows.data(), rows.size() * sizeof(int64_t));
+    }
     return result;
 }
 
-static PyObject* funct_integrity_check(PyObject*, PyObject* args) {
-    PyArrayObject* arr = nullptr;
-    if (!PyArg_ParseTuple(args, "O!", &PyArray_Type, &arr)) return nullptr;
+static PyObject* funct_stats(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"a", "axis", nullptr};
+    PyObject* obj = nullptr;
+    int axis = 0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|i", const_cast<char**>(kwlist), &obj, &axis))
+        return nullptr;
+    if (axis != 0 && axis != 1) {
+        PyErr_SetString(PyExc_ValueError, "axis must be 0 (per column) or 1 (per row)");
+        return nullptr;
+    }
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
+    npy_intp dims[2] = {5, static_cast<npy_intp>(axis == 0 ? a.cols : a.rows)};
+    PyObject* result = PyArray_SimpleNew(2, dims, NPY_DOUBLE);
+    if (!result) return nullptr;
+    double* out = static_cast<double*>(PyArray_DATA(reinterpret_cast<PyArrayObject*>(result)));
 
-    if (PyArray_NDIM(arr) != 2 || PyArray_TYPE(arr) != NPY_DOUBLE || !PyArray_IS_C_CONTIGUOUS(arr)) {
-        PyErr_SetString(PyExc_ValueError, "Expected contiguous 2D float64 NumPy array");
+    Py_BEGIN_ALLOW_THREADS
+    if (a.kind == 'd') ZegaComputeKernel::Stats(a.view<double>(), axis, out);
+    else ZegaComputeKernel::Stats(a.view<float>(), axis, out);
+    Py_END_ALLOW_THREADS
+    return result;
+}
+
+static PyObject* funct_sort_rows(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"a", "keys", "descending", nullptr};
+    PyObject* obj = nullptr;
+    PyObject* key_seq = nullptr;
+    PyObject* desc_obj = Py_False;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O", const_cast<char**>(kwlist), &obj, &key_seq, &desc_obj))
         return nullptr;
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
+    std::vector<size_t> keys;
+    if (!zega_columns(key_seq, a.cols, keys, "keys")) return nullptr;
+
+    std::vector<bool> descending(keys.size(), false);
+    if (PySequence_Check(desc_obj)) {
+        if (PySequence_Size(desc_obj) != static_cast<Py_ssize_t>(keys.size())) {
+            PyErr_SetString(PyExc_ValueError, "descending: need one flag per key");
+            return nullptr;
+        }
+        for (size_t k = 0; k < keys.size(); ++k) {
+            PyObject* flag = PySequence_GetItem(desc_obj, k);
+            if (!flag) return nullptr;
+            int truth = PyObject_IsTrue(flag);
+            Py_DECREF(flag);
+            if (truth < 0) return nullptr;
+            descending[k] = truth;
+        }
+    } else {
+        int truth = PyObject_IsTrue(desc_obj);
+        if (truth < 0) return nullptr;
+        descending.assign(keys.size(), truth != 0);
     }
 
-    npy_intp* dims = PyArray_DIMS(arr);
-    double* data = static_cast<double*>(PyArray_DATA(arr));
-    uint64_t checksum = zega::v1::ZegaComputeKernel::IntegrityCheck(data, dims[0], dims[1]);
+    std::vector<int64_t> perm;
+    Py_BEGIN_ALLOW_THREADS
+    perm = a.kind == 'd' ? ZegaComputeKernel::SortRows(a.view<double>(), keys, descending)
+                         : ZegaComputeKernel::SortRows(a.view<float>(), keys, descending);
+    Py_END_ALLOW_THREADS
+    return zega_index_array(perm);
+}
+
+static PyObject* funct_filter_rows(PyObject*, PyObject* args) {
+    PyObject* obj = nullptr;
+    PyObject* pred_seq = nullptr;
+    if (!PyArg_ParseTuple(args, "OO", &obj, &pred_seq)) return nullptr;
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
 
-    return PyLong_FromUnsignedLongLong(checksum);
+    static const std::pair<const char*, ZegaComputeKernel::Op> ops[] = {
+        {"<", ZegaComputeKernel::Op::LT}, {"<=", ZegaComputeKernel::Op::LE},
+        {">", ZegaComputeKernel::Op::GT}, {">=", ZegaComputeKernel::Op::GE},
+        {"==", ZegaComputeKernel::Op::EQ}, {"=", ZegaComputeKernel::Op::EQ},
+        {"!=", ZegaComputeKernel::Op::NE}, {"<>", ZegaComputeKernel::Op::NE},
+    };
+    PyObject* fast = PySequence_Fast(pred_seq, "predicates: expected a sequence of (column, op, value)");
+    if (!fast) return nullptr;
+    std::vector<ZegaComputeKernel::Predicate> preds;
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(fast); ++i) {
+        PyObject* col_obj = nullptr;
+        const char* op = nullptr;
+        double value = 0.0;
+        ZegaComputeKernel::Predicate p{};
+        if (!PyArg_ParseTuple(PySequence_Fast_GET_ITEM(fast, i), "Osd", &col_obj, &op, &value)
+                || !zega_column(col_obj, a.cols, p.col, "predicates")) {
+            Py_DECREF(fast);
+            return nullptr;
+        }
+        bool known = false;
+        for (const auto& entry : ops) {
+            if (std::strcmp(entry.first, op) == 0) { p.op = entry.second; known = true; break; }
+        }
+        if (!known) {
+            PyErr_Format(PyExc_ValueError, "predicates: unknown operator '%s'", op);
+            Py_DECREF(fast);
+            return nullptr;
+        }
+        p.value = value;
+        preds.push_back(p);
+    }
+    Py_DECREF(fast);
+
+    std::vector<int64_t> rows;
+    Py_BEGIN_ALLOW_THREADS
+    rows = a.kind == 'd' ? ZegaComputeKernel::FilterRows(a.view<double>(), preds)
+                         : ZegaComputeKernel::FilterRows(a.view<float>(), preds);
+    Py_END_ALLOW_THREADS
+    return zega_index_array(rows);
+}
+
+static PyObject* funct_group_by(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"a", "key", "values", nullptr};
+    PyObject* obj = nullptr;
+    PyObject* key_obj = nullptr;
+    PyObject* value_seq = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O", const_cast<char**>(kwlist), &obj, &key_obj, &value_seq))
+        return nullptr;
+    ZegaBuffer a;
+    if (!zega_get_buffer(obj, a, false, "a")) return nullptr;
+    size_t key = 0;
+    if (!zega_column(key_obj, a.cols, key, "key")) return nullptr;
+    std::vector<size_t> value_cols;
+    if (value_seq == Py_None) {
+        for (size_t c = 0; c < a.cols; ++c) if (c != key) value_cols.push_back(c);
+    } else if (!zega_columns(value_seq, a.cols, value_cols, "values")) {
+        return nullptr;
+    }
+
+    ZegaComputeKernel::GroupTable g;
+    Py_BEGIN_ALLOW_THREADS
+    g = a.kind == 'd' ? ZegaComputeKernel::GroupBy(a.view<double>(), key, value_cols)
+                      : ZegaComputeKernel::GroupBy(a.view<float>(), key, value_cols);
+    Py_END_ALLOW_THREADS
+
+    // Unpack [g][col][sum, min, max] into separate (groups × values) arrays
+    const size_t groups = g.keys.size(), width = value_cols.size();
+    npy_intp gdims[1] = {static_cast<npy_intp>(groups)};
+    npy_intp adims[2] = {static_cast<npy_intp>(groups), static_cast<npy_intp>(width)};
+    PyObject* keys = PyArray_SimpleNew(1, gdims, NPY_DOUBLE);
+    PyObject* counts = PyArray_SimpleNew(1, gdims, NPY_INT64);
+    PyObject* arrays[4] = {PyArray_SimpleNew(2, adims, NPY_DOUBLE), PyArray_SimpleNew(2, adims, NPY_DOUBLE),
+                           PyArray_SimpleNew(2, adims, NPY_DOUBLE), PyArray_SimpleNew(2, adims, NPY_DOUBLE)};
+    PyObject* result = nullptr;
+    if (keys && counts && arrays[0] && arrays[1] && arrays[2] && arrays[3]) {
+        auto data = [](PyObject* arr) { return PyArray_DATA(reinterpret_cast<PyArrayObject*>(arr)); };
+        if (groups) {
+            std::memcpy(data(keys), g.keys.data(), groups * sizeof(double));
+            std::memcpy(data(counts), g.counts.data(), groups * sizeof(int64_t));
+        }
+        double* sums = static_cast<double*>(data(arrays[0]));
+        double* means = static_cast<double*>(data(arrays[1]));
+        double* mins = static_cast<double*>(data(arrays[2]));
+        double* maxs = static_cast<double*>(data(arrays[3]));
+        for (size_t s = 0; s < groups; ++s) {
+            for (size_t i = 0; i < width; ++i) {
+                const double* agg = &g.aggs[(s * width + i) * 3];
+                sums[s * width + i] = agg[0];
+                means[s * width + i] = agg[0] / static_cast<double>(g.counts[s]);
+                mins[s * width + i] = agg[1];
+                maxs[s * width + i] = agg[2];
+            }
+        }
+        result = Py_BuildValue("{s:O,s:O,s:O,s:O,s:O,s:O}", "keys", keys, "count", counts,
+                               "sum", arrays[0], "mean", arrays[1], "min", arrays[2], "max", arrays[3]);
+    }
+    Py_XDECREF(keys);
+    Py_XDECREF(counts);
+    for (PyObject* arr : arrays) Py_XDECREF(arr);
+    return result;
+}
+
+static PyObject* funct_configure(PyObject*, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"threads", "parallel_threshold", "isa", nullptr};
+    PyObject* threads_obj = Py_None;
+    PyObject* threshold_obj = Py_None;
+    const char* isa = nullptr;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOz", const_cast<char**>(kwlist),
+                                     &threads_obj, &threshold_obj, &isa))
+        return nullptr;
+    if (isa && !zega::SelectKernels(isa)) {
+        PyErr_Format(PyExc_ValueError, "isa '%s' is unknown or not supported by this CPU", isa);
+        return nullptr;
+    }
+    if (threads_obj != Py_None) {
+        long threads = PyLong_AsLong(threads_obj);
+        if (threads == -1 && PyErr_Occurred()) return nullptr;
+        if (threads < 0) {
+            PyErr_SetString(PyExc_ValueError, "threads must be >= 0 (0 = OpenMP default)");
+            return nullptr;
+        }
+        zega::g_config.threads = static_cast<int>(threads);
+    }
+    if (threshold_obj != Py_None) {
+        size_t threshold = PyLong_AsSize_t(threshold_obj);
+        if (threshold == static_cast<size_t>(-1) && PyErr_Occurred()) return nullptr;
+        zega::g_config.parallel_threshold = threshold;
+    }
+    return Py_BuildValue("{s:i,s:n,s:i,s:s}", "threads", zega::g_config.threads,
+                         "parallel_threshold", static_cast<Py_ssize_t>(zega::g_config.parallel_threshold),
+                         "max_threads", zega::ZegaThreads(), "isa", zega::g_kernels->isa);
+}
+
+static PyObject* funct_build_info(PyObject*, PyObject*) {
+    PyObject* compiled = PyList_New(0);
+    PyObject* supported = PyList_New(0);
+    if (!compiled || !supported) {
+        Py_XDECREF(compiled);
+        Py_XDECREF(supported);
+        return nullptr;
+    }
+    for (size_t i = 0; i < zega::kVariantCount; ++i) {
+        PyObject* name = PyUnicode_FromString(zega::kVariants[i].isa);
+        if (!name) return nullptr;
+        PyList_Append(compiled, name);
+        if (zega::IsaSupported(zega::kVariants[i])) PyList_Append(supported, name);
+        Py_DECREF(name);
+    }
+#ifdef _OPENMP
+    int openmp = _OPENMP;
+#else
+    int openmp = 0;
+#endif
+#ifdef __VERSION__
+    const char* compiler = __VERSION__;
+#else
+    const char* compiler = "unknown";
+#endif
+    return Py_BuildValue("{s:s,s:N,s:N,s:i,s:i,s:s,s:O}",
+                         "isa", zega::g_kernels->isa,
+                         "compiled", compiled,
+                         "supported", supported,
+                         "openmp", openmp,
+                         "max_threads", zega::ZegaThreads(),
+                         "compiler", compiler,
+                         "deterministic_sum", Py_True);
 }
 
 static PyMethodDef FunctMethods[] = {
-    {"sum_all",             funct_sum_all,             METH_VARARGS, "High-precision parallel Kahan summation of 2D float64 array"},
-    {"scale",               funct_scale,               METH_VARARGS, "AVX-256 + OpenMP vectorized scaling of 2D float64 array"},
-    {"predictive_analysis", funct_predictive_analysis, METH_VARARGS, "Rolling linear regression trend prediction (returns 1×cols next row)"},
-    {"integrity_check",     funct_integrity_check,     METH_VARARGS, "Custom 64-bit FNV-1a checksum for data integrity"},
+    {"sum_all",             funct_sum_all,                                        METH_VARARGS,
+     "sum_all(a) -> float. Blocked compensated sum, bitwise reproducible for any thread count"},
+    {"scale",               reinterpret_cast<PyCFunction>(funct_scale),             METH_VARARGS | METH_KEYWORDS,
+     "scale(a, factor, out=None) -> array. AVX-256 + OpenMP scaling; out may be a itself"},
+    {"scale_inplace",       funct_scale_inplace,                                  METH_VARARGS,
+     "scale_inplace(a, factor). Scales a writable array or view in place"},
+    {"predictive_analysis", reinterpret_cast<PyCFunction>(funct_predictive_analysis), METH_VARARGS | METH_KEYWORDS,
+     "predictive_analysis(a, out=None, window=30, horizon=1, method='ols', alpha=0.5, beta=0.1, rolling=False) "
+     "-> horizon×cols forecasts past the last row, or rows×cols forecasts made at every row if rolling. "
+     "method: 'ols' (linear fit over the last window rows) or 'holt' (linear exponential smoothing)"},
+    {"integrity_check",     funct_integrity_check,                                METH_VARARGS,
+     "integrity_check(a) -> int. 64-bit FNV-1a checksum of the elements in row-major order"},
+    {"block_hashes",        reinterpret_cast<PyCFunction>(funct_block_hashes),      METH_VARARGS | METH_KEYWORDS,
+     "block_hashes(a, block_rows=256, block_cols=64) -> uint64 array, one integrity_check per block "
+     "(edge blocks zero-padded to full size)"},
+    {"stats",               reinterpret_cast<PyCFunction>(funct_stats),             METH_VARARGS | METH_KEYWORDS,
+     "stats(a, axis=0) -> 5×k float64 array of sum, mean, min, max, sample stdev per column (axis=0) or row (axis=1)"},
+    {"sort_rows",           reinterpret_cast<PyCFunction>(funct_sort_rows),         METH_VARARGS | METH_KEYWORDS,
+     "sort_rows(a, keys, descending=False) -> int64 permutation. Stable multi-key row sort, NaN last"},
+    {"filter_rows",         funct_filter_rows,                                    METH_VARARGS,
+     "filter_rows(a, predicates) -> int64 row indices where every (column, op, value) holds; op in < <= > >= == !="},
+    {"group_by",            reinterpret_cast<PyCFunction>(funct_group_by),          METH_VARARGS | METH_KEYWORDS,
+     "group_by(a, key, values=None) -> dict of keys, count, sum, mean, min, max per group (first-appearance order)"},
+    {"configure",           reinterpret_cast<PyCFunction>(funct_configure),         METH_VARARGS | METH_KEYWORDS,
+     "configure(threads=None, parallel_threshold=None, isa=None) -> dict. Sets/reads kernel threading and "
+     "SIMD variant; None keeps a setting"},
+    {"build_info",          funct_build_info,                                     METH_NOARGS,
+     "build_info() -> dict. Active SIMD variant, compiled/supported variants, OpenMP version and compiler"},
     {nullptr, nullptr, 0, nullptr}
 };
 
@@ -317,6 +1260,9 @@ PyMODINIT_FUNC PyInit_funct(void) {
     if (m == NULL)
         return NULL;
 
+    // Best SIMD variant for this CPU; ZEGA_FUNCT_ISA=scalar|sse2|avx2|avx512 pins one
+    zega::SelectKernels(std::getenv("ZEGA_FUNCT_ISA"));
+
     /* * CRITICAL FIX: import_array() is a macro that returns NULL on 
      * failure in some configurations. We call it standalone to avoid 
      * the "expected primary-expression" error.
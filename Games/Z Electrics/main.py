@@ -10,9 +10,10 @@ SYSTEM CAPABILITIES:
 2.  Real-Time Formula Parsing Engine (RTFPE)
 3.  SHA-256 Data Integrity Verification
 4.  Background Telemetry & Efficiency Scoring
-5.  60FPS High-Fidelity Video Synchronization
-6.  Dynamic C++ Extension Linking (funct.so)
+5.  Background-Decoded Intro Playback (Native FPS, Skippable)
+6.  Dynamic C++ Extension Linking (funct.so, NumPy engine fallback)
 7.  Proprietary ZSFF Binary Serialization
+8.  Instant Splash & Lazy Subsystem Loading (`python main.py --profile-startup`)
 
 WARNING: UNAUTHORIZED MODIFICATION OF THIS KERNEL WILL VOID WARRANTY.
 """
@@ -20,42 +21,55 @@ WARNING: UNAUTHORIZED MODIFICATION OF THIS KERNEL WILL VOID WARRANTY.
 import os
 import sys
 import time
+import queue
 import warnings
 import threading
-import hashlib
-import numpy as np
-import cv2
+
+# Started before anything heavy is imported so --profile-startup sees every import
+from startup import StartupProfile
+PROFILE = StartupProfile(enabled="--profile-startup" in sys.argv)
+
 import customtkinter as cctk
-from PIL import Image, ImageTk
 from tkinter import messagebox
 
 # --- ZEGA MODULE IMPORTS ---
+# Only what the splash needs. NumPy, the engine and the grid load in
+# _load_core() once the splash is on screen; everything used by a single
+# action (import/export, file dialogs, the intro's OpenCV) loads on first use.
 from logs import telemetry  # Using the specialized 16-char ID logging module
-from ui import ZegaInterface
-
-# Attempt to load the File System module if present
-try:
-    from file import ZegaExplorer
-except ImportError:
-    ZegaExplorer = None
-
-# --- HIGH-PERFORMANCE C++ LINKAGE ---
-try:
-    import funct
-    ENGINE_STATUS = "C++ ACCELERATED (funct.so LINKED)"
-    ENGINE_COLOR = "#58f01b"
-except ImportError:
-    funct = None
-    ENGINE_STATUS = "PYTHON FALLBACK (NON-OPTIMIZED)"
-    ENGINE_COLOR = "#FFFF00"
+
+
+def _load_core():
+    """Imports the subsystems every session needs and links the C++ engine."""
+    global np, funct, ENGINE_STATUS, ENGINE_COLOR, ZegaInterface, SheetModel, RecoveryJournal
+    global JobScheduler, JobCancelled, sum_all_job, scale_job, forecast_job, parse_range, cell_name
+    import numpy as np
+    from ui import ZegaInterface
+    from model import SheetModel
+    from recovery import RecoveryJournal
+    from jobs import JobScheduler, JobCancelled, sum_all_job, scale_job, forecast_job
+    from funct_py import engine, is_native
+    from calc import parse_range, cell_name
+
+    # --- HIGH-PERFORMANCE C++ LINKAGE ---
+    funct = engine()
+    if is_native(funct):
+        ENGINE_STATUS = f"C++ ACCELERATED (funct.so LINKED, {funct.build_info()['isa'].upper()})"
+        ENGINE_COLOR = "#58f01b"
+    else:
+        ENGINE_STATUS = "NUMPY ENGINE (funct.so NOT LINKED)"
+        ENGINE_COLOR = "#FFFF00"
 
 # --- GLOBAL CONSTANTS ---
 ZEGA_GREEN = "#58f01b"
 ZEGA_DARK = "#050505"
 ZEGA_ACCENT = "#1a1a1a"
-TARGET_FPS = 60
-FRAME_MS = 1000 / TARGET_FPS
-AUTO_SAVE_INTERVAL = 30  # Seconds
+AUTO_SAVE_INTERVAL = 30  # Seconds between checkpoints (only when dirty)
+JOURNAL_FLUSH_INTERVAL = 2  # Seconds between edit-journal appends
+UI_PUMP_MS = 50  # How often worker-thread results are applied on the Tk thread
+UI_PUMP_BUDGET_MS = 30  # Callback time per pump; the rest waits for the next one, so Tk stays responsive
+FORECAST_HORIZON = 12  # Rows forecast beneath the source range by default
+FORECAST_WINDOW = 30  # Trailing rows each column's trend is fitted to
 
 # --- SUPPRESSION ---
 warnings.filterwarnings("ignore")
@@ -65,52 +79,35 @@ warnings.filterwarnings("ignore")
 # -----------------------------------------------------------------------------
 class AutoRecoveryDaemon(threading.Thread):
     """
-    Background service that silently snapshots the data matrix 
-    to a temporary binary buffer every 30 seconds.
+    Background service that drains the recovery journal to disk: pending
+    edits every few seconds, checkpoints as soon as the UI requests one.
+    It never touches Tk or the sheet model.
     """
-    def __init__(self, app_ref):
+    def __init__(self, journal):
         super().__init__()
-        self.app = app_ref
+        self.journal = journal
         self.running = True
         self.daemon = True 
+        self._wake = threading.Event()
 
     def run(self):
         telemetry.log("info", "Auto-Recovery Daemon started successfully.")
         while self.running:
-            time.sleep(AUTO_SAVE_INTERVAL)
+            self._wake.wait(JOURNAL_FLUSH_INTERVAL)
+            self._wake.clear()
             try:
-                snapshot = self.app.get_data_snapshot()
-                temp_path = os.path.join("logs", "recovery.tmp")
-                np.save(temp_path, snapshot)
-                telemetry.log("info", f"Snapshot verified. Size: {snapshot.nbytes} bytes.")
+                with telemetry.timed("recovery.flush"):
+                    self.journal.flush()
             except Exception as e:
                 telemetry.log("error", f"Auto-recovery critical failure: {e}")
 
-# -----------------------------------------------------------------------------
-# SUBSYSTEM: FORMULA PARSING ENGINE
-# -----------------------------------------------------------------------------
-class FormulaEngine:
-    """
-    Parses spreadsheet formulas using vectorized NumPy execution.
-    """
-    @staticmethod
-    def parse_and_execute(formula_str, data_matrix):
-        try:
-            clean = formula_str.upper().replace("=", "").strip()
-            if clean.startswith("SUM"):
-                return np.sum(data_matrix)
-            elif clean.startswith("AVG"):
-                return np.mean(data_matrix)
-            elif clean.startswith("MAX"):
-                return np.max(data_matrix)
-            elif clean.startswith("MIN"):
-                return np.min(data_matrix)
-            else:
-                # Local evaluation for arithmetic
-                return eval(clean) 
-        except Exception as e:
-            telemetry.log("warning", f"Formula Syntax Error: {e}")
-            return "#ERROR"
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        self.join(5.0)
 
 # -----------------------------------------------------------------------------
 # MAIN APPLICATION CONTROLLER
@@ -122,84 +119,163 @@ class ZegaApp(cctk.CTk):
     def __init__(self):
         super().__init__()
         
-        telemetry.log("info", f"Booting ZEGA Kernel. Engine: {ENGINE_STATUS}")
-        
         self.title("ZEGA ULTIMATE | ENTERPRISE EDITION")
         self.geometry("1400x900")
         self.configure(fg_color=ZEGA_DARK)
         
+        # --- SPLASH ---
+        # Painted before the heavy subsystems load; _boot replaces it with the interface
+        self._splash = cctk.CTkLabel(self, text="ZEGA ULTIMATE\nINITIALIZING KERNEL...",
+                                     font=("Impact", 48), text_color=ZEGA_GREEN)
+        self._splash.pack(expand=True, fill="both")
+        self.update()
+        PROFILE.mark("first paint (splash)")
+        
+        # --- WORKER -> TK HANDOFF ---
+        self._ui_queue = queue.SimpleQueue()
+        self._pump_ui_queue()
+        self.after(1, self._boot)
+
+    def _boot(self):
+        _load_core()
+        PROFILE.mark("core subsystems loaded")
+        telemetry.log("info", f"Booting ZEGA Kernel. Engine: {ENGINE_STATUS}")
+        
         # --- DATA ARCHITECTURE ---
-        self.rows = 50
-        self.cols = 26 
-        self.data_matrix = np.zeros((self.rows, self.cols))
-        self.cell_formulas = {} 
+        self.rows = 1_048_576    # Sparse CellStore: memory follows the populated cells
+        self.cols = 1024
+        self.model = SheetModel(self.rows, self.cols)
+        self.sheet_path = None  # ZSFF file the model was last loaded from / saved to
+        self.importer = None
+        self.exporter = None
+        self.jobs = JobScheduler(self.post)
         
         # --- VIDEO INTRO ---
+        # Decoding starts first so frames queue up while the interface is built behind it
         self.video_path = "intro.mp4"
+        self.intro = None
         if os.path.exists(self.video_path):
+            from intro import IntroPlayer  # Pulls in OpenCV and PIL; only needed when there is an intro
             telemetry.log("info", "Executing high-fidelity intro sequence.")
-            self.cap = cv2.VideoCapture(self.video_path)
-            self.intro_label = cctk.CTkLabel(self, text="")
-            self.intro_label.pack(expand=True, fill="both")
-            self._play_intro_frame()
+            self.intro = IntroPlayer(self, self.video_path, on_finish=self._end_intro)
+            self.intro.start()
+            PROFILE.mark("intro decoder started")
         else:
             telemetry.log("warning", "Intro video missing from Z-MegaHQ directory. Skipping.")
-            self._init_main_interface()
-
-    def _play_intro_frame(self):
-        """60FPS Intro Render Loop"""
-        s = time.perf_counter()
-        ret, frame = self.cap.read()
-        if ret:
-            frame = cv2.resize(frame, (1400, 900))
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = ImageTk.PhotoImage(Image.fromarray(frame))
-            self.intro_label.configure(image=img)
-            self.intro_label.image = img 
-            
-            elapsed = (time.perf_counter() - s) * 1000
-            wait = max(1, int(FRAME_MS - elapsed))
-            self.after(wait, self._play_intro_frame)
+        self._init_main_interface()
+        self._splash.destroy()
+        PROFILE.mark("interface built")
+        if PROFILE.enabled:
+            self.after_idle(self._finish_profile)
+        elif self.intro:
+            self.intro.show()
         else:
-            self.cap.release()
-            self.intro_label.destroy()
-            self._init_main_interface()
+            self._start_session()
+
+    def _finish_profile(self):
+        """--profile-startup: report once the interface has painted, then exit without starting a session."""
+        self.update_idletasks()
+        PROFILE.mark("interface painted")
+        PROFILE.stop()
+        report = PROFILE.report()
+        print(report)
+        telemetry.log("info", report)
+        if self.intro:
+            self.intro.decoder.stop()
+        self.jobs.shutdown()
+        self.destroy()
+
+    def _end_intro(self):
+        self.intro = None
+        self._start_session()
+
+    def post(self, fn, *args):
+        """Thread-safe: schedules fn(*args) on the Tk thread."""
+        self._ui_queue.put((fn, args))
+
+    def _pump_ui_queue(self):
+        deadline = time.perf_counter() + UI_PUMP_BUDGET_MS / 1000
+        while time.perf_counter() < deadline:
+            try:
+                fn, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                telemetry.log("error", f"UI callback {getattr(fn, '__name__', fn)} failed: {e}")
+        # Over budget with work left: come back as soon as Tk has handled its pending events
+        self.after(UI_PUMP_MS if self._ui_queue.empty() else 1, self._pump_ui_queue)
 
     def _init_main_interface(self):
-        """Builds the UI and starts background threads."""
+        """Builds the UI; it stays hidden behind the intro until that ends."""
         telemetry.log("info", "UI Subsystem online.")
-        self.interface = ZegaInterface(self, self.rows, self.cols, ZEGA_GREEN)
+        self.interface = ZegaInterface(self, self.model, ZEGA_GREEN)
         self.interface.pack(expand=True, fill="both")
-        
-        self.recovery_daemon = AutoRecoveryDaemon(self)
+
+    def _start_session(self):
+        """Recovery prompt and background threads, once the interface is visible."""
+        self.journal = RecoveryJournal()
+        self._offer_recovery()
+        self.recovery_daemon = AutoRecoveryDaemon(self.journal)
         self.recovery_daemon.start()
+        self.after(AUTO_SAVE_INTERVAL * 1000, self._checkpoint_tick)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
         self.sync_logic_to_ui()
 
+    def _offer_recovery(self):
+        """Replays the previous session's journal if it ended without a clean exit."""
+        if not self.journal.has_session():
+            return
+        if messagebox.askyesno("ZEGA AUTO-RECOVERY", "The previous session ended unexpectedly.\nRestore unsaved work?"):
+            try:
+                replayed = self.journal.restore(self.model)
+                self.interface.update_status(f"RECOVERED SESSION ({replayed} EDITS REPLAYED)")
+            except Exception as e:
+                telemetry.log("error", f"Recovery replay failed: {e}")
+        self.journal.discard()
+        self.journal.request_checkpoint(self.model.recovery_state())
+
+    def _checkpoint_tick(self):
+        """Copy-on-request: the state copy is taken here, on the Tk thread, only if dirty."""
+        if self.journal.dirty:
+            self.journal.request_checkpoint(self.model.recovery_state())
+            self.recovery_daemon.wake()
+        self.after(AUTO_SAVE_INTERVAL * 1000, self._checkpoint_tick)
+
+    def _record_bulk_change(self):
+        self.journal.record_bulk()
+        self.journal.request_checkpoint(self.model.recovery_state())
+        self.recovery_daemon.wake()
+
+    def _on_close(self):
+        """Clean exit: nothing to recover next time."""
+        self.jobs.shutdown()
+        self.recovery_daemon.stop()
+        self.journal.discard()
+        self.destroy()
+
     def get_data_snapshot(self):
-        return self.interface.get_all_cell_data().copy()
+        return self.model.snapshot()
 
     def sync_logic_to_ui(self):
-        self.interface.populate_grid(self.data_matrix)
+        self.interface.populate_grid()
 
     def process_cell_update(self, row, col, value):
         """Handles cell logic and logging for every edit."""
-        try:
-            if value.startswith("="):
-                self.cell_formulas[(row, col)] = value
-                result = FormulaEngine.parse_and_execute(value, self.data_matrix)
-                self.data_matrix[row, col] = result if isinstance(result, (int, float)) else 0.0
-                telemetry.log("info", f"Cell [{row},{col}] formula calculated: {result}")
-            else:
-                if (row, col) in self.cell_formulas:
-                    del self.cell_formulas[(row, col)]
-                self.data_matrix[row, col] = float(value)
-        except ValueError:
-            self.data_matrix[row, col] = 0.0
-            telemetry.log("warning", f"Invalid data input at row {row} col {col}")
+        with telemetry.timed("cell.update"):
+            self.model.set_input(row, col, value)
+            self.journal.record_edit(row, col, value)
+            self.interface.populate_grid()
+        telemetry.incr("cells.edited")
+        telemetry.gauge("sheet.formulas", len(self.model.formulas))
 
     def trigger_file_io(self, mode):
-        if not ZegaExplorer:
+        # Attempt to load the File System module if present (first save/load only)
+        try:
+            from file import ZegaExplorer
+        except ImportError:
             telemetry.log("error", "ZegaExplorer module is missing.")
             return
         telemetry.log("info", f"Opening File Explorer: {mode}")
@@ -212,46 +288,231 @@ class ZegaApp(cctk.CTk):
             self._load_file(path)
 
     def _save_file(self, path):
-        try:
-            data = self.interface.get_all_cell_data()
-            np.save(path, data)
-            with open(path, "rb") as f:
-                chk = hashlib.sha256(f.read()).hexdigest()
-            telemetry.log("info", f"File saved: {path}. Hash: {chk[:16]}")
-            self.interface.update_status(f"SAVED: {os.path.basename(path)}")
-        except Exception as e:
-            telemetry.log("error", f"Save protocol failed: {e}")
+        """Starts a background save; edits stay possible, bulk operations wait for it."""
+        from exporter import SheetExporter
+        if self.exporter and self.exporter.is_alive():
+            self.interface.update_status("SAVE ALREADY IN PROGRESS")
+            return
+        if self.importer and self.importer.is_alive():
+            self.interface.update_status("WAIT FOR THE IMPORT TO FINISH")
+            return
+        m = self.model
+        taken = m.take_unsaved()
+        tiles, everything = taken
+        incremental = path == self.sheet_path and not everything and os.path.exists(path)
+        exporter = self.exporter = SheetExporter(
+            path, m,
+            on_progress=lambda p: self.post(self.interface.update_task, p, exporter),
+            on_done=lambda *res: self.post(self._finish_save, exporter, path, taken, *res),
+            dirty_tiles=tiles if incremental else None)
+        self.interface.show_task(f"SAVING {os.path.basename(path)}", exporter.cancel, exporter)
+        exporter.start()
 
+    def _finish_save(self, exporter, path, taken, result, error):
+        self.exporter = None
+        self.interface.end_task(exporter)
+        if result is None:
+            self.model.restore_unsaved(taken)
+            self.interface.update_status("SAVE FAILED" if error else "SAVE CANCELLED")
+            return
+        if not path.lower().endswith(".csv"):
+            self.sheet_path = path
+        else:
+            self.model.restore_unsaved(taken)  # A CSV is an export, not the sheet file
+        telemetry.observe("file.save", result.ms)
+        telemetry.log("info", f"File saved: {path} ({result.nbytes} bytes, {result.ms:.0f}ms). "
+                              f"SHA-256: {result.sha256 or '-'} Index: {result.digest or '-'} "
+                              f"Merkle: {exporter.merkle_root:016x}")
+        self.interface.update_status(f"SAVED: {os.path.basename(path)}")
+
+    def _busy_saving(self):
+        if self.exporter and self.exporter.is_alive():
+            self.interface.update_status("WAIT FOR THE SAVE TO FINISH")
+            return True
+        return False
+
+    @telemetry.timed("file.load")
     def _load_file(self, path):
+        from zsff import ZsffReader, sniff_version
+        if self._busy_saving():
+            return
         try:
             telemetry.log("info", f"Importing external dataset: {path}")
-            loaded = np.load(path) if path.endswith(".zsff") else np.genfromtxt(path, delimiter=",")
-            self.data_matrix = np.nan_to_num(loaded)
+            if path.lower().endswith(".csv"):
+                self._import_csv(path)
+                return
+            if path.endswith(".zsff") and sniff_version(path) >= 2:
+                with ZsffReader(path) as reader:
+                    self.model.load_zsff(reader)
+                self.model.mark_saved()
+                self.sheet_path = path
+            else:
+                self.model.load_matrix(np.nan_to_num(np.load(path)))
+                self.sheet_path = None
+            self._record_bulk_change()
             self.sync_logic_to_ui()
             self.interface.update_status("LOAD COMPLETE")
         except Exception as e:
             telemetry.log("error", f"Load protocol failed: {e}")
 
+    def _import_csv(self, path):
+        """Streams a CSV in on a worker thread; chunks are applied here as they arrive."""
+        from importer import CsvImporter
+        if self.importer and self.importer.is_alive():
+            self.importer.cancel()
+        self.model.begin_import()
+        self.sheet_path = None
+        started = time.perf_counter()
+        importer = self.importer = CsvImporter(
+            path,
+            on_chunk=lambda *chunk: self.post(self._apply_import_chunk, importer, *chunk),
+            on_progress=lambda p: self.post(self.interface.update_task, p, importer),
+            on_done=lambda *res: self.post(self._finish_import, importer, path, started, *res),
+            max_rows=self.rows, max_cols=self.cols)
+        self.interface.show_task(f"IMPORTING {os.path.basename(path)}", importer.cancel, importer)
+        importer.start()
+
+    def _apply_import_chunk(self, importer, r0, block, text_cells, col_types):
+        importer.chunk_done()  # Lets the importer parse the next chunk while this one is applied
+        if importer is not self.importer:
+            return  # Chunk from a superseded import
+        self.model.apply_block(r0, block, text_cells, col_types)
+        self.sync_logic_to_ui()
+
+    def _finish_import(self, importer, path, started, rows, cancelled, error):
+        if importer is not self.importer:
+            return
+        self.importer = None
+        self.interface.end_task(importer)
+        self._record_bulk_change()
+        dt = (time.perf_counter() - started) * 1000
+        telemetry.observe("file.import_csv", dt)
+        telemetry.log("info", f"CSV import of {path}: {rows} rows in {dt:.0f}ms (cancelled={cancelled}).")
+        if error:
+            self.interface.update_status(f"IMPORT FAILED AT ROW {rows}")
+        elif cancelled:
+            self.interface.update_status(f"IMPORT CANCELLED ({rows} ROWS)")
+        else:
+            self.interface.update_status("LOAD COMPLETE")
+
     def run_cpp_engine(self, op_code):
-        if not funct:
-            telemetry.log("warning", "C++ Engine not linked. Operation aborted.")
+        """Queues a C++ operation on the job pool; the result is applied here when it finishes."""
+        name = f"cpp.{op_code.lower()}"
+        if self.jobs.busy(name):
+            self.interface.update_status(f"{op_code} ALREADY RUNNING")
             return
 
-        data = self.interface.get_all_cell_data()
-        start = time.perf_counter()
-        
+        m = self.model
         if op_code == "SUM_ALL":
-            res = funct.sum_all(data)
-            telemetry.log("info", f"C++ Engine SUM Result: {res}")
-            self.interface.update_status(f"TOTAL: {res:,.2f}")
-        
+            fn, apply = sum_all_job(m.values), self._show_sum
         elif op_code == "SCALE":
-            self.data_matrix = funct.scale(data, 1.5)
-            self.sync_logic_to_ui()
-            telemetry.log("info", "C++ Engine completed 1.5x Scaling.")
+            if self._busy_saving():
+                return
+            generation, edited = m.generation, m.watch_edits()
+            fn = scale_job(m.values, 1.5)
+            apply = lambda scaled: self._apply_scale(scaled, generation, edited)
+        else:
+            telemetry.log("warning", f"Unknown C++ operation: {op_code}")
+            return
+
+        job_id = None
+
+        def done(result, error):
+            self.interface.end_task(job_id)
+            if error and op_code == "SCALE":
+                m.unwatch_edits(edited)
+            if isinstance(error, JobCancelled):
+                self.interface.update_status(f"{op_code} CANCELLED")
+            elif error:
+                self.interface.update_status(f"{op_code} FAILED")
+            else:
+                apply(result)
+            telemetry.incr("cpp.ops")
 
-        dt = (time.perf_counter() - start) * 1000
-        telemetry.log("info", f"Execution timing: {dt:.4f}ms")
+        job_id = self.jobs.submit(name, fn, on_done=done,
+                                  on_progress=lambda p: self.interface.update_task(p, job_id))
+        self.interface.show_task(f"RUNNING {op_code}", lambda: self.jobs.cancel(job_id), job_id)
+
+    def _show_sum(self, total):
+        telemetry.log("info", f"C++ Engine SUM Result: {total}")
+        self.interface.update_status(f"TOTAL: {total:,.2f}")
+
+    def _apply_scale(self, scaled, generation, edited):
+        if self.exporter and self.exporter.is_alive():
+            # The exporter reads values in place; install once it is done
+            self.after(200, self._apply_scale, scaled, generation, edited)
+            return
+        self.model.unwatch_edits(edited)
+        if generation != self.model.generation:
+            self.interface.update_status("SCALE DISCARDED (SHEET WAS REPLACED)")
+            return
+        self.model.replace_values(scaled, keep=edited)
+        self._record_bulk_change()
+        self.sync_logic_to_ui()
+        telemetry.log("info", "C++ Engine completed 1.5x Scaling.")
+        self.interface.update_status("SCALE COMPLETE")
+
+    def run_forecast(self):
+        """Asks for a source range and fills the rows beneath it with per-column trend forecasts."""
+        name = "cpp.forecast"
+        if self.jobs.busy(name):
+            self.interface.update_status("FORECAST ALREADY RUNNING")
+            return
+        answer = cctk.CTkInputDialog(
+            title="FORECAST",
+            text=f"Source range, optionally with a row count (e.g. B2:D500, {FORECAST_HORIZON}).\n"
+                 "Forecasts fill the rows beneath it.").get_input()
+        if not answer:
+            return
+        ref, _, steps = answer.partition(",")
+        try:
+            r0, c0, r1, c1 = parse_range(ref)
+            horizon = int(steps) if steps.strip() else FORECAST_HORIZON
+        except ValueError:
+            self.interface.update_status("INVALID FORECAST RANGE")
+            return
+        m = self.model
+        if r1 >= m.rows or c1 >= m.cols or horizon < 1:
+            self.interface.update_status("FORECAST RANGE OUTSIDE THE SHEET")
+            return
+        t0, t1 = r1 + 1, min(m.rows - 1, r1 + horizon)  # Target rows, inclusive
+        if t0 >= m.rows:
+            self.interface.update_status("NO ROOM BENEATH THE FORECAST RANGE")
+            return
+        if not m.is_empty(t0, c0, t1, c1):
+            self.interface.update_status(f"FORECAST TARGET {cell_name(t0, c0)}:{cell_name(t1, c1)} IS NOT EMPTY")
+            return
+
+        source = m.values[r0:r1 + 1, c0:c1 + 1].copy()
+        generation = m.generation
+        job_id = None
+
+        def done(result, error):
+            self.interface.end_task(job_id)
+            if isinstance(error, JobCancelled):
+                self.interface.update_status("FORECAST CANCELLED")
+            elif error:
+                self.interface.update_status("FORECAST FAILED")
+            else:
+                self._apply_forecast(result, t0, c0, generation)
+            telemetry.incr("cpp.ops")
+
+        job_id = self.jobs.submit(name, forecast_job(source, t1 - t0 + 1, FORECAST_WINDOW), on_done=done,
+                                  on_progress=lambda p: self.interface.update_task(p, job_id))
+        self.interface.show_task("RUNNING FORECAST", lambda: self.jobs.cancel(job_id), job_id)
+
+    def _apply_forecast(self, forecast, r0, c0, generation):
+        m = self.model
+        r1, c1 = r0 + forecast.shape[0] - 1, c0 + forecast.shape[1] - 1
+        target = f"{cell_name(r0, c0)}:{cell_name(r1, c1)}"
+        if generation != m.generation or not m.is_empty(r0, c0, r1, c1):
+            self.interface.update_status(f"FORECAST DISCARDED ({target} CHANGED MEANWHILE)")
+            return
+        m.write_block(r0, c0, forecast)
+        self._record_bulk_change()
+        self.sync_logic_to_ui()
+        telemetry.log("info", f"Forecast written to {target}.")
+        self.interface.update_status(f"FORECAST WRITTEN TO {target}")
 
 if __name__ == "__main__":
     app = ZegaApp()
@@ -0,0 +1,233 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - MERKLE INTEGRITY
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Sheet fingerprints and diffs at ZSFF tile granularity. Each tile is hashed
+with funct.block_hashes (integrity_check of the zero-padded tile, in
+parallel), and the tile hashes in row-major order are the leaves of a binary
+Merkle tree. Two trees over the same tile grid are diffed top-down, only
+descending where hashes differ, so the cost follows the changed tiles.
+
+SheetHashes keeps a live sheet's tree current: edits invalidate tiles and
+the next root()/diff() rehashes just those tiles and their paths to the root.
+A ZSFF file diffs against another from its tile index alone (zsff_tree), or
+against a sheet by hashing its stored tiles (SheetHashes.from_zsff).
+"""
+
+import numpy as np
+
+from zsff import TILE_ROWS, TILE_COLS, ZsffError, ZsffReader, tile_grid
+from store import CellStore
+
+from funct_py import engine
+
+funct = engine()
+
+HASH_BATCH_TILES = 256            # Tiles stacked per block_hashes call (32 MB at 256 x 64)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(x):
+    """splitmix64 finalizer, elementwise on uint64 arrays (wrapping)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * _MIX_1
+    x = x ^ (x >> np.uint64(27))
+    x = x * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def _combine(left, right):
+    """Parent hashes; order-sensitive, so swapping two tiles changes the root."""
+    return _mix(left ^ _mix(right + _GOLDEN))
+
+
+class MerkleTree:
+    """
+    levels[0] holds the leaves; each level above pairs up the one below, an
+    odd last node moving up unchanged. Hashes are uint64.
+    """
+    def __init__(self, leaves):
+        self.levels = [np.array(leaves, dtype=np.uint64).ravel()]
+        while len(self.levels[-1]) > 1:
+            self.levels.append(self._parents(self.levels[-1], np.arange((len(self.levels[-1]) + 1) // 2)))
+
+    @staticmethod
+    def _parents(level, idx):
+        """Hashes of parents `idx` (sorted) computed from `level`."""
+        left = level[2 * idx]
+        right_idx = 2 * idx + 1
+        has_right = right_idx < len(level)
+        out = left.copy()
+        out[has_right] = _combine(left[has_right], level[right_idx[has_right]])
+        return out
+
+    def copy(self):
+        twin = MerkleTree.__new__(MerkleTree)
+        twin.levels = [level.copy() for level in self.levels]
+        return twin
+
+    @property
+    def leaves(self):
+        return self.levels[0]
+
+    def root(self):
+        """Root hash as an int (0 for an empty tree)."""
+        return int(self.levels[-1][0]) if len(self.levels[0]) else 0
+
+    def update(self, idx, hashes):
+        """Sets leaves `idx` to `hashes` and recomputes only their ancestors."""
+        idx = np.asarray(idx, dtype=np.int64)
+        if not idx.size:
+            return
+        self.levels[0][idx] = hashes
+        idx = np.unique(idx)
+        for depth in range(1, len(self.levels)):
+            idx = np.unique(idx // 2)
+            self.levels[depth][idx] = self._parents(self.levels[depth - 1], idx)
+
+    def diff(self, other):
+        """Sorted indices of the leaves that differ from `other`'s."""
+        if len(self.levels[0]) != len(other.levels[0]):
+            raise ValueError("Merkle trees cover different tile grids")
+        if not len(self.levels[0]) or self.root() == other.root():
+            return np.empty(0, dtype=np.int64)
+        idx = np.zeros(1, dtype=np.int64)
+        for depth in range(len(self.levels) - 2, -1, -1):
+            level, theirs = self.levels[depth], other.levels[depth]
+            idx = np.concatenate((2 * idx, 2 * idx + 1))
+            idx = np.sort(idx[idx < len(level)])
+            idx = idx[level[idx] != theirs[idx]]
+        return idx
+
+
+class SheetHashes:
+    """
+    Incrementally maintained Merkle tree over a sheet's values (a CellStore
+    or a 2D array). Call invalidate*() whenever values change; hashing is
+    deferred to the next root() or diff().
+    """
+    def __init__(self, values, tile_rows=TILE_ROWS, tile_cols=TILE_COLS):
+        self.values = values
+        self.tile_shape = (tile_rows, tile_cols)
+        self.grid = tile_grid(*values.shape, tile_rows, tile_cols)
+        self.tree = None
+        self._stale = set()
+        self._zero = int(funct.block_hashes(np.zeros((1, 1)), tile_rows, tile_cols)[0, 0])
+
+    @classmethod
+    def from_zsff(cls, reader):
+        """Tree for the sheet stored in a ZSFF file; hashes the stored tiles through the memmap."""
+        hashes = cls(reader, *reader.tile_shape)
+        leaves = np.full(hashes.grid[0] * hashes.grid[1], hashes._zero, dtype=np.uint64)
+        for (ti, tj) in reader.tiles:
+            leaves[ti * hashes.grid[1] + tj] = funct.block_hashes(reader.tile(ti, tj), *reader.tile_shape)[0, 0]
+        hashes.tree = MerkleTree(leaves)
+        return hashes
+
+    def fork(self, values):
+        """
+        Independent copy bound to `values`, a snapshot of this sheet's values.
+        Cheap (the tree is copied, no tile is hashed), and the copy can then be
+        refreshed on another thread while this one keeps tracking the sheet.
+        """
+        twin = SheetHashes.__new__(SheetHashes)
+        twin.values = values
+        twin.tile_shape, twin.grid, twin._zero = self.tile_shape, self.grid, self._zero
+        twin.tree = None if self.tree is None else self.tree.copy()
+        twin._stale = set(self._stale)
+        return twin
+
+    # --- INVALIDATION ---
+    def invalidate(self, ti, tj):
+        if self.tree is not None:
+            self._stale.add((ti, tj))
+
+    def invalidate_rect(self, r0, c0, r1, c1):
+        """Cells r0..r1, c0..c1 inclusive changed."""
+        if self.tree is None:
+            return
+        tr, tc = self.tile_shape
+        self._stale.update((ti, tj) for ti in range(r0 // tr, r1 // tr + 1)
+                           for tj in range(c0 // tc, c1 // tc + 1))
+
+    def invalidate_all(self):
+        self.tree = None
+        self._stale.clear()
+
+    # --- HASHING ---
+    def _hash_tiles(self, keys):
+        """Leaf hashes of tiles `keys` read from the live values, batched through funct.block_hashes."""
+        tr, tc = self.tile_shape
+        rows, cols = self.values.shape
+        out = np.empty(len(keys), dtype=np.uint64)
+        for i in range(0, len(keys), HASH_BATCH_TILES):
+            batch = keys[i:i + HASH_BATCH_TILES]
+            stack = np.zeros((len(batch) * tr, tc))
+            for k, (ti, tj) in enumerate(batch):
+                r0, c0 = ti * tr, tj * tc
+                h, w = min(tr, rows - r0), min(tc, cols - c0)
+                stack[k * tr:k * tr + h, :w] = self.values[r0:r0 + h, c0:c0 + w]
+            out[i:i + len(batch)] = funct.block_hashes(stack, tr, tc)[:, 0]
+        return out
+
+    def _leaf_index(self, keys):
+        return np.array([ti * self.grid[1] + tj for ti, tj in keys], dtype=np.int64)
+
+    def refresh(self):
+        """Brings the tree up to date and returns it."""
+        if self.tree is None:
+            if isinstance(self.values, CellStore):
+                leaves = np.full(self.grid[0] * self.grid[1], self._zero, dtype=np.uint64)
+                keys = self.values.tiles(*self.tile_shape)
+                leaves[self._leaf_index(keys)] = self._hash_tiles(keys)
+            else:
+                leaves = funct.block_hashes(self.values, *self.tile_shape)
+            self.tree = MerkleTree(leaves)
+            self._stale.clear()
+        elif self._stale:
+            keys = sorted(self._stale)
+            self._stale.clear()
+            self.tree.update(self._leaf_index(keys), self._hash_tiles(keys))
+        return self.tree
+
+    def root(self):
+        return self.refresh().root()
+
+    def diff(self, other):
+        """(ti, tj) of every tile whose contents differ from `other` (another SheetHashes)."""
+        if self.grid != other.grid or self.tile_shape != other.tile_shape:
+            raise ValueError("Sheets differ in shape or tile size; every tile differs")
+        cols = self.grid[1]
+        return [(int(i) // cols, int(i) % cols) for i in self.refresh().diff(other.refresh())]
+
+
+# -----------------------------------------------------------------------------
+# SUBSYSTEM: DIFF API
+# -----------------------------------------------------------------------------
+def diff_sheets(a, b):
+    """Changed (ti, tj) tiles between two sheets (SheetHashes, CellStores or arrays of equal shape)."""
+    a = a if isinstance(a, SheetHashes) else SheetHashes(a)
+    b = b if isinstance(b, SheetHashes) else SheetHashes(b)
+    return a.diff(b)
+
+
+def zsff_tree(reader):
+    """Merkle tree over a file's tile index checksums (0 for absent tiles); reads no tile data."""
+    grid_r, grid_c = tile_grid(*reader.shape, *reader.tile_shape)
+    leaves = np.zeros(grid_r * grid_c, dtype=np.uint64)
+    for (ti, tj), (_, checksum) in reader.tiles.items():
+        leaves[ti * grid_c + tj] = checksum
+    return MerkleTree(leaves)
+
+
+def diff_zsff(path_a, path_b):
+    """Changed (ti, tj) tiles between two ZSFF files of the same version, from their indexes alone."""
+    with ZsffReader(path_a) as a, ZsffReader(path_b) as b:
+        if a.shape != b.shape or a.tile_shape != b.tile_shape or a.version != b.version:
+            raise ZsffError("Files differ in version, shape or tile size; every tile differs")
+        grid_c = tile_grid(*a.shape, *a.tile_shape)[1]
+        return [(int(i) // grid_c, int(i) % grid_c) for i in zsff_tree(a).diff(zsff_tree(b))]
@@ -0,0 +1,340 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - SHEET MODEL
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Single source of truth for sheet contents. The UI renders from here; saves,
+snapshots and C++ operations read `values` directly instead of widgets.
+"""
+
+import numpy as np
+
+from logs import telemetry
+from calc import DependencyGraph, cell_name
+from formula import ErrorCode, FormulaEngine
+from store import CellStore
+from merkle import SheetHashes
+from zsff import TILE_ROWS, TILE_COLS
+
+
+EXCEL_EPOCH = np.datetime64("1899-12-30T00:00:00")
+
+
+def format_value(v, fmt=None):
+    """Compact display form of a cell value: 3.0 -> '3', 0.1 -> '0.1'."""
+    if fmt == "date":
+        stamp = str(EXCEL_EPOCH + np.timedelta64(int(round(v * 86400)), "s"))
+        return stamp[:10] if stamp.endswith("T00:00:00") else stamp.replace("T", " ")
+    return f"{v:.10g}"
+
+
+class DirtyRegion:
+    """
+    Accumulates what changed since the UI last painted: single cells,
+    rectangles (r0, c0, r1, c1 inclusive), or the whole sheet. Any number of
+    edits between two paints coalesce into one drain().
+    """
+    def __init__(self):
+        self.everything = False
+        self.cells = set()
+        self.rects = []
+
+    def __bool__(self):
+        return self.everything or bool(self.cells) or bool(self.rects)
+
+    def mark(self, cell):
+        if not self.everything:
+            self.cells.add(cell)
+
+    def mark_rect(self, r0, c0, r1, c1):
+        if not self.everything:
+            self.rects.append((r0, c0, r1, c1))
+
+    def mark_all(self):
+        self.everything = True
+        self.cells.clear()
+        self.rects.clear()
+
+    def drain(self):
+        state = (self.everything, self.cells, self.rects)
+        self.everything, self.cells, self.rects = False, set(), []
+        return state
+
+
+class SheetModel:
+    """
+    values   -> CellStore, the numeric contents of every cell (empty blocks take no memory)
+    formulas -> (row, col) -> formula text, for cells that hold a formula
+    text     -> (row, col) -> label text, for non-numeric entries and text formula results (empty in values)
+    errors   -> (row, col) -> error code of formulas that failed to evaluate
+    dirty    -> cells changed since the UI last repainted
+    unsaved_tiles -> ZSFF tiles (ti, tj) changed since the last save
+    hashes   -> Merkle tree over the tiles of `values`, rehashed lazily per changed tile
+    column_formats -> col -> display format ("date") set by imports
+    """
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.values = CellStore(rows, cols)
+        self.hashes = SheetHashes(self.values)
+        self.formulas = {}
+        self.text = {}
+        self.errors = {}
+        self.graph = DependencyGraph()
+        self.dirty = DirtyRegion()
+        self.unsaved_tiles = set()
+        self.unsaved_all = True       # Never saved: the next save writes everything
+        self.column_formats = {}
+        self.generation = 0           # Bumped whenever the whole matrix is replaced
+        self._edit_watchers = []
+
+    # --- READ ACCESS ---
+    def display_text(self, r, c):
+        cell = (r, c)
+        if cell in self.formulas:
+            if cell in self.errors:
+                return self.errors[cell]
+            return self.text[cell] if cell in self.text else format_value(self.values[r, c])
+        if cell in self.text:
+            return self.text[cell]
+        v = self.values[r, c]
+        return format_value(v, self.column_formats.get(c)) if v != 0 or self.values.is_filled(r, c) else ""
+
+    def edit_text(self, r, c):
+        """What the user typed, i.e. the formula rather than its result."""
+        cell = (r, c)
+        if cell in self.formulas:
+            return self.formulas[cell]
+        if cell in self.text:
+            return self.text[cell]
+        v = self.values[r, c]
+        return format_value(v) if v != 0 or self.values.is_filled(r, c) else ""
+
+    def snapshot(self):
+        return self.values.copy()
+
+    def meta(self):
+        """Sheet-level settings persisted alongside the data (ZSFF string section)."""
+        return {"column_formats": {str(c): f for c, f in self.column_formats.items()}}
+
+    def recovery_state(self):
+        """Private copy of everything needed to rebuild the sheet, safe to hand to another thread."""
+        return self.values.snapshot(), dict(self.formulas), dict(self.text), self.meta()
+
+    # --- WRITE ACCESS ---
+    def set_input(self, row, col, raw):
+        """Applies one edit. Returns every cell whose value may have changed."""
+        cell = (row, col)
+        self.text.pop(cell, None)
+        self.errors.pop(cell, None)
+        if raw.startswith("="):
+            self.formulas[cell] = raw
+            self.graph.set_formula(cell, FormulaEngine.references(raw))
+        else:
+            if cell in self.formulas:
+                del self.formulas[cell]
+                self.graph.clear(cell)
+            try:
+                self.values[row, col] = float(raw)
+            except ValueError:
+                self.values.erase(row, col)
+                if raw.strip():
+                    self.text[cell] = raw
+        self._touch(cell)
+        for watcher in self._edit_watchers:
+            watcher.add(cell)
+        return [cell] + [c for c in self.recalculate([cell]) if c != cell]
+
+    def watch_edits(self):
+        """A set that collects every cell edited from now on, until unwatch_edits()."""
+        cells = set()
+        self._edit_watchers.append(cells)
+        return cells
+
+    def unwatch_edits(self, cells):
+        self._edit_watchers.remove(cells)
+
+    def recalculate(self, changed):
+        """Re-evaluates only the formulas downstream of `changed`, precedents first."""
+        order, cyclic = self.graph.recalc_order(changed)
+        for cell in order:
+            self._evaluate(cell)
+        for cell in cyclic:
+            self.values.erase(*cell)
+            self.text.pop(cell, None)
+            self.errors[cell] = ErrorCode("#CIRC!")
+        if cyclic:
+            names = ", ".join(sorted(cell_name(*c) for c in cyclic))
+            telemetry.log("warning", f"Circular reference detected: {names}")
+        updated = order + list(cyclic)
+        for cell in updated:
+            self._touch(cell)
+        return updated
+
+    def recalculate_all(self):
+        """Full recalculation, used after bulk value replacement."""
+        return self.recalculate(list(self.formulas))
+
+    def _evaluate(self, cell):
+        # Cleared first so a whole-sheet formula (=SUM()) never adds in its own previous result
+        self.values.erase(*cell)
+        self.text.pop(cell, None)
+        self.errors.pop(cell, None)
+        result = FormulaEngine.parse_and_execute(self.formulas[cell], self.values)
+        if isinstance(result, ErrorCode):
+            self.errors[cell] = result
+        elif isinstance(result, str):
+            self.text[cell] = result
+        elif isinstance(result, (int, float)):
+            self.values[cell] = result
+        else:
+            self.errors[cell] = ErrorCode("#VALUE!")   # A range where one value was expected
+        telemetry.log("info", f"Cell [{cell[0]},{cell[1]}] formula calculated: {result}")
+
+    def _touch(self, cell):
+        tile = (cell[0] // TILE_ROWS, cell[1] // TILE_COLS)
+        self.dirty.mark(cell)
+        self.unsaved_tiles.add(tile)
+        self.hashes.invalidate(*tile)
+
+    def _touch_rect(self, r0, c0, r1, c1):
+        self.dirty.mark_rect(r0, c0, r1, c1)
+        for ti in range(r0 // TILE_ROWS, r1 // TILE_ROWS + 1):
+            for tj in range(c0 // TILE_COLS, c1 // TILE_COLS + 1):
+                self.unsaved_tiles.add((ti, tj))
+        self.hashes.invalidate_rect(r0, c0, r1, c1)
+
+    def _touch_all(self):
+        self.dirty.mark_all()
+        self.unsaved_all = True
+        self.hashes.invalidate_all()
+
+    def mark_saved(self):
+        self.unsaved_tiles.clear()
+        self.unsaved_all = False
+
+    def take_unsaved(self):
+        """Hands the unsaved state to a save in progress; edits from here on start a fresh set."""
+        state = (self.unsaved_tiles, self.unsaved_all)
+        self.unsaved_tiles, self.unsaved_all = set(), False
+        return state
+
+    def restore_unsaved(self, state):
+        """A save failed: whatever it took is unsaved again."""
+        tiles, everything = state
+        self.unsaved_tiles |= tiles
+        self.unsaved_all = self.unsaved_all or everything
+
+    def _reset(self):
+        self.formulas.clear()
+        self.text.clear()
+        self.errors.clear()
+        self.column_formats.clear()
+        self.graph.reset()
+        self.values.clear()
+        self.generation += 1
+        self._touch_all()
+
+    def _install(self, formulas, text):
+        self.text.update(text)
+        for cell, formula in formulas.items():
+            self.formulas[cell] = formula
+            self.graph.set_formula(cell, FormulaEngine.references(formula))
+        self.recalculate_all()
+
+    def load_matrix(self, matrix):
+        """
+        Replaces the whole sheet with imported data, clipped to the sheet size.
+        A CellStore or MaskedArray keeps its empty cells; a plain array is a
+        dense source (e.g. a .npy file), so every cell, zeros included, is populated.
+        """
+        self._reset()
+        if isinstance(matrix, CellStore):
+            for (r0, c0), block in matrix.items(masked=True):
+                self.values.write(r0, c0, block)
+            return
+        matrix = np.atleast_2d(matrix)
+        r, c = min(matrix.shape[0], self.rows), min(matrix.shape[1], self.cols)
+        block = matrix[:r, :c]
+        if not isinstance(block, np.ma.MaskedArray):
+            block = np.ma.MaskedArray(block, mask=np.zeros(block.shape, dtype=bool))
+        self.values[:r, :c] = block
+
+    def load_zsff(self, reader):
+        """
+        Replaces the sheet with a ZSFF file. Every stored tile is copied and
+        checksum-verified up front, so this costs O(stored tiles), not O(sheet).
+        """
+        self._reset()
+        reader.read_into(self.values)
+        formats = reader.meta.get("column_formats", {})
+        self.column_formats.update({int(c): f for c, f in formats.items()})
+        self._install(reader.formulas, reader.text)
+
+    def begin_import(self):
+        self._reset()
+
+    def apply_block(self, r0, block, text_cells, col_types=None):
+        """Writes one imported chunk (rows r0.., columns 0..; masked cells are empty) straight into the sheet."""
+        r1 = min(r0 + block.shape[0], self.rows)
+        width = min(block.shape[1], self.cols)
+        if r1 <= r0 or width == 0:
+            return
+        self.values[r0:r1, :width] = block[:r1 - r0, :width]
+        self.text.update((cell, v) for cell, v in text_cells.items() if cell[0] < r1 and cell[1] < width)
+        for c, kind in enumerate((col_types or [])[:width]):
+            if kind == "date":
+                self.column_formats[c] = "date"
+        self._touch_rect(r0, 0, r1 - 1, width - 1)
+
+    def is_empty(self, r0, c0, r1, c1):
+        """True if no cell of the rectangle (inclusive) holds a value, formula or label."""
+        if self.values[r0:r1 + 1, c0:c1 + 1].any():
+            return False
+        return not any((r, c) in self.formulas or (r, c) in self.text
+                       for r in range(r0, r1 + 1) for c in range(c0, c1 + 1))
+
+    def write_block(self, r0, c0, block):
+        """
+        Writes computed numbers (e.g. forecasts) into the rectangle at (r0, c0),
+        clipped to the sheet, and recalculates the formulas that read it.
+        Returns every cell whose value may have changed.
+        """
+        r1 = min(r0 + block.shape[0], self.rows)
+        c1 = min(c0 + block.shape[1], self.cols)
+        if r1 <= r0 or c1 <= c0:
+            return []
+        cells = [(r, c) for r in range(r0, r1) for c in range(c0, c1)]
+        for cell in cells:
+            self.text.pop(cell, None)
+            self.errors.pop(cell, None)
+            if cell in self.formulas:
+                del self.formulas[cell]
+                self.graph.clear(cell)
+        block = block[:r1 - r0, :c1 - c0]
+        self.values[r0:r1, c0:c1] = np.ma.MaskedArray(block, mask=np.zeros(block.shape, dtype=bool))  # Zeros too
+        self._touch_rect(r0, c0, r1 - 1, c1 - 1)
+        return cells + [c for c in self.recalculate(cells) if not (r0 <= c[0] < r1 and c0 <= c[1] < c1)]
+
+    def restore_state(self, values, formulas, text, meta=None):
+        """Inverse of recovery_state()."""
+        self.load_matrix(values)
+        formats = (meta or {}).get("column_formats", {})
+        self.column_formats.update({int(c): f for c, f in formats.items()})
+        self._install(formulas, text)
+
+    def replace_values(self, matrix, keep=()):
+        """
+        Installs bulk-computed values (e.g. a C++ SCALE) and re-derives formulas.
+        Cells in `keep` (edited while the values were being computed) are left as they are.
+        """
+        for cell in keep:
+            if self.values.is_filled(*cell):
+                matrix[cell] = self.values[cell]
+            else:
+                matrix.erase(*cell)
+        self.values[:] = matrix
+        self.generation += 1
+        self._touch_all()
+        self.recalculate_all()
@@ -0,0 +1,132 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - RECOVERY JOURNAL
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Crash recovery as an append-only edit journal plus compacted checkpoints.
+The UI thread only appends to an in-memory list; the daemon thread does all
+file I/O. Checkpoints are written to a temp file and atomically renamed.
+"""
+
+import os
+import json
+import threading
+
+from logs import telemetry
+from zsff import ZsffReader, write_zsff
+
+RECOVERY_DIR = os.path.join("logs", "recovery")
+JOURNAL_NAME = "journal.jsonl"
+CHECKPOINT_NAME = "checkpoint.zsff"
+
+
+class RecoveryJournal:
+    """
+    Every edit gets a sequence number. A checkpoint stores the sheet state as
+    of some sequence number S; replay loads it and re-applies journal entries
+    with seq > S, so a crash between any two steps below loses nothing.
+    """
+    def __init__(self, folder=RECOVERY_DIR):
+        self.folder = folder
+        self.journal_path = os.path.join(folder, JOURNAL_NAME)
+        self.checkpoint_path = os.path.join(folder, CHECKPOINT_NAME)
+        self._lock = threading.Lock()
+        self._pending = []            # journal lines not yet on disk
+        self._checkpoint = None       # (seq, state) waiting for the daemon
+        self.seq = 0
+        self.dirty = False            # edits since the last checkpoint
+
+    # --- UI THREAD ---
+    def record_edit(self, row, col, raw):
+        with self._lock:
+            self.seq += 1
+            self._pending.append(json.dumps({"s": self.seq, "r": row, "c": col, "v": raw}))
+            self.dirty = True
+
+    def record_bulk(self):
+        """Bulk ops (load, SCALE) cannot be replayed; the next checkpoint covers them."""
+        with self._lock:
+            self.seq += 1
+            self._pending.append(json.dumps({"s": self.seq, "op": "bulk"}))
+            self.dirty = True
+
+    def request_checkpoint(self, state):
+        """`state` must already be a private copy (see SheetModel.recovery_state)."""
+        with self._lock:
+            self._checkpoint = (self.seq, state)
+            self.dirty = False
+
+    # --- DAEMON THREAD ---
+    def flush(self):
+        """Appends pending edits and writes any requested checkpoint. O(edits)."""
+        with self._lock:
+            lines, self._pending = self._pending, []
+            checkpoint, self._checkpoint = self._checkpoint, None
+        if lines:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self.journal_path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        if checkpoint:
+            self._write_checkpoint(*checkpoint)
+        return len(lines)
+
+    def _write_checkpoint(self, seq, state):
+        values, formulas, text, meta = state
+        os.makedirs(self.folder, exist_ok=True)
+        write_zsff(self.checkpoint_path, values, formulas, text, meta=dict(meta, seq=seq))
+
+        # Compact: drop journal entries the checkpoint already contains
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path) as f:
+                keep = [line for line in f if line.strip() and json.loads(line)["s"] > seq]
+            self._atomic_write(self.journal_path, "".join(keep).encode())
+        telemetry.log("info", f"Recovery checkpoint @seq {seq}: {os.path.getsize(self.checkpoint_path)} bytes.")
+
+    @staticmethod
+    def _atomic_write(path, data):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    # --- STARTUP / SHUTDOWN ---
+    def has_session(self):
+        return os.path.exists(self.checkpoint_path) or (
+            os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0)
+
+    def restore(self, model):
+        """Loads the last checkpoint into `model` and replays newer edits. Returns #edits replayed."""
+        seq = 0
+        if os.path.exists(self.checkpoint_path):
+            with ZsffReader(self.checkpoint_path) as reader:
+                model.load_zsff(reader)
+                seq = reader.meta["seq"]
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from the crash
+                    if entry["s"] <= seq or "op" in entry:
+                        continue
+                    model.set_input(entry["r"], entry["c"], entry["v"])
+                    replayed += 1
+        telemetry.log("info", f"Recovered session: checkpoint @seq {seq}, {replayed} edits replayed.")
+        return replayed
+
+    def discard(self):
+        for path in (self.journal_path, self.checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with self._lock:
+            self._pending.clear()
+            self._checkpoint = None
+            self.dirty = False
+
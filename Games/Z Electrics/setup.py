@@ -1,6 +1,8 @@
 # setup.py
 # Build configuration for the ZEGA proprietary funct C-extension module
-# Requires: NumPy, OpenMP-enabled compiler (e.g., gcc with -fopenmp), AVX2 support
+# Requires: NumPy, OpenMP-enabled compiler (e.g., gcc with -fopenmp)
+# Portable build: SIMD variants (SSE2/AVX2/AVX-512) are picked at import time,
+# see funct.build_info()
 
 import numpy
 from setuptools import setup, Extension
@@ -11,11 +13,8 @@ funct_module = Extension(
     include_dirs=[numpy.get_include()],
     extra_compile_args=[
         "-O3",
-        "-march=native",
         "-fopenmp",
-        "-mavx2",
-        "-mfma",
-        "-ffast-math",
+        "-ffp-contract=off",  # Same rounding on every host and SIMD variant
         "-std=c++17"
     ],
     extra_link_args=["-fopenmp"],
@@ -0,0 +1,66 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - STARTUP PROFILER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Backs `main.py --profile-startup`. It is created before main.py imports
+anything heavy. While it is enabled it wraps builtins.__import__ to time
+every first import, and boot milestones are recorded with mark(). report()
+lists the time to each milestone, the cost of every import main.py made
+directly, and the slowest modules by self time. Kept to the standard
+library so that importing it costs nothing worth measuring.
+"""
+
+import sys
+import time
+import builtins
+
+REPORT_TOP = 15
+
+
+class StartupProfile:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self.marks = []               # (label, ms since t0)
+        self.imports = {}             # module -> [self ms, cumulative ms, depth]
+        self._stack = []              # Child time accumulated per open import
+        self._original = builtins.__import__
+        if enabled:
+            builtins.__import__ = self._import
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        depth = len(self._stack)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            self.imports.setdefault(name, [total - children, total, depth])
+
+    def mark(self, label):
+        if self.enabled:
+            self.marks.append((label, (time.perf_counter() - self.t0) * 1000))
+
+    def stop(self):
+        """Removes the import hook; marks can still be recorded."""
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original
+
+    def report(self):
+        lines = ["ZEGA STARTUP PROFILE (ms since main.py started)"]
+        lines += [f"  {label:<40}{ms:>10.1f}" for label, ms in self.marks]
+        direct = sorted(((v[1], k) for k, v in self.imports.items() if v[2] == 0), reverse=True)
+        lines.append(f"DIRECT IMPORTS (cumulative ms, {sum(ms for ms, _ in direct):.1f} total)")
+        lines += [f"  {name:<40}{ms:>10.1f}" for ms, name in direct]
+        slowest = sorted(((v[0], k) for k, v in self.imports.items()), reverse=True)[:REPORT_TOP]
+        lines.append(f"SLOWEST MODULES (self ms, {len(self.imports)} imported)")
+        lines += [f"  {name:<40}{ms:>10.1f}" for ms, name in slowest]
+        return "\n".join(lines)
@@ -0,0 +1,279 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - CHUNKED CELL STORE
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+Sparse float64 matrix for the sheet. Cells live in dense BLOCK_ROWS x
+BLOCK_COLS NumPy blocks, each with a boolean mask of which cells are
+populated. A block is allocated on the first write of a populated cell and
+dropped again once none is left; empty cells and absent blocks read as zeros.
+Memory therefore follows the populated cells, not the sheet's bounding box.
+
+Indexing mimics a 2D ndarray: store[r, c] reads one cell or writes a
+populated one, and slices read a dense copy of the region or write a
+scalar/array into it, so the funct kernels keep receiving plain arrays. In
+bulk writes zeros are empty, as the grid shows them, unless a MaskedArray
+says which cells are populated; read_masked() returns one. parts() hands out
+views of just the allocated blocks of a region, which is how formulas reduce
+ranges without a copy of the region.
+
+Only the Tk thread touches a live store. Background jobs, exports and hashing
+get a snapshot(): it shares the block arrays, and the live store copies a
+shared block before its next write to it.
+"""
+
+import numpy as np
+
+BLOCK_ROWS = 64     # 64 x 16 float64 = 8 KB; a ZSFF tile is 4 x 4 blocks
+BLOCK_COLS = 16
+
+
+class CellStore:
+    dtype = np.dtype(np.float64)
+    ndim = 2
+
+    def __init__(self, rows, cols, block_rows=BLOCK_ROWS, block_cols=BLOCK_COLS):
+        self.shape = (rows, cols)
+        self.block_shape = (block_rows, block_cols)
+        self.blocks = {}          # (bi, bj) -> (block_rows, block_cols) float64 array
+        self.filled = {}          # (bi, bj) -> bool array of the populated cells, same keys
+        self._owned = set()       # Blocks no snapshot shares, writable in place
+
+    @property
+    def nbytes(self):
+        """Bytes held by allocated blocks and their masks."""
+        return len(self.blocks) * self.block_shape[0] * self.block_shape[1] * 9
+
+    # --- INDEXING ---
+    @staticmethod
+    def _axis(key, n):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                raise IndexError("CellStore slices must be contiguous")
+            return start, max(start, stop), False
+        i = int(key)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"index {int(key)} out of range for size {n}")
+        return i, i + 1, True
+
+    def _region(self, key):
+        rk, ck = key if isinstance(key, tuple) else (key, slice(None))
+        r0, r1, r_scalar = self._axis(rk, self.shape[0])
+        c0, c1, c_scalar = self._axis(ck, self.shape[1])
+        return r0, r1, c0, c1, r_scalar and c_scalar
+
+    def _slots(self, r0, r1, c0, c1, present_only):
+        """(bi, bj) block keys intersecting rows r0:r1, cols c0:c1 (only allocated ones if present_only)."""
+        br, bc = self.block_shape
+        if r1 <= r0 or c1 <= c0:
+            return []
+        bi0, bi1, bj0, bj1 = r0 // br, (r1 - 1) // br, c0 // bc, (c1 - 1) // bc
+        if present_only and len(self.blocks) < (bi1 - bi0 + 1) * (bj1 - bj0 + 1):
+            return sorted(k for k in self.blocks if bi0 <= k[0] <= bi1 and bj0 <= k[1] <= bj1)
+        slots = [(bi, bj) for bi in range(bi0, bi1 + 1) for bj in range(bj0, bj1 + 1)]
+        return [k for k in slots if k in self.blocks] if present_only else slots
+
+    def _overlap(self, key, r0, r1, c0, c1):
+        """Slices of the block and of the region for where block `key` meets the region."""
+        br, bc = self.block_shape
+        b_r0, b_c0 = key[0] * br, key[1] * bc
+        rs, re_ = max(r0, b_r0), min(r1, b_r0 + br)
+        cs, ce = max(c0, b_c0), min(c1, b_c0 + bc)
+        return ((slice(rs - b_r0, re_ - b_r0), slice(cs - b_c0, ce - b_c0)),
+                (slice(rs - r0, re_ - r0), slice(cs - c0, ce - c0)))
+
+    def __getitem__(self, key):
+        r0, r1, c0, c1, scalar = self._region(key)
+        if scalar:
+            br, bc = self.block_shape
+            block = self.blocks.get((r0 // br, c0 // bc))
+            return float(block[r0 % br, c0 % bc]) if block is not None else 0.0
+        return self.read(r0, r1, c0, c1)
+
+    def __setitem__(self, key, value):
+        r0, r1, c0, c1, scalar = self._region(key)
+        if scalar:
+            self._set_cell(r0, c0, float(value))
+        elif isinstance(value, CellStore):
+            if (r0, r1, c0, c1) != (0, self.shape[0], 0, self.shape[1]) or value.block_shape != self.block_shape:
+                raise ValueError("A CellStore can only be assigned to the whole of a store with the same blocks")
+            self.adopt(value)
+        elif isinstance(value, np.ma.MaskedArray):
+            if value.shape != (r1 - r0, c1 - c0):
+                raise ValueError(f"MaskedArray of shape {value.shape} assigned to a {r1 - r0}x{c1 - c0} region")
+            self.write(r0, c0, value)
+        else:
+            self.write(r0, c0, np.broadcast_to(np.asarray(value, dtype=np.float64), (r1 - r0, c1 - c0)))
+
+    def _writable(self, key):
+        """(block, mask) of `key` for writing ((None, None) if absent), copied first if a snapshot shares them."""
+        block = self.blocks.get(key)
+        if block is None:
+            return None, None
+        if key not in self._owned:
+            block = self.blocks[key] = block.copy()
+            self.filled[key] = self.filled[key].copy()
+            self._owned.add(key)
+        return block, self.filled[key]
+
+    def _allocate(self, key):
+        block = self.blocks[key] = np.zeros(self.block_shape)
+        mask = self.filled[key] = np.zeros(self.block_shape, dtype=bool)
+        self._owned.add(key)
+        return block, mask
+
+    def _drop(self, key):
+        del self.blocks[key]
+        del self.filled[key]
+        self._owned.discard(key)
+
+    def _set_cell(self, r, c, v, populated=True):
+        br, bc = self.block_shape
+        key = (r // br, c // bc)
+        block, mask = self._writable(key)
+        if block is None:
+            if not populated:
+                return
+            block, mask = self._allocate(key)
+        block[r % br, c % bc] = v if populated else 0.0
+        mask[r % br, c % bc] = populated
+        if not populated and not mask.any():
+            self._drop(key)
+
+    def erase(self, r, c):
+        """Empties one cell (reads as 0, skipped by COUNT/AVERAGE/MIN/MAX)."""
+        self._set_cell(r, c, 0.0, populated=False)
+
+    def is_filled(self, r, c):
+        br, bc = self.block_shape
+        mask = self.filled.get((r // br, c // bc))
+        return mask is not None and bool(mask[r % br, c % bc])
+
+    # --- BULK ACCESS ---
+    def read(self, r0, r1, c0, c1):
+        """Dense copy of rows r0:r1, cols c0:c1."""
+        out = np.zeros((r1 - r0, c1 - c0))
+        for key in self._slots(r0, r1, c0, c1, present_only=True):
+            src, dst = self._overlap(key, r0, r1, c0, c1)
+            out[dst] = self.blocks[key][src]
+        return out
+
+    def read_masked(self, r0, r1, c0, c1):
+        """Like read(), as a MaskedArray whose empty cells are masked."""
+        out = np.zeros((r1 - r0, c1 - c0))
+        empty = np.ones((r1 - r0, c1 - c0), dtype=bool)
+        for key in self._slots(r0, r1, c0, c1, present_only=True):
+            src, dst = self._overlap(key, r0, r1, c0, c1)
+            out[dst] = self.blocks[key][src]
+            empty[dst] = ~self.filled[key][src]
+        return np.ma.MaskedArray(out, mask=empty)
+
+    def parts(self, r0, r1, c0, c1):
+        """
+        [((i, j), values, filled)] for every allocated block meeting rows r0:r1,
+        cols c0:c1, in row-major order: views (not copies, do not write to them)
+        of where the block overlaps the region and of its filled mask, and the
+        offset of that overlap within the region.
+        """
+        out = []
+        for key in self._slots(r0, r1, c0, c1, present_only=True):
+            src, dst = self._overlap(key, r0, r1, c0, c1)
+            out.append(((dst[0].start, dst[1].start), self.blocks[key][src], self.filled[key][src]))
+        return out
+
+    def write(self, r0, c0, data):
+        """
+        Writes a 2D array at (r0, c0), clipped to the sheet. Masked cells of a
+        MaskedArray, or zeros of a plain array, become empty; parts without a
+        populated cell allocate nothing.
+        """
+        masked = isinstance(data, np.ma.MaskedArray)
+        empty = np.ma.getmaskarray(data) if masked else None
+        data = np.ma.getdata(data)
+        r1 = min(r0 + data.shape[0], self.shape[0])
+        c1 = min(c0 + data.shape[1], self.shape[1])
+        zero_fill = not masked and data.strides == (0, 0) and data.size and data.flat[0] == 0.0
+        for key in self._slots(r0, r1, c0, c1, present_only=zero_fill):
+            dst, src = self._overlap(key, r0, r1, c0, c1)
+            part = data[src]
+            populated = ~empty[src] if masked else part != 0
+            block, mask = self._writable(key)
+            if block is None:
+                if not populated.any():
+                    continue
+                block, mask = self._allocate(key)
+            block[dst] = np.where(populated, part, 0.0) if masked else part
+            mask[dst] = populated
+            if not mask.any():
+                self._drop(key)
+
+    def clear(self):
+        self.blocks = {}
+        self.filled = {}
+        self._owned = set()
+
+    def copy(self):
+        clone = CellStore(*self.shape, *self.block_shape)
+        clone.blocks = {key: block.copy() for key, block in self.blocks.items()}
+        clone.filled = {key: mask.copy() for key, mask in self.filled.items()}
+        clone._owned = set(clone.blocks)
+        return clone
+
+    def snapshot(self):
+        """
+        Frozen view of the current contents for another thread, in O(blocks):
+        the arrays are shared until this store next writes to them.
+        """
+        frozen = CellStore(*self.shape, *self.block_shape)
+        frozen.blocks = dict(self.blocks)
+        frozen.filled = dict(self.filled)
+        self._owned = set()
+        return frozen
+
+    def adopt(self, other):
+        """Takes over the blocks of `other` (a private store of the same block shape), clipped to this shape."""
+        br, bc = self.block_shape
+        rows, cols = self.shape
+        self.blocks = {key: block for key, block in other.blocks.items()
+                       if key[0] * br < rows and key[1] * bc < cols}
+        self.filled = {key: other.filled[key] for key in self.blocks}
+        self._owned = set(self.blocks)
+        # A block straddling the edge may carry values past it; empty them
+        for (bi, bj), block in self.blocks.items():
+            for arr in (block, self.filled[(bi, bj)]):
+                arr[max(0, rows - bi * br):, :] = 0
+                arr[:, max(0, cols - bj * bc):] = 0
+
+    def items(self, masked=False):
+        """
+        [((r0, c0), block)] for every allocated block, in row-major order. With
+        masked=True the blocks are MaskedArrays with their empty cells masked.
+        """
+        br, bc = self.block_shape
+        if masked:
+            return [((bi * br, bj * bc), np.ma.MaskedArray(block, mask=~self.filled[(bi, bj)]))
+                    for (bi, bj), block in sorted(self.blocks.items())]
+        return [((bi * br, bj * bc), block) for (bi, bj), block in sorted(self.blocks.items())]
+
+    def extent(self):
+        """(rows, cols) of the smallest top-left region holding every populated cell."""
+        br, bc = self.block_shape
+        rows = cols = 0
+        for (bi, bj), mask in self.filled.items():
+            nz_rows = np.flatnonzero(mask.any(axis=1))
+            nz_cols = np.flatnonzero(mask.any(axis=0))
+            if len(nz_rows):
+                rows = max(rows, bi * br + int(nz_rows[-1]) + 1)
+                cols = max(cols, bj * bc + int(nz_cols[-1]) + 1)
+        return rows, cols
+
+    def tiles(self, tile_rows, tile_cols):
+        """Sorted (ti, tj) keys of the tiles of that size that contain an allocated block."""
+        br, bc = self.block_shape
+        return sorted({(ti, tj) for bi, bj in self.blocks
+                       for ti in range(bi * br // tile_rows, ((bi + 1) * br - 1) // tile_rows + 1)
+                       for tj in range(bj * bc // tile_cols, ((bj + 1) * bc - 1) // tile_cols + 1)})
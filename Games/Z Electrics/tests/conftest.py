@@ -0,0 +1,17 @@
+import os
+import sys
+import shutil
+import tempfile
+
+# The modules live flat in the project directory, next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logs import telemetry
+
+# Session logs and metrics go to a throwaway folder, not logs/ in the source tree
+telemetry.root = tempfile.mkdtemp(prefix="zega-test-logs-")
+
+
+def pytest_unconfigure(config):
+    telemetry.close()
+    shutil.rmtree(telemetry.root, ignore_errors=True)
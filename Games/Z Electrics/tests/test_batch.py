@@ -0,0 +1,17 @@
+import math
+
+from batch import run_op
+from model import SheetModel
+
+
+def test_stats_skip_empty_and_text_cells():
+    m = SheetModel(1000, 20)
+    for (r, c), raw in {(0, 0): "4", (9, 0): "0", (3, 0): "n/a", (0, 2): "5",
+                        (0, 5): "=COUNT(A1:A10)", (1, 5): "=AVERAGE(A1:A10)", (2, 5): "=MIN(A1:A10)"}.items():
+        m.set_input(r, c, raw)
+    total, mean, low, high, stdev = run_op(m, "stats", ())
+    assert m.values[0, 5] == 2.0
+    assert (total[0], mean[0], low[0], high[0]) == (4.0, m.values[1, 5], m.values[2, 5], 4.0)
+    assert math.isclose(stdev[0], 2 ** 0.5 * 2)
+    assert total[1] == 0.0 and math.isnan(mean[1])            # No populated cell
+    assert (total[2], mean[2], low[2]) == (5.0, 5.0, 5.0) and math.isnan(stdev[2])
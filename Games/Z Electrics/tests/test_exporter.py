@@ -0,0 +1,76 @@
+import csv
+
+import numpy as np
+
+from exporter import SheetExporter, export_csv
+from importer import iter_csv_chunks
+from merkle import SheetHashes
+from model import SheetModel
+from store import CellStore
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_labels_with_commas_do_not_shift_later_fields(tmp_path):
+    values = np.zeros((1, 4))
+    values[0, 1] = 0.3
+    values[0, 3] = 7.0
+    path = str(tmp_path / "out.csv")
+    export_csv(path, values, {(0, 0): "a,b", (0, 2): "x"})
+    assert read_rows(path) == [["a,b", "0.3", "x", "7"]]
+
+
+def test_zero_inside_a_label_survives(tmp_path):
+    values = np.zeros((2, 3))
+    values[1, 2] = 1.0
+    path = str(tmp_path / "out.csv")
+    export_csv(path, values, {(0, 0): "p,0,q", (0, 1): "0", (1, 0): 'say "0"'})
+    assert read_rows(path) == [["p,0,q", "0", ""], ['say "0"', "", "1"]]
+
+
+def test_numbers_round_trip_exactly(tmp_path):
+    numbers = [123456789012.5, 0.1, -2.5e-300, 1e+22, 3.0, 1 / 3]
+    values = np.array([numbers])
+    path = str(tmp_path / "out.csv")
+    export_csv(path, values)
+    (_, block, text_cells, _, _), = iter_csv_chunks(path)
+    assert not text_cells
+    assert np.ma.getdata(block)[0].tolist() == numbers
+    assert read_rows(path)[0][4] == "3"
+
+
+def test_store_export_writes_populated_zeros_and_blank_empties(tmp_path):
+    values = CellStore(100, 10)
+    values[0, 0] = 0.0
+    values[1, 2] = 5.0
+    path = str(tmp_path / "out.csv")
+    export_csv(path, values, {(1, 0): "n,0"}, column_formats={2: "date"})
+    assert read_rows(path) == [["0", "", ""], ["n,0", "", "1900-01-04"]]
+
+
+def test_chunked_export_matches_single_chunk(tmp_path):
+    rng = np.random.default_rng(7)
+    values = np.round(rng.random((50, 6)) * 100, 3)
+    values[rng.random((50, 6)) < 0.3] = 0.0
+    overrides = {(r, 1): f"row {r}, col 1" for r in range(0, 50, 7)}
+    one, many = str(tmp_path / "one.csv"), str(tmp_path / "many.csv")
+    export_csv(one, values, overrides)
+    export_csv(many, values, overrides, chunk_rows=4)
+    assert read_rows(one) == read_rows(many)
+    assert read_rows(one)[7][1] == "row 7, col 1"
+
+
+def test_merkle_root_is_hashed_from_the_snapshot():
+    m = SheetModel(600, 200)
+    m.set_input(5, 5, "1")
+    m.hashes.root()
+    m.set_input(300, 100, "2")                     # Stale in the model's tree
+    exporter = SheetExporter("unused.zsff", m, on_progress=None, on_done=None)
+    m.set_input(7, 7, "3")                         # After the save request
+    assert exporter.merkle_root is None
+    assert exporter.hashes.root() == SheetHashes(exporter.values).root()
+    assert m.hashes._stale                         # The model's tree was left alone
+    assert m.hashes.root() != exporter.hashes.root()
@@ -0,0 +1,135 @@
+import tracemalloc
+
+import numpy as np
+
+import formula
+from formula import FormulaEngine
+from model import SheetModel
+
+ROWS, COLS = 1_048_576, 1024
+
+
+def sheet(**cells):
+    """SheetModel with A1-style entries, e.g. sheet(A1="2", B3="=A1*2")."""
+    m = SheetModel(ROWS, COLS)
+    for name, raw in cells.items():
+        col, row = name[0], int(name[1:])
+        m.set_input(row - 1, ord(col) - 65, raw)
+    return m
+
+
+def test_no_argument_sum_covers_the_sheet_but_not_its_own_cell():
+    m = sheet(A1="2", A2="3", F6="=SUM()")
+    assert m.values[5, 5] == 5.0
+    m.set_input(5, 5, "=SUM")
+    assert m.values[5, 5] == 5.0
+
+
+def test_no_argument_sum_recalculates_on_any_edit():
+    m = sheet(A1="2", A2="3", F6="=SUM()")
+    m.set_input(999_999, 1000, "10")
+    assert m.values[5, 5] == 15.0
+    m.set_input(0, 0, "")
+    assert m.values[5, 5] == 13.0
+
+
+def test_no_argument_sum_sees_other_formulas():
+    m = sheet(A1="2", B1="=A1*10", F6="=SUM()")
+    assert m.values[5, 5] == 22.0
+    m.set_input(0, 0, "3")
+    assert m.values[5, 5] == 33.0
+
+
+def test_two_whole_sheet_formulas_are_circular():
+    m = sheet(A1="2", F6="=SUM()", G7="=SUM()")
+    assert m.errors == {(5, 5): "#CIRC!", (6, 6): "#CIRC!"}
+    m.set_input(6, 6, "")
+    assert m.errors == {} and m.values[5, 5] == 2.0
+
+
+def test_aggregates_skip_empty_cells():
+    m = sheet(A1="4", A5="8", B1="=COUNT(A1:A10)", B2="=AVERAGE(A1:A10)", B3="=MIN(A1:A10)",
+              B4="=MAX(A:A)", B5="=SUM(A1:A10)")
+    assert [m.values[r, 1] for r in range(5)] == [2.0, 6.0, 4.0, 8.0, 12.0]
+
+
+def test_typed_zero_counts_but_labels_and_blanks_do_not():
+    m = sheet(A1="0", A2="x", A3="6", B1="=COUNT(A1:A10)", B2="=AVERAGE(A1:A10)", B3="=MIN(A1:A10)")
+    assert [m.values[r, 1] for r in range(3)] == [2.0, 3.0, 0.0]
+    m.set_input(0, 0, "")
+    assert [m.values[r, 1] for r in range(3)] == [1.0, 6.0, 6.0]
+
+
+def test_formula_results_count_even_when_zero():
+    m = sheet(A1="5", A2="=A1-5", B1="=COUNT(A1:A3)", B2="=MIN(A1:A3)")
+    assert m.values[0, 1] == 2.0 and m.values[1, 1] == 0.0
+
+
+def test_no_argument_aggregates_skip_empty_cells():
+    m = sheet(A1="2", C3="10", F6="=COUNT()")
+    assert m.values[5, 5] == 2.0
+    m.set_input(5, 5, "=AVERAGE()")
+    assert m.values[5, 5] == 6.0
+    m.set_input(5, 5, "=MIN()")
+    assert m.values[5, 5] == 2.0
+
+
+def test_empty_range_aggregates():
+    m = sheet(B1="=COUNT(A1:A10)", B2="=MIN(A1:A10)", B3="=AVERAGE(A1:A10)", B4="=STDEV(A1:A10)")
+    assert m.values[0, 1] == 0.0 and m.values[1, 1] == 0.0
+    assert m.errors == {(2, 1): "#DIV/0!", (3, 1): "#DIV/0!"}
+
+
+def test_stdev_and_sumif_ignore_empty_cells():
+    m = sheet(A1="2", A2="4", A4="6", B1="=STDEV(A1:A5)", B2='=SUMIF(A1:A5,"<5")')
+    assert m.values[0, 1] == 2.0
+    assert m.values[1, 1] == 6.0
+
+
+def test_full_sheet_ranges_on_a_sparse_sheet_read_only_its_blocks():
+    m = sheet(A1="2", Z900000="0", B2="x")
+    expected = {"=SUM(A:AMI)": 2.0, "=COUNT(A:AMI)": 2.0, "=SUM(A1:AMI1048576)": 2.0, "=MIN(A:Z)": 0.0,
+                '=SUMIF(A:Z,"<1",A:Z)': 0.0, "=SUMPRODUCT(A1:C10,A1:C10)": 4.0}
+    tracemalloc.start()
+    results = {f: FormulaEngine.parse_and_execute(f, m.values) for f in expected}
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert results == expected
+    assert peak < 16 * 1024 * 1024        # The ranges span up to 8 GB of cells
+
+
+def test_sumif_lines_up_a_sum_range_at_another_offset():
+    m = sheet(A1="1", A70="5", A71="1", D2="7", D71="3", D72="4", F1='=SUMIF(A1:A80,"=1",C2:C81)')
+    m.set_input(1, 2, "7")
+    m.set_input(71, 2, "4")
+    assert m.values[0, 5] == 11.0
+
+
+def test_ranges_inside_one_block_are_reduced_from_views():
+    m = sheet(A1="1", A2="2", B1="3", B2="4")
+    block = m.values.blocks[(0, 0)]
+    rng = formula._region(m.values, 0, 2, 0, 2)
+    (operand,) = formula._operands([rng])
+    assert np.shares_memory(operand, block) and np.shares_memory(rng.dense(), block)
+    assert FormulaEngine.parse_and_execute("=SUMPRODUCT(A1:B2,A1:B2)", m.values) == 30.0
+    assert FormulaEngine.parse_and_execute("=SUMPRODUCT(A1:A100,B1:B100)", m.values) == 11.0
+
+
+def test_text_results_are_not_errors():
+    m = sheet(A1="5", B1='="Q"&A1', B2="=1/0", B3="=A1:A2", C1="=COUNT(B1:B3)")
+    assert m.display_text(0, 1) == "Q5" and (0, 1) not in m.errors
+    assert m.errors == {(1, 1): "#DIV/0!", (2, 1): "#VALUE!"}
+    assert m.values[0, 2] == 0.0
+    m.set_input(0, 0, "7")
+    assert m.display_text(0, 1) == "Q7"
+    m.set_input(0, 1, '=A1*2')
+    assert m.display_text(0, 1) == "14" and (0, 1) not in m.text
+
+
+def test_formulas_that_fail_to_compile_are_cached():
+    m = sheet(A1="1", B1="=A1+*2", B2="=A1")
+    assert m.errors == {(0, 1): "#ERROR"}
+    hits = formula.compile_formula.cache_info().hits
+    m.recalculate_all()
+    assert formula.compile_formula.cache_info().hits == hits + 2
+    assert m.errors == {(0, 1): "#ERROR"}
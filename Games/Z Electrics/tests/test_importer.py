@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+
+from importer import CsvImporter, MAX_PENDING_CHUNKS, iter_csv_chunks, infer_column_types, NUMERIC, DATE, TEXT
+from model import SheetModel
+from jobs import sum_all_job, Job
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "data.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def load(path, **kwargs):
+    m = SheetModel(1000, 50)
+    m.begin_import()
+    for r0, block, text_cells, col_types, _ in iter_csv_chunks(path, **kwargs):
+        m.apply_block(r0, block, text_cells, col_types)
+    return m
+
+
+def test_numbers_in_a_text_column_stay_numbers(tmp_path):
+    path = write_csv(tmp_path, "name,qty\nx,1\n5,2\n7,3\ny,4\nz,5\n")
+    assert infer_column_types([["x"], ["5"], ["7"], ["y"], ["z"]], 1) == [TEXT]
+    m = load(path)
+    assert m.values[2, 0] == 5.0 and m.values[3, 0] == 7.0
+    assert m.text[(1, 0)] == "x" and (2, 0) not in m.text
+    assert sum_all_job(m.values)(Job(0, "test", None, None)) == 12.0 + 15.0
+
+
+def test_type_is_not_fixed_by_the_first_chunk(tmp_path):
+    path = write_csv(tmp_path, "a\n" + "1\n" * 10 + "hello\n" + "x\n" * 10 + "2\n")
+    m = load(path, chunk_rows=5)
+    assert m.values[22, 0] == 2.0
+    assert m.text[(11, 0)] == "hello" and m.text[(21, 0)] == "x"
+
+
+def test_zeros_are_values_and_blanks_and_labels_are_empty(tmp_path):
+    path = write_csv(tmp_path, "v\n0\n\n4\nn/a\n")
+    m = load(path)
+    m.set_input(0, 5, "=COUNT(A2:A5)")
+    m.set_input(1, 5, "=AVERAGE(A2:A5)")
+    assert m.values[0, 5] == 2.0 and m.values[1, 5] == 2.0
+
+
+def test_dates_and_numbers_in_a_date_column(tmp_path):
+    path = write_csv(tmp_path, "d\n" + "".join(f"2024-01-0{i}\n" for i in range(1, 10)) + "45000\n")
+    m = load(path)
+    assert infer_column_types([["2024-01-01"], ["2024-01-02"]], 1) == [DATE]
+    assert m.values[1, 0] == 45292.0 and m.values[10, 0] == 45000.0
+    assert m.column_formats == {0: "date"}
+
+
+def test_mixed_chunk_masks(tmp_path):
+    path = write_csv(tmp_path, "1,a\n,2\n")
+    (_, block, text_cells, col_types, _), = iter_csv_chunks(path)
+    np.testing.assert_array_equal(np.ma.getmaskarray(block), [[False, True], [True, False]])
+    assert text_cells == {(0, 1): "a"} and col_types[0] == NUMERIC
+
+
+def test_importer_waits_for_the_consumer(tmp_path):
+    path = write_csv(tmp_path, "v\n" + "1\n" * 100)
+    chunks, done = [], []
+    importer = CsvImporter(path, on_chunk=lambda *chunk: chunks.append(chunk), on_progress=lambda p: None,
+                           on_done=lambda *res: done.append(res), chunk_rows=10)
+    importer.start()
+    time.sleep(0.3)
+    assert len(chunks) == MAX_PENDING_CHUNKS and not done
+    released = 0
+    while importer.is_alive() or released < len(chunks):
+        if released < len(chunks):        # Like the app: one chunk_done per chunk received
+            importer.chunk_done()
+            released += 1
+        importer.join(0.01)
+    assert len(chunks) == 11 and done == [(101, False, None)]
@@ -0,0 +1,38 @@
+import numpy as np
+
+from model import SheetModel
+from recovery import RecoveryJournal
+
+CELLS = {(0, 0): "0", (1, 0): "0", (2, 0): "4",
+         (0, 1): "=COUNT(A1:A10)", (1, 1): "=MIN(A1:A10)", (2, 1): "=AVERAGE(A1:A10)"}
+
+
+def results(m):
+    return [m.display_text(r, c) for r in range(3) for c in range(2)]
+
+
+def test_checkpoint_restore_keeps_typed_zeros(tmp_path):
+    m = SheetModel(1000, 100)
+    for cell, raw in CELLS.items():
+        m.set_input(*cell, raw)
+    journal = RecoveryJournal(str(tmp_path))
+    journal.request_checkpoint(m.recovery_state())
+    journal.flush()
+    m.set_input(3, 0, "0")                # Journaled after the checkpoint
+    journal.record_edit(3, 0, "0")
+    journal.flush()
+
+    restored = SheetModel(1000, 100)
+    assert journal.restore(restored) == 1
+    assert results(restored) == results(m)
+    assert restored.display_text(1, 1) == "0" and restored.display_text(0, 1) == "4"
+    assert restored.values.is_filled(0, 0) and not restored.values.is_filled(4, 0)
+
+
+def test_dense_matrix_load_populates_zeros():
+    m = SheetModel(100, 10)
+    m.load_matrix(np.array([[0.0, 2.0], [0.0, 0.0]]))
+    m.set_input(0, 5, "=COUNT(A1:B2)")
+    m.set_input(1, 5, "=MIN(A1:B2)")
+    assert m.display_text(0, 5) == "4" and m.display_text(1, 5) == "0"
+    assert m.display_text(1, 1) == "0"
@@ -0,0 +1,41 @@
+import numpy as np
+
+from store import CellStore
+
+
+def test_zero_bulk_writes_are_empty_but_masked_arrays_say_which_cells_are_populated():
+    s = CellStore(1000, 100)
+    s[:3, :2] = np.array([[1.0, 0.0], [0.0, 2.0], [0.0, 0.0]])
+    assert s.read_masked(0, 3, 0, 2).count() == 2
+    s[:2, :2] = np.ma.MaskedArray(np.zeros((2, 2)), mask=[[False, True], [True, True]])
+    assert s.is_filled(0, 0) and not s.is_filled(1, 1)
+    assert s.read_masked(0, 3, 0, 2).count() == 1
+
+
+def test_erasing_the_last_populated_cell_frees_its_block():
+    s = CellStore(1000, 100)
+    s[5, 5] = 0.0
+    assert s.is_filled(5, 5) and len(s.blocks) == 1
+    s.erase(5, 5)
+    assert not s.blocks and not s.filled
+
+
+def test_snapshot_is_unaffected_by_later_writes():
+    s = CellStore(100_000, 64)
+    s[:1000, :10] = 1.0
+    snap = s.snapshot()
+    s[0, 0] = 5.0
+    s[50_000, 3] = 2.0
+    s[:1000, :10] = 0.0
+    assert snap[0, 0] == 1.0 and snap.read(0, 1000, 0, 10).sum() == 10_000
+    assert snap.extent() == (1000, 10) and len(snap.items()) == 16
+    assert s[0, 0] == 0.0 and s.extent() == (50_001, 4)
+
+
+def test_extent_and_items_follow_populated_cells():
+    s = CellStore(1000, 100)
+    s[700, 90] = 0.0
+    s[10, 1] = 3.0
+    assert s.extent() == (701, 91)
+    (_, block), = [item for item in s.items(masked=True) if item[0] == (0, 0)]
+    assert block.count() == 1
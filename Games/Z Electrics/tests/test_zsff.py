@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pytest
+
+import zsff
+from model import SheetModel
+from store import CellStore
+from zsff import ZsffReader, ZsffError, write_zsff, update_zsff, TILE_ROWS, TILE_COLS
+
+
+def read_back(path):
+    with ZsffReader(path) as reader:
+        out = reader.read_into(np.zeros(reader.shape))
+        return out, dict(reader.formulas), dict(reader.text)
+
+
+@pytest.fixture
+def saved(tmp_path):
+    values = CellStore(2000, 300)
+    values[0, 0] = 1.0
+    values[1000, 200] = 2.0
+    path = str(tmp_path / "sheet.zsff")
+    write_zsff(path, values, {(5, 5): "=A1"}, {(6, 6): "label"})
+    return path, values
+
+
+def test_incremental_save_matches_a_full_write(saved, tmp_path):
+    path, values = saved
+    values[0, 1] = 3.0                    # Existing tile
+    values[1999, 299] = 4.0               # New tile
+    values.erase(1000, 200)               # Tile becomes empty
+    dirty = {(0, 0), (1999 // TILE_ROWS, 299 // TILE_COLS), (1000 // TILE_ROWS, 200 // TILE_COLS)}
+    update_zsff(path, values, dirty, {(7, 7): "=B1"}, {})
+    full = str(tmp_path / "full.zsff")
+    write_zsff(full, values, {(7, 7): "=B1"}, {})
+    got, want = read_back(path), read_back(full)
+    np.testing.assert_array_equal(got[0], want[0])
+    assert got[1:] == want[1:] == ({(7, 7): "=B1"}, {})
+    with ZsffReader(path) as reader:
+        assert reader.verify() == [] and len(reader.tiles) == 2
+
+
+def test_crash_before_the_header_leaves_the_previous_version(saved, monkeypatch):
+    path, values = saved
+    before = read_back(path)
+    values[0, 0] = 9.0
+
+    def crash(*args):
+        raise OSError("power cut")
+    monkeypatch.setattr(zsff, "_header", crash)
+    with pytest.raises(OSError):
+        update_zsff(path, values, {(0, 0)}, {}, {})
+    after = read_back(path)
+    np.testing.assert_array_equal(after[0], before[0])
+    assert after[1:] == before[1:]
+
+
+def test_dead_space_forces_a_full_write(saved):
+    path, values = saved
+    live = os.path.getsize(path)
+    with pytest.raises(ZsffError):
+        for i in range(10):
+            values[0, 0] = i + 1.0
+            update_zsff(path, values, {(0, 0)}, {}, {})
+    assert os.path.getsize(path) < 3 * live
+    write_zsff(path, values)
+    assert os.path.getsize(path) <= live
+
+
+def test_typed_zeros_survive_save_and_load(tmp_path):
+    m = SheetModel(2000, 300)
+    for cell, raw in {(0, 0): "0", (1, 0): "0", (2, 0): "4", (1500, 250): "0",
+                      (0, 1): "=COUNT(A1:A10)", (1, 1): "=MIN(A1:A10)", (2, 1): "=AVERAGE(A1:A10)"}.items():
+        m.set_input(*cell, raw)
+    before = [m.display_text(r, 1) for r in range(3)]
+    path = str(tmp_path / "sheet.zsff")
+    write_zsff(path, m.values, m.formulas, m.text, m.meta())
+    loaded = SheetModel(2000, 300)
+    with ZsffReader(path) as reader:
+        assert len(reader.tiles) == 2     # The tile holding only a typed 0 is stored
+        loaded.load_zsff(reader)
+    assert [loaded.display_text(r, 1) for r in range(3)] == before == ["3", "0", "1.333333333"]
+    assert loaded.display_text(0, 0) == loaded.display_text(1500, 250) == "0"
+    assert loaded.display_text(3, 0) == ""
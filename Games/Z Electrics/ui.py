@@ -9,8 +9,8 @@ Dependencies: CustomTkinter, NumPy, PIL
 import customtkinter as cctk
 import tkinter as tk
 from typing import List, Tuple, Optional, Any
-import numpy as np
 from logs import telemetry  # [FIX 1] Added Telemetry Link
+from calc import index_to_col
 
 # --- ZEGA CORPORATE DESIGN LANGUAGE ---
 class ZegaTheme:
@@ -27,48 +27,41 @@ class ZegaTheme:
     FONT_TINY = ("Consolas", 10)
 
 # -----------------------------------------------------------------------------
-# COMPONENT: THE REACTIVE CELL
+# COMPONENT: THE FLOATING CELL EDITOR
 # -----------------------------------------------------------------------------
-class ZegaCell(cctk.CTkEntry):
-    def __init__(self, master_grid, row: int, col: int, **kwargs):
+class ZegaCellEditor(cctk.CTkEntry):
+    """
+    The one and only entry widget of the grid. It is parked over whichever
+    cell is active, so the sheet costs one widget no matter how large it is.
+    """
+    def __init__(self, master_grid, **kwargs):
         super().__init__(
-            master_grid,
-            width=110,
-            height=30,
+            master_grid.canvas,
+            width=ZegaGrid.CELL_W - 2,
+            height=ZegaGrid.CELL_H - 2,
             corner_radius=0,
-            fg_color=ZegaTheme.SURFACE,
-            border_color=ZegaTheme.BORDER,
-            border_width=1,
+            fg_color=ZegaTheme.SURFACE_2,
+            border_color=ZegaTheme.PRIMARY,
+            border_width=2,
             text_color=ZegaTheme.PRIMARY,
             font=ZegaTheme.FONT_BODY,
             placeholder_text="",
             **kwargs
         )
-        self.row = row
-        self.col = col
         self.master_grid = master_grid
-        
+
         # High-Speed Event Bindings
-        self.bind("<FocusIn>", self._on_focus_acquire)
-        self.bind("<FocusOut>", self._on_focus_loss)
-        self.bind("<Return>", self._on_commit)
+        self.bind("<FocusOut>", lambda e: self.master_grid.commit_edit())
+        self.bind("<Return>", lambda e: self.master_grid.move_active(1, 0))
+        self.bind("<Tab>", lambda e: self.master_grid.move_active(0, 1) or "break")
+        self.bind("<Up>", lambda e: self.master_grid.move_active(-1, 0))
+        self.bind("<Down>", lambda e: self.master_grid.move_active(1, 0))
+        self.bind("<Escape>", lambda e: self.master_grid.cancel_edit())
         self.bind("<Button-3>", self._on_context_menu)
 
-    def _on_focus_acquire(self, event):
-        self.configure(border_color=ZegaTheme.PRIMARY, border_width=2, fg_color=ZegaTheme.SURFACE_2)
-        # [FIX 2] Use Direct Controller Link
-        self.master_grid.controller.on_cell_select(self.row, self.col, self.get())
-
-    def _on_focus_loss(self, event):
-        self.configure(border_color=ZegaTheme.BORDER, border_width=1, fg_color=ZegaTheme.SURFACE)
-        # [FIX 2] Use Direct Controller Link
-        self.master_grid.controller.on_cell_edit(self.row, self.col, self.get())
-
-    def _on_commit(self, event):
-        self.master_grid.navigate(self.row + 1, self.col)
-
     def _on_context_menu(self, event):
-        telemetry.log("info", f"Context menu requested at {self.row}:{self.col}")
+        r, c = self.master_grid.active
+        telemetry.log("info", f"Context menu requested at {r}:{c}")
 
     def inject_value(self, val: str):
         self.delete(0, 'end')
@@ -109,8 +102,7 @@ class ZegaFormulaBar(cctk.CTkFrame):
         self.entry.bind("<Return>", self._sync_to_cell)
 
     def update_target(self, row_idx, col_idx, content):
-        col_char = chr(65 + (col_idx % 26))
-        self.coord_lbl.configure(text=f"{col_char}{row_idx+1}")
+        self.coord_lbl.configure(text=f"{index_to_col(col_idx)}{row_idx+1}")
         self.entry.delete(0, 'end')
         self.entry.insert(0, content)
         self.current_target = (row_idx, col_idx)
@@ -191,6 +183,7 @@ class ZegaRibbon(cctk.CTkFrame):
     def _render_cpp_tools(self):
         self._quick_btn("SUM ALL", "sum")
         self._quick_btn("SCALE 1.5x", "scale")
+        self._quick_btn("FORECAST", "forecast")
         self._quick_btn("GENERATE REPORT", "report")
 
     def _quick_btn(self, text, action_key):
@@ -209,70 +202,271 @@ class ZegaRibbon(cctk.CTkFrame):
 # -----------------------------------------------------------------------------
 # COMPONENT: THE INFINITE SCROLL GRID
 # -----------------------------------------------------------------------------
-class ZegaGrid(cctk.CTkScrollableFrame):
-    def __init__(self, master, rows, cols, controller, **kwargs):
+class ZegaGrid(cctk.CTkFrame):
+    """
+    Virtualized sheet viewport. Only the cells that fit on screen exist, as a
+    fixed pool of canvas items that is re-labelled when the view scrolls, so
+    scrolling and memory cost are independent of the sheet size.
+    """
+    CELL_W = 112
+    CELL_H = 32
+    HEADER_H = 27
+    ROW_HEADER_W = 56
+    CELL_CHARS = 12  # Visible characters per cell at FONT_BODY
+
+    def __init__(self, master, model, controller, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
-        self.rows = rows
-        self.cols = cols
+        self.model = model            # Cell contents are read from the sheet model
+        self.rows = model.rows
+        self.cols = model.cols
         self.controller = controller  # [FIX 2] Direct Controller Reference
-        self.cells = [] 
-        
-        self._build_headers()
-        self._build_matrix()
-
-    def _build_headers(self):
-        cctk.CTkLabel(self, text="", width=40).grid(row=0, column=0)
-        for c in range(self.cols):
-            char = chr(65 + (c % 26))
-            lbl = cctk.CTkButton(
-                self, 
-                text=char, 
-                width=110, 
-                height=25,
-                fg_color=ZegaTheme.SURFACE, 
-                hover_color=ZegaTheme.BORDER,
-                text_color=ZegaTheme.TEXT_DIM,
-                corner_radius=0
-            )
-            lbl.grid(row=0, column=c+1, padx=1)
-
-    def _build_matrix(self):
-        for r in range(self.rows):
-            cctk.CTkButton(
-                self, 
-                text=str(r+1), 
-                width=40, 
-                fg_color=ZegaTheme.SURFACE, 
-                text_color=ZegaTheme.TEXT_DIM,
-                hover_color=ZegaTheme.BORDER,
-                corner_radius=0
-            ).grid(row=r+1, column=0, pady=1)
 
-            row_cells = []
-            for c in range(self.cols):
-                cell = ZegaCell(self, r, c)
-                cell.grid(row=r+1, column=c+1, padx=1, pady=1)
-                row_cells.append(cell)
-            self.cells.append(row_cells)
+        self.top_row = 0
+        self.left_col = 0
+        self.active = None
+        self.editing = False          # Editor is parked over the active cell
+        self._vis_rows = 0
+        self._vis_cols = 0
+        self._cell_items = []     # [slot_row][slot_col] -> (rect_id, text_id)
+        self._drawn = []          # [slot_row][slot_col] -> text currently on the canvas
+        self._repaint_pending = False
+        self._row_items = []      # slot_row -> (rect_id, text_id)
+        self._col_items = []      # slot_col -> (rect_id, text_id)
+
+        self.canvas = tk.Canvas(self, bg=ZegaTheme.BACKGROUND, highlightthickness=0)
+        self.v_scroll = cctk.CTkScrollbar(self, orientation="vertical", command=self._on_vscroll)
+        self.h_scroll = cctk.CTkScrollbar(self, orientation="horizontal", command=self._on_hscroll)
+        self.v_scroll.pack(side="right", fill="y")
+        self.h_scroll.pack(side="bottom", fill="x")
+        self.canvas.pack(side="left", expand=True, fill="both")
+
+        self.editor = ZegaCellEditor(self)
+
+        self.canvas.bind("<Configure>", self._build_pool)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll_by(-int(e.delta / 120) * 3, 0))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.scroll_by(0, -int(e.delta / 120)))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_by(-3, 0))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_by(3, 0))
+
+    # --- ITEM POOL ---
+    def _build_pool(self, event=None):
+        vis_rows = max(1, (self.canvas.winfo_height() - self.HEADER_H) // self.CELL_H + 1)
+        vis_cols = max(1, (self.canvas.winfo_width() - self.ROW_HEADER_W) // self.CELL_W + 1)
+        if (vis_rows, vis_cols) == (self._vis_rows, self._vis_cols):
+            return
+        self._vis_rows, self._vis_cols = vis_rows, vis_cols
+        self.canvas.delete("all")
+
+        cv = self.canvas
+        self._cell_items = []
+        for i in range(vis_rows):
+            y = self.HEADER_H + i * self.CELL_H
+            slots = []
+            for j in range(vis_cols):
+                x = self.ROW_HEADER_W + j * self.CELL_W
+                rect = cv.create_rectangle(x, y, x + self.CELL_W, y + self.CELL_H,
+                                           fill=ZegaTheme.SURFACE, outline=ZegaTheme.BORDER)
+                text = cv.create_text(x + 6, y + self.CELL_H // 2, anchor="w",
+                                      fill=ZegaTheme.PRIMARY, font=ZegaTheme.FONT_BODY)
+                slots.append((rect, text))
+            self._cell_items.append(slots)
+        self._drawn = [[None] * vis_cols for _ in range(vis_rows)]
+
+        self._row_items = []
+        for i in range(vis_rows):
+            y = self.HEADER_H + i * self.CELL_H
+            rect = cv.create_rectangle(0, y, self.ROW_HEADER_W, y + self.CELL_H,
+                                       fill=ZegaTheme.SURFACE, outline=ZegaTheme.BORDER)
+            text = cv.create_text(self.ROW_HEADER_W // 2, y + self.CELL_H // 2,
+                                  fill=ZegaTheme.TEXT_DIM, font=ZegaTheme.FONT_TINY)
+            self._row_items.append((rect, text))
+
+        self._col_items = []
+        for j in range(vis_cols):
+            x = self.ROW_HEADER_W + j * self.CELL_W
+            rect = cv.create_rectangle(x, 0, x + self.CELL_W, self.HEADER_H,
+                                       fill=ZegaTheme.SURFACE, outline=ZegaTheme.BORDER)
+            text = cv.create_text(x + self.CELL_W // 2, self.HEADER_H // 2,
+                                  fill=ZegaTheme.TEXT_DIM, font=ZegaTheme.FONT_TINY)
+            self._col_items.append((rect, text))
+        cv.create_rectangle(0, 0, self.ROW_HEADER_W, self.HEADER_H,
+                            fill=ZegaTheme.SURFACE, outline=ZegaTheme.BORDER)
+        self.redraw()
+
+    # --- RENDERING ---
+    def redraw(self):
+        """Re-labels the item pool for the current viewport: O(visible cells)."""
+        cv = self.canvas
+        for i, (rect, text) in enumerate(self._row_items):
+            r = self.top_row + i
+            state = "normal" if r < self.rows else "hidden"
+            cv.itemconfigure(rect, state=state)
+            cv.itemconfigure(text, state=state, text=str(r + 1))
+        for j, (rect, text) in enumerate(self._col_items):
+            c = self.left_col + j
+            state = "normal" if c < self.cols else "hidden"
+            cv.itemconfigure(rect, state=state)
+            cv.itemconfigure(text, state=state, text=index_to_col(c))
+        for i, slots in enumerate(self._cell_items):
+            r = self.top_row + i
+            for j, (rect, text) in enumerate(slots):
+                c = self.left_col + j
+                if r < self.rows and c < self.cols:
+                    cv.itemconfigure(rect, state="normal")
+                    cv.itemconfigure(text, state="normal")
+                    self._paint_slot(i, j, self._display(r, c))
+                else:
+                    cv.itemconfigure(rect, state="hidden")
+                    cv.itemconfigure(text, state="hidden")
+        self._place_editor()
+        self._sync_scrollbars()
+
+    def _display(self, r, c):
+        return self.model.display_text(r, c)[:self.CELL_CHARS]
+
+    def _slot(self, r, c):
+        i, j = r - self.top_row, c - self.left_col
+        if 0 <= i < self._vis_rows and 0 <= j < self._vis_cols:
+            return i, j
+        return None
+
+    def _paint_slot(self, i, j, text):
+        if self._drawn[i][j] != text:
+            self._drawn[i][j] = text
+            self.canvas.itemconfigure(self._cell_items[i][j][1], text=text)
+
+    def _redraw_cell(self, r, c):
+        slot = self._slot(r, c)
+        if slot:
+            self._paint_slot(slot[0], slot[1], self._display(r, c))
+
+    def _place_editor(self):
+        slot = self._slot(*self.active) if self.active else None
+        if slot is None:
+            if self.editing:
+                self.commit_edit()
+                self._hide_editor()
+                self.canvas.focus_set()
+            return
+        x = self.ROW_HEADER_W + slot[1] * self.CELL_W + 1
+        y = self.HEADER_H + slot[0] * self.CELL_H + 1
+        if not self.editing:
+            self.editor.inject_value(self.model.edit_text(*self.active))
+            self.editing = True
+        self.editor.place(x=x, y=y)
+
+    def _hide_editor(self):
+        self.editor.place_forget()
+        self.editing = False
+
+    # --- SCROLLING ---
+    def _sync_scrollbars(self):
+        self.v_scroll.set(self.top_row / self.rows, min(1.0, (self.top_row + self._vis_rows) / self.rows))
+        self.h_scroll.set(self.left_col / self.cols, min(1.0, (self.left_col + self._vis_cols) / self.cols))
+
+    def scroll_to(self, top_row, left_col):
+        top_row = max(0, min(top_row, self.rows - self._vis_rows + 1))
+        left_col = max(0, min(left_col, self.cols - self._vis_cols + 1))
+        if (top_row, left_col) != (self.top_row, self.left_col):
+            self.top_row, self.left_col = top_row, left_col
+            self.redraw()
+
+    def scroll_by(self, d_rows, d_cols):
+        self.scroll_to(self.top_row + d_rows, self.left_col + d_cols)
+
+    def _scroll_target(self, args, pos, total, page):
+        if args[0] == "moveto":
+            return int(float(args[1]) * total)
+        step = int(args[1]) * (page if args[2] == "pages" else 1)
+        return pos + step
+
+    def _on_vscroll(self, *args):
+        self.scroll_to(self._scroll_target(args, self.top_row, self.rows, self._vis_rows - 1), self.left_col)
+
+    def _on_hscroll(self, *args):
+        self.scroll_to(self.top_row, self._scroll_target(args, self.left_col, self.cols, self._vis_cols - 1))
+
+    def ensure_visible(self, r, c):
+        if not self._vis_rows:
+            return
+        top, left = self.top_row, self.left_col
+        if r < top:
+            top = r
+        elif r >= top + self._vis_rows - 1:
+            top = r - self._vis_rows + 2
+        if c < left:
+            left = c
+        elif c >= left + self._vis_cols - 1:
+            left = c - self._vis_cols + 2
+        self.scroll_to(top, left)
+
+    # --- EDITING ---
+    def _on_click(self, event):
+        if event.x < self.ROW_HEADER_W or event.y < self.HEADER_H:
+            return
+        r = self.top_row + (event.y - self.HEADER_H) // self.CELL_H
+        c = self.left_col + (event.x - self.ROW_HEADER_W) // self.CELL_W
+        self.navigate(r, c)
 
     def navigate(self, r, c):
-        if 0 <= r < self.rows and 0 <= c < self.cols:
-            self.cells[r][c].focus_set()
-
-    def set_cell_value(self, r, c, val):
-        self.cells[r][c].inject_value(val)
-
-    def get_all_data_array(self):
-        data = np.zeros((self.rows, self.cols))
-        for r in range(self.rows):
-            for c in range(self.cols):
-                try:
-                    val = self.cells[r][c].get()
-                    if val == "": val = 0.0
-                    data[r, c] = float(val)
-                except ValueError:
-                    data[r, c] = 0.0 
-        return data
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return
+        self.commit_edit()
+        self._hide_editor()
+        self.active = (r, c)
+        self.ensure_visible(r, c)
+        self._place_editor()
+        self.editor.focus_set()
+        self.controller.on_cell_select(r, c, self.model.edit_text(r, c))
+
+    def move_active(self, d_rows, d_cols):
+        if self.active:
+            self.navigate(self.active[0] + d_rows, self.active[1] + d_cols)
+
+    def commit_edit(self):
+        """Pushes the editor text into the sheet if it changed."""
+        if not self.editing:
+            return
+        r, c = self.active
+        text = self.editor.get()
+        if text != self.model.edit_text(r, c):
+            self.controller.on_cell_edit(r, c, text)
+
+    def cancel_edit(self):
+        if self.active:
+            self.editor.inject_value(self.model.edit_text(*self.active))
+
+    # --- MODEL SYNC ---
+    def request_repaint(self):
+        """Schedules one repaint for the next idle cycle, however many edits arrive first."""
+        if not self._repaint_pending:
+            self._repaint_pending = True
+            self.after_idle(self._repaint)
+
+    def _repaint(self):
+        """Drains the model's dirty region, touching only visible cells whose text changed."""
+        self._repaint_pending = False
+        everything, cells, rects = self.model.dirty.drain()
+        if everything:
+            self.redraw()
+            if self.editing:
+                self.editor.inject_value(self.model.edit_text(*self.active))
+            return
+
+        for r, c in cells:
+            self._redraw_cell(r, c)
+        bottom = min(self.rows, self.top_row + self._vis_rows) - 1
+        right = min(self.cols, self.left_col + self._vis_cols) - 1
+        for r0, c0, r1, c1 in rects:
+            for r in range(max(r0, self.top_row), min(r1, bottom) + 1):
+                for c in range(max(c0, self.left_col), min(c1, right) + 1):
+                    self._redraw_cell(r, c)
+
+        if self.editing:
+            r, c = self.active
+            if self.active in cells or any(r0 <= r <= r1 and c0 <= c <= c1 for r0, c0, r1, c1 in rects):
+                self.editor.inject_value(self.model.edit_text(r, c))
 
 # -----------------------------------------------------------------------------
 # COMPONENT: STATUS TELEMETRY FOOTER
@@ -288,28 +482,76 @@ class ZegaStatusBar(cctk.CTkFrame):
         self.stats_lbl = cctk.CTkLabel(self, text="AVG: 0.0 | SUM: 0.0 | COUNT: 0", text_color="#666", font=ZegaTheme.FONT_TINY)
         self.stats_lbl.pack(side="right", padx=10)
 
+        self.metrics_lbl = cctk.CTkLabel(self, text="", text_color=ZegaTheme.TEXT_DIM, font=ZegaTheme.FONT_TINY)
+        self.metrics_lbl.pack(side="right", padx=10)
+
+        # Background task progress (hidden until show_task)
+        self.task_bar = cctk.CTkProgressBar(self, width=160, height=8, progress_color=ZegaTheme.PRIMARY)
+        self.task_cancel = cctk.CTkButton(self, text="CANCEL", width=60, height=18, font=ZegaTheme.FONT_TINY,
+                                          fg_color=ZegaTheme.SURFACE, hover_color="#330000",
+                                          text_color=ZegaTheme.TEXT_DIM, command=self._cancel_task)
+        self._on_cancel = None
+        self._task_owner = None
+
+    def show_task(self, label, on_cancel=None, owner=None):
+        """Shows progress for one background task; `owner` keeps overlapping tasks apart."""
+        self.set_msg(label)
+        self._on_cancel = on_cancel
+        self._task_owner = owner
+        self.task_bar.set(0)
+        self.task_bar.pack(side="left", padx=10)
+        if on_cancel:
+            self.task_cancel.pack(side="left")
+        else:
+            self.task_cancel.pack_forget()
+
+    def update_task(self, fraction, owner=None):
+        if owner == self._task_owner:
+            self.task_bar.set(fraction)
+
+    def end_task(self, owner=None):
+        if owner != self._task_owner:
+            return
+        self._on_cancel = None
+        self._task_owner = None
+        self.task_bar.pack_forget()
+        self.task_cancel.pack_forget()
+
+    def _cancel_task(self):
+        if self._on_cancel:
+            self._on_cancel()
+        self.set_msg("CANCELLING...")
+
     def set_msg(self, msg):
         self.status_lbl.configure(text=msg.upper())
 
     def update_stats(self, avg, total, count):
         self.stats_lbl.configure(text=f"AVG: {avg:.2f} | SUM: {total:.2f} | COUNT: {count}")
 
+    def update_metrics(self, summary):
+        self.metrics_lbl.configure(text=summary.upper())
+
 # -----------------------------------------------------------------------------
 # MASTER LAYOUT CONTROLLER
 # -----------------------------------------------------------------------------
+METRICS_REFRESH_MS = 1000
+LIVE_METRICS = ("cell.update", "formula.eval", "cpp.sum_all", "cpp.scale")
+
 class ZegaInterface(cctk.CTkFrame):
-    def __init__(self, master_app, rows, cols, theme_color):
+    def __init__(self, master_app, model, theme_color):
         super().__init__(master_app, fg_color=ZegaTheme.BACKGROUND)
         self.app = master_app
-        self.rows = rows
-        self.cols = cols
+        self.model = model
+        self.rows = model.rows
+        self.cols = model.cols
         
         self.callbacks = {
             "save": lambda: self.app.trigger_file_io("save"),
             "load": lambda: self.app.trigger_file_io("load"),
-            "sum": lambda: telemetry.log("info", "Sum engine triggered"),
-            "scale": lambda: telemetry.log("info", "Scale engine triggered"),
+            "sum": lambda: self.app.run_cpp_engine("SUM_ALL"),
+            "scale": lambda: self.app.run_cpp_engine("SCALE"),
             "sanitize": lambda: self.update_status("Sanitizing Data..."),
+            "forecast": self.app.run_forecast,
             "report": lambda: self.update_status("Generating PDF..."),
         }
 
@@ -326,34 +568,42 @@ class ZegaInterface(cctk.CTkFrame):
         self.status_bar.pack(side="bottom", fill="x")
 
         # 4. The Grid (Passed 'self' as controller)
-        self.grid_engine = ZegaGrid(self, rows, cols, controller=self)
+        self.grid_engine = ZegaGrid(self, model, controller=self)
         self.grid_engine.pack(side="top", expand=True, fill="both", padx=0, pady=0)
 
+        self.after(METRICS_REFRESH_MS, self._refresh_metrics)
+
+    def _refresh_metrics(self):
+        """Live p50/p95/p99 of the hot paths, refreshed once a second."""
+        self.status_bar.update_metrics(telemetry.summary_line(LIVE_METRICS))
+        self.after(METRICS_REFRESH_MS, self._refresh_metrics)
+
     def on_cell_select(self, r, c, val):
         self.formula_bar.update_target(r, c, val)
-        try:
-            v = float(val) if val else 0.0
-            self.status_bar.update_stats(v, v, 1)
-        except:
-            self.status_bar.update_stats(0, 0, 1)
+        v = float(self.model.values[r, c])
+        self.status_bar.update_stats(v, v, 1)
         telemetry.log("info", f"Cell Select: [{r}, {c}]")
 
     def on_cell_edit(self, r, c, val):
         self.app.process_cell_update(r, c, val)
 
     def update_grid_cell(self, r, c, val):
-        self.grid_engine.set_cell_value(r, c, val)
         self.app.process_cell_update(r, c, val)
 
-    def populate_grid(self, data_matrix):
-        rows, cols = data_matrix.shape
-        for r in range(rows):
-            for c in range(cols):
-                if r < self.rows and c < self.cols:
-                    self.grid_engine.set_cell_value(r, c, data_matrix[r, c])
+    def populate_grid(self):
+        self.grid_engine.request_repaint()
 
     def get_all_cell_data(self):
-        return self.grid_engine.get_all_data_array()
+        return self.model.values
 
     def update_status(self, msg):
-        self.status_bar.set_msg(msg)
\ No newline at end of file
+        self.status_bar.set_msg(msg)
+
+    def show_task(self, label, on_cancel=None, owner=None):
+        self.status_bar.show_task(label, on_cancel, owner)
+
+    def update_task(self, fraction, owner=None):
+        self.status_bar.update_task(fraction, owner)
+
+    def end_task(self, owner=None):
+        self.status_bar.end_task(owner)
\ No newline at end of file
@@ -0,0 +1,342 @@
+"""
+ZEGA ULTIMATE SPREADSHEET - ZSFF v3 CONTAINER
+Version: 2026.2.0
+Owner: ZEGA MegaHQ
+Architect: ZEGA Lead Developer
+
+On-disk layout (all integers little-endian):
+
+    [header, padded to 4096 bytes]
+    [tile][tile]...          fixed-size TILE_ROWS x TILE_COLS float64 blocks,
+                             each followed by its packed filled-cell bitmask
+    [tile index]             one record per stored tile
+    [string section]         UTF-8 JSON: formulas, text labels, metadata
+
+Only tiles holding a populated cell are stored; absent tiles read as empty.
+The bitmask keeps a typed 0 apart from an empty cell, so COUNT, MIN and
+AVERAGE give the same results after a reload.
+Incremental saves never overwrite live data: rewritten tiles, a new index
+and a new string section are appended and made durable before the header is
+repointed at them, so a crash leaves the previous version intact. The dead
+space this leaves behind is reclaimed by the next full write.
+Every tile carries its own 64-bit BLAKE2b checksum in the index. Tiles are
+read through np.memmap, so opening a file and diffing indexes cost nothing
+per tile; loading a sheet still copies and verifies every stored tile.
+Version 2 files (no bitmasks: non-zero cells are the populated ones) and
+version 1 files (plain np.save output) are still readable.
+"""
+
+import os
+import json
+import struct
+import hashlib
+import numpy as np
+
+ZSFF_MAGIC = b"ZSFF"
+ZSFF_VERSION = 3
+READABLE_VERSIONS = (2, 3)
+NPY_MAGIC = b"\x93NUMPY"
+DTYPE_F64 = 1
+
+TILE_ROWS = 256
+TILE_COLS = 64
+DATA_OFFSET = 4096
+MAX_DEAD_RATIO = 1.0    # Incremental saves give way to a full write once dead space exceeds the live data
+
+HEADER = struct.Struct("<4sHHQQIIQQQQ")
+INDEX_DTYPE = np.dtype([("ti", "<u4"), ("tj", "<u4"), ("offset", "<u8"), ("checksum", "<u8")])
+
+
+class ZsffError(Exception):
+    pass
+
+
+def tile_checksum(record):
+    """Checksum of a tile record: the float64 data and, from v3 on, its bitmask."""
+    return int.from_bytes(hashlib.blake2b(record, digest_size=8).digest(), "little")
+
+
+def _mask_bytes(tile_rows, tile_cols):
+    """Bitmask size after a tile's data, padded so the next tile stays 8-byte aligned."""
+    return -(-tile_rows * tile_cols // 64) * 8
+
+
+def _record_bytes(tile_rows, tile_cols, version=ZSFF_VERSION):
+    data = tile_rows * tile_cols * 8
+    return data + _mask_bytes(tile_rows, tile_cols) if version >= 3 else data
+
+
+def tile_grid(rows, cols, tile_rows=TILE_ROWS, tile_cols=TILE_COLS):
+    return -(-rows // tile_rows), -(-cols // tile_cols)
+
+
+def _tile_block(values, ti, tj, tile_rows, tile_cols):
+    """
+    (block, filled) for the (ti, tj) tile of `values`, padded to full size at
+    the sheet edge. A CellStore supplies its filled mask; in a plain array the
+    non-zero cells are the populated ones.
+    """
+    rows, cols = values.shape
+    r0, c0 = ti * tile_rows, tj * tile_cols
+    r1, c1 = min(r0 + tile_rows, rows), min(c0 + tile_cols, cols)
+    if hasattr(values, "read_masked"):
+        src = values.read_masked(r0, r1, c0, c1)
+        src_filled, src = ~np.ma.getmaskarray(src), np.ma.getdata(src)
+    else:
+        src = values[r0:r1, c0:c1]
+        src_filled = src != 0
+    if src.shape == (tile_rows, tile_cols):
+        return np.ascontiguousarray(src, dtype="<f8"), src_filled
+    block = np.zeros((tile_rows, tile_cols), dtype="<f8")
+    filled = np.zeros((tile_rows, tile_cols), dtype=bool)
+    block[:r1 - r0, :c1 - c0] = src
+    filled[:r1 - r0, :c1 - c0] = src_filled
+    return block, filled
+
+
+def _tile_record(block, filled):
+    """On-disk bytes of a tile: its data, then its filled mask packed to bits and padded."""
+    bits = np.packbits(filled, axis=None).tobytes()
+    return block.tobytes() + bits.ljust(_mask_bytes(*block.shape), b"\0")
+
+
+def _strings_blob(formulas, text, meta):
+    return json.dumps({
+        "formulas": [[r, c, v] for (r, c), v in formulas.items()],
+        "text": [[r, c, v] for (r, c), v in text.items()],
+        "meta": meta or {},
+    }).encode("utf-8")
+
+
+def _index_digest(index):
+    return hashlib.blake2b(index.tobytes(), digest_size=16).hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# WRITER
+# -----------------------------------------------------------------------------
+def _prepare_tile(values, key, tile_rows, tile_cols):
+    """(key, record, checksum) for a tile with a populated cell, else None. Safe to run on worker threads."""
+    block, filled = _tile_block(values, key[0], key[1], tile_rows, tile_cols)
+    if not filled.any():
+        return None
+    record = _tile_record(block, filled)
+    return key, record, tile_checksum(record)
+
+
+def write_zsff(path, values, formulas=None, text=None, meta=None,
+               tile_rows=TILE_ROWS, tile_cols=TILE_COLS, mapper=map, stream=None):
+    """
+    Writes a complete v3 file via temp file + atomic rename.
+    Tiles are prepared through `mapper` (pass an ordered parallel map to spread
+    the copy + checksum work over threads). If given, `stream(data)` sees every
+    byte from DATA_OFFSET to the end of the file, in file order.
+    Returns the hex digest of the tile index (a hash over all tile checksums).
+    """
+    rows, cols = values.shape
+    grid_r, grid_c = tile_grid(rows, cols, tile_rows, tile_cols)
+    tile_bytes = _record_bytes(tile_rows, tile_cols)
+    if hasattr(values, "tiles"):
+        keys = values.tiles(tile_rows, tile_cols)   # CellStore: skip tiles with no allocated block
+    else:
+        keys = [(ti, tj) for ti in range(grid_r) for tj in range(grid_c)]
+    records = []
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.seek(DATA_OFFSET)
+            offset = DATA_OFFSET
+            for prepared in mapper(lambda key: _prepare_tile(values, key, tile_rows, tile_cols), keys):
+                if prepared is None:
+                    continue
+                (ti, tj), data, checksum = prepared
+                f.write(data)
+                if stream:
+                    stream(data)
+                records.append((ti, tj, offset, checksum))
+                offset += tile_bytes
+            index = np.array(records, dtype=INDEX_DTYPE)
+            strings = _strings_blob(formulas or {}, text or {}, meta)
+            if stream:
+                stream(index.tobytes())
+                stream(strings)
+            _write_tail(f, offset, index, strings, rows, cols, tile_rows, tile_cols)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return _index_digest(index)
+
+
+def update_zsff(path, values, dirty_tiles, formulas=None, text=None, meta=None):
+    """
+    Saves `dirty_tiles` ((ti, tj) pairs) into an existing v3 file without
+    touching what its header points at: the tiles, a new index and the string
+    section are appended and fsynced, then the header is rewritten and
+    fsynced. Tiles that became empty are dropped from the index. Raises
+    ZsffError when a full write is needed instead (older version, shape
+    change, too much dead space).
+    """
+    with ZsffReader(path) as reader:
+        if reader.version != ZSFF_VERSION:
+            raise ZsffError(f"File is ZSFF v{reader.version}; a full write is required")
+        if reader.shape != values.shape:
+            raise ZsffError("Sheet shape changed; a full write is required")
+        tile_rows, tile_cols = reader.tile_shape
+        tiles = {k: list(v) for k, v in reader.tiles.items()}
+    tile_bytes = _record_bytes(tile_rows, tile_cols)
+    strings = _strings_blob(formulas or {}, text or {}, meta)
+
+    prepared = []
+    for key in sorted(dirty_tiles):
+        tile = _prepare_tile(values, key, tile_rows, tile_cols)
+        if tile is None:
+            tiles.pop(key, None)
+        else:
+            prepared.append(tile)
+
+    with open(path, "r+b") as f:
+        end = -(-f.seek(0, os.SEEK_END) // DATA_OFFSET) * DATA_OFFSET   # Appended tiles start page-aligned
+        stored = len(tiles.keys() | {key for key, _, _ in prepared})
+        live = DATA_OFFSET + stored * (tile_bytes + INDEX_DTYPE.itemsize) + len(strings)
+        if end - live > MAX_DEAD_RATIO * live:
+            raise ZsffError("Too much dead space from earlier incremental saves; a full write is required")
+        f.seek(end)
+        for key, record, checksum in prepared:
+            f.write(record)
+            tiles[key] = [end, checksum]
+            end += tile_bytes
+        index = np.array([(ti, tj, off, chk) for (ti, tj), (off, chk) in sorted(tiles.items())],
+                         dtype=INDEX_DTYPE)
+        f.write(index.tobytes())
+        f.write(strings)
+        f.flush()
+        os.fsync(f.fileno())      # Everything the new header points at is durable before it is written
+        f.seek(0)
+        f.write(_header(values.shape, reader.tile_shape, end, index, strings))
+        f.flush()
+        os.fsync(f.fileno())
+    return _index_digest(index)
+
+
+def _header(shape, tile_shape, index_offset, index, strings):
+    return HEADER.pack(ZSFF_MAGIC, ZSFF_VERSION, DTYPE_F64, *shape, *tile_shape,
+                       index_offset, len(index), index_offset + index.nbytes, len(strings))
+
+
+def _write_tail(f, index_offset, index, strings, rows, cols, tile_rows, tile_cols):
+    f.seek(index_offset)
+    f.write(index.tobytes())
+    f.write(strings)
+    f.truncate()
+    f.seek(0)
+    f.write(_header((rows, cols), (tile_rows, tile_cols), index_offset, index, strings))
+
+
+# -----------------------------------------------------------------------------
+# READER
+# -----------------------------------------------------------------------------
+class ZsffReader:
+    """
+    Memory-mapped view of a v2 or v3 file. Opening reads only the header,
+    tile index and string section; tile data is paged in by the OS when
+    accessed.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                raise ZsffError("Truncated ZSFF header")
+            (magic, self.version, dtype, rows, cols, tile_rows, tile_cols,
+             self.index_offset, count, strings_offset, strings_len) = HEADER.unpack(head)
+            if magic != ZSFF_MAGIC or self.version not in READABLE_VERSIONS or dtype != DTYPE_F64:
+                raise ZsffError(f"Not a ZSFF v{ZSFF_VERSION} float64 file")
+            f.seek(self.index_offset)
+            index = np.frombuffer(f.read(count * INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)
+            f.seek(strings_offset)
+            strings = json.loads(f.read(strings_len).decode("utf-8"))
+
+        self.shape = (rows, cols)
+        self.tile_shape = (tile_rows, tile_cols)
+        self.tiles = {(int(e["ti"]), int(e["tj"])): (int(e["offset"]), int(e["checksum"])) for e in index}
+        self.digest = _index_digest(index)
+        self.formulas = {(r, c): v for r, c, v in strings["formulas"]}
+        self.text = {(r, c): v for r, c, v in strings["text"]}
+        self.meta = strings.get("meta", {})
+        self._mm = np.memmap(path, dtype=np.uint8, mode="r") if self.tiles else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm = None
+
+    def _record(self, ti, tj, verify=False):
+        """Read-only memmapped bytes of a stored tile's record, or None for an empty tile."""
+        entry = self.tiles.get((ti, tj))
+        if entry is None:
+            return None
+        offset, checksum = entry
+        record = self._mm[offset:offset + _record_bytes(*self.tile_shape, self.version)]
+        if verify and tile_checksum(record) != checksum:
+            raise ZsffError(f"Checksum mismatch in tile ({ti}, {tj}) of {self.path}")
+        return record
+
+    def _unpack(self, record):
+        """(block, filled) views of a tile record."""
+        tr, tc = self.tile_shape
+        block = record[:tr * tc * 8].view("<f8").reshape(self.tile_shape)
+        if self.version < 3:
+            return block, block != 0
+        filled = np.unpackbits(record[tr * tc * 8:], count=tr * tc).view(bool).reshape(self.tile_shape)
+        return block, filled
+
+    def tile(self, ti, tj, verify=False):
+        """Read-only memmapped (TILE_ROWS, TILE_COLS) view, or None for an empty tile."""
+        record = self._record(ti, tj, verify)
+        return None if record is None else self._unpack(record)[0]
+
+    def tile_filled(self, ti, tj):
+        """Bool (TILE_ROWS, TILE_COLS) mask of the populated cells of a tile, or None for an empty tile."""
+        record = self._record(ti, tj)
+        return None if record is None else self._unpack(record)[1]
+
+    def read_into(self, out, verify=True):
+        """
+        Copies every stored tile into `out` (an array or CellStore, already
+        emptied), clipped to its shape. A CellStore also gets the filled masks.
+        """
+        tr, tc = self.tile_shape
+        for (ti, tj) in self.tiles:
+            r0, c0 = ti * tr, tj * tc
+            if r0 >= out.shape[0] or c0 >= out.shape[1]:
+                continue
+            h, w = min(tr, out.shape[0] - r0), min(tc, out.shape[1] - c0)
+            block, filled = self._unpack(self._record(ti, tj, verify))
+            if isinstance(out, np.ndarray):
+                out[r0:r0 + h, c0:c0 + w] = block[:h, :w]
+            else:
+                out[r0:r0 + h, c0:c0 + w] = np.ma.MaskedArray(block[:h, :w], mask=~filled[:h, :w])
+        return out
+
+    def verify(self):
+        """Returns the (ti, tj) of every tile whose checksum does not match."""
+        return [key for key in self.tiles
+                if tile_checksum(self._record(*key)) != self.tiles[key][1]]
+
+
+def sniff_version(path):
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    if magic.startswith(ZSFF_MAGIC):
+        return int.from_bytes(magic[4:6], "little")
+    if magic == NPY_MAGIC:
+        return 1
+    raise ZsffError(f"{os.path.basename(path)} is not a ZSFF file")